@@ -23,15 +23,26 @@ could never report at all.
 A type check is cheap, has no false-positive surface worth speaking of (a value
 is a string or it is not), and catches the whole class rather than the instance.
 
+ENGLISH IS READ ONCE. Every locale is compared against the same en.json (or
+the same cli/en/<namespace>.json), so the English side is parsed and reduced
+to a signature once per file -- a {dotted key: position} index plus one type
+byte per leaf -- and shared by every locale. The locale side is walked leaf by
+leaf and compared as it goes; no flattened copy of either document is kept.
+The engine this replaced re-parsed and flattened ~650 KB of en.json for every
+www locale, twice; it stays in the file as --bench's oracle.
+
 Run modes:
     check_i18n_value_types.py            the gate
     check_i18n_value_types.py --selftest controls only
+    check_i18n_value_types.py --bench    time the streaming engine against the
+                                         dict-per-document one it replaced
 """
 
 import argparse
 import json
 import pathlib
 import sys
+import time
 
 # (english file, [sibling locale files]) pairs are discovered, not listed, so a
 # new locale is covered the day it is added rather than the day someone
@@ -42,8 +53,73 @@ WWW = "packages/www/src/i18n/translations"
 CLI = "packages/cli/src/i18n/locales"
 
 
+# One byte per leaf type, looked up by EXACT type: bool is a subclass of int in
+# Python, and a `true` swapped for `1` must still be caught.
+TYPE_CODE = {str: 0, int: 1, float: 2, bool: 3, type(None): 4}
+
+
+def leaves(doc):
+    """(path, leaf value) for every leaf, in document order, without building a dict.
+
+    An explicit stack of iterators rather than recursion: a locale is walked once
+    and compared as it goes, so nothing the size of the document is kept.
+    """
+    if not isinstance(doc, (dict, list)):
+        yield [], doc
+        return
+    path = []
+    stack = [iter(doc.items() if isinstance(doc, dict) else enumerate(doc))]
+    while stack:
+        for key, value in stack[-1]:
+            if isinstance(value, (dict, list)):
+                path.append(str(key))
+                stack.append(iter(value.items() if isinstance(value, dict) else enumerate(value)))
+                break
+            yield [*path, str(key)], value
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+
+
+def signature(en_doc):
+    """(en_doc, {dotted key: position}, type codes) for one English document.
+
+    Built once per English file and shared by every locale compared against it.
+    The types live in a bytearray indexed by position, not in a dict of values;
+    the English VALUES are only looked up again for a key that is reported.
+    """
+    index, codes = {}, bytearray()
+    for path, value in leaves(en_doc):
+        index[".".join(path)] = len(codes)
+        codes.append(TYPE_CODE[type(value)])
+    return en_doc, index, codes
+
+
+def compare(en_sig, loc_doc):
+    """[(key, english value, locale value)] where the TYPES disagree, in English order.
+
+    Keys absent from the locale are NOT a finding here: missing translations are
+    a different defect with its own gate, and folding them in would make this
+    check fire on every partially-translated file and get switched off.
+    """
+    en_doc, index, codes = en_sig
+    bad = []
+    for path, value in leaves(loc_doc):
+        key = ".".join(path)
+        at = index.get(key)
+        if at is not None and TYPE_CODE[type(value)] != codes[at]:
+            bad.append((at, key, value))
+    if not bad:
+        return []
+    bad.sort(key=lambda item: item[0])
+    wanted = {at for at, _, _ in bad}
+    en_values = {at: v for at, (_, v) in enumerate(leaves(en_doc)) if at in wanted}
+    return [(key, en_values[at], value) for at, key, value in bad]
+
+
 def flatten(node, path, out):
-    """{dotted.path: leaf value} for one document."""
+    """{dotted.path: leaf value} for one document; --bench's oracle only."""
     if isinstance(node, dict):
         for key, value in node.items():
             flatten(value, [*path, key], out)
@@ -54,13 +130,8 @@ def flatten(node, path, out):
         out[".".join(path)] = node
 
 
-def compare(en_doc, loc_doc):
-    """[(key, english value, locale value)] where the TYPES disagree.
-
-    Keys absent from the locale are NOT a finding here: missing translations are
-    a different defect with its own gate, and folding them in would make this
-    check fire on every partially-translated file and get switched off.
-    """
+def compare_reference(en_doc, loc_doc):
+    """The dict-per-document engine compare() replaced, kept as --bench's oracle."""
     en_flat, loc_flat = {}, {}
     flatten(en_doc, [], en_flat)
     flatten(loc_doc, [], loc_flat)
@@ -69,8 +140,6 @@ def compare(en_doc, loc_doc):
         if key not in loc_flat:
             continue
         loc_value = loc_flat[key]
-        # bool is a subclass of int in Python; treat them as distinct so a
-        # `true` swapped for `1` is still caught.
         if type(en_value) is not type(loc_value):
             bad.append((key, en_value, loc_value))
     return bad
@@ -99,13 +168,19 @@ def locale_pairs(root):
 
 # ---- controls ----------------------------------------------------------------
 # A gate that cannot fire reports a clean tree forever, and this one would be
-# especially easy to break silently: a flatten() that returns {} makes every
-# comparison vacuous while still exiting 0.
+# especially easy to break silently: a leaves() that yields nothing makes every
+# comparison vacuous while still exiting 0. Each control is also run through the
+# reference engine, so the two cannot drift apart between --bench runs.
 _MUST_FLAG = [
     ("a number replaced by its rendered marker", {"a": {"ref": 1}}, {"a": {"ref": "[1]"}}),
     ("a falsy 0 eaten by `value || ''`", {"a": {"ref": 0}}, {"a": {"ref": ""}}),
     ("a bool swapped for a number", {"a": True}, {"a": 1}),
     ("a value inside a list", {"a": [{"n": 2}]}, {"a": [{"n": "2"}]}),
+    (
+        "a later sibling after a nested object",
+        {"a": {"b": "x"}, "c": 1},
+        {"a": {"b": "y"}, "c": "1"},
+    ),
 ]
 _MUST_CLEAR = [
     ("an ordinary translated string", {"a": "Hello"}, {"a": "Merhaba"}),
@@ -118,23 +193,93 @@ _MUST_CLEAR = [
 def selftest():
     bad = 0
     for name, en_doc, loc_doc in _MUST_FLAG:
-        if not compare(en_doc, loc_doc):
+        if not compare(signature(en_doc), loc_doc):
             print("CONTROL FAILED (should flag): %s" % name, file=sys.stderr)
             bad += 1
     for name, en_doc, loc_doc in _MUST_CLEAR:
-        found = compare(en_doc, loc_doc)
+        found = compare(signature(en_doc), loc_doc)
         if found:
             print("CONTROL FAILED (should clear): %s -> %r" % (name, found), file=sys.stderr)
             bad += 1
+    for name, en_doc, loc_doc in _MUST_FLAG + _MUST_CLEAR:
+        if compare(signature(en_doc), loc_doc) != compare_reference(en_doc, loc_doc):
+            print("CONTROL FAILED (engines disagree): %s" % name, file=sys.stderr)
+            bad += 1
     return bad
 
 
+def bench(pairs, rounds):
+    """Both engines over the same texts; a disagreement voids the timing.
+
+    Parsing is inside the timing on purpose: re-reading en.json once per locale
+    was most of what the reference engine cost.
+    """
+    texts = {}
+    for _, en_path, loc_path in pairs:
+        for path in (en_path, loc_path):
+            if path not in texts:
+                texts[path] = path.read_text(encoding="utf-8")
+
+    def reference():
+        out = []
+        for _, en_path, loc_path in pairs:
+            en_doc = json.loads(texts[en_path])
+            out.append(compare_reference(en_doc, json.loads(texts[loc_path])))
+            flatten(en_doc, [], {})
+        return out
+
+    def streaming():
+        signatures, out = {}, []
+        for _, en_path, loc_path in pairs:
+            if en_path not in signatures:
+                signatures[en_path] = signature(json.loads(texts[en_path]))
+            out.append(compare(signatures[en_path], json.loads(texts[loc_path])))
+        return out
+
+    timings, verdicts = {}, {}
+    for name, engine in (("reference", reference), ("streaming", streaming)):
+        best = None
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            verdicts[name] = engine()
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    differ = [
+        label
+        for (label, _, _), a, b in zip(
+            pairs, verdicts["reference"], verdicts["streaming"], strict=True
+        )
+        if a != b
+    ]
+    if differ:
+        print("ENGINES DISAGREE on %d pair(s), e.g. %s" % (len(differ), differ[0]), file=sys.stderr)
+        return 1
+    print(
+        "%d pairs, %d English files, %.1f MB, best of %d: reference %.1f ms, streaming %.1f ms"
+        " (%.1fx)"
+        % (
+            len(pairs),
+            len({en_path for _, en_path, _ in pairs}),
+            sum(len(t) for t in texts.values()) / 1e6,
+            rounds,
+            timings["reference"] * 1000,
+            timings["streaming"] * 1000,
+            timings["reference"] / timings["streaming"],
+        )
+    )
+    return 0
+
+
 MIN_PAIRS = 8  # www alone has 12 non-English locales; a collapsed glob is a bug
 
 
 def main(argv=None):
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--selftest", action="store_true")
+    parser.add_argument(
+        "--bench", type=int, nargs="?", const=5, metavar="ROUNDS", help="time both engines"
+    )
     args = parser.parse_args(argv)
 
     if selftest():
@@ -154,19 +299,24 @@ def main(argv=None):
             file=sys.stderr,
         )
         return 1
+    if args.bench:
+        return bench(pairs, args.bench)
 
     findings, compared = 0, 0
+    signatures = {}
     for label, en_path, loc_path in pairs:
+        reading = en_path
         try:
-            en_doc = json.loads(en_path.read_text(encoding="utf-8"))
+            if en_path not in signatures:
+                signatures[en_path] = signature(json.loads(en_path.read_text(encoding="utf-8")))
+            reading = loc_path
             loc_doc = json.loads(loc_path.read_text(encoding="utf-8"))
         except (OSError, ValueError) as exc:
-            print("cannot read %s: %s" % (loc_path, exc), file=sys.stderr)
+            print("cannot read %s: %s" % (reading, exc), file=sys.stderr)
             return 1
-        flat = {}
-        flatten(en_doc, [], flat)
-        compared += len(flat)
-        for key, en_value, loc_value in compare(en_doc, loc_doc):
+        en_sig = signatures[en_path]
+        compared += len(en_sig[2])
+        for key, en_value, loc_value in compare(en_sig, loc_doc):
             print(
                 "%s: %s\n    en=%r (%s)  locale=%r (%s)"
                 % (
@@ -28,64 +28,281 @@ is not asked to catch that. What it does catch is the shape the incident
 actually took -- a readable program pasted into a template literal -- and it
 catches it before review rather than after.
 
+ONE PASS PER REGION. The eight statement shapes are compiled into a single
+pattern: at each line start, one optional lookahead per shape, each capturing
+into its own group, so a line that is two shapes at once (`if __name__ ==
+"__main__":` is both) still scores both -- exactly what eight separate searches
+counted, without reading the region eight times. Line numbers come from a
+newline-offset index and bisect, built only for a file that has a finding,
+instead of recounting newlines from the top of the file per match. `--bench`
+times both engines over the tracked tree and refuses to report a speed-up
+unless they agree on every file.
+
+RESULTS ARE CACHED BY CONTENT. Findings depend on nothing but a file's bytes
+and this script, so they are stored in .ci/cache/check_inline_python.json under
+the file's git blob SHA (from `git ls-files -s`; recomputed from the bytes for
+a file modified in the work tree), inside a record stamped with a hash of this
+script's own source and the Python version. Any edit to the detector -- a
+shape, a control, this paragraph -- changes the stamp and discards everything,
+so a stale verdict cannot outlive the code that produced it. The controls are
+cached the same way: they run once per detector version, not once per hook
+call. `--no-cache` ignores and leaves the cache alone.
+
+`--jobs N` scans the files the cache cannot answer across N processes (0: one
+per core). Results come back through an ordered map and are printed in git's
+file order, so the report and the exit code are byte-for-byte those of a
+serial run; only the wall time changes.
+
+DIFF-SCOPED RUNS. `--since REV` scans only the JS/TS files that differ between
+the merge base of REV and HEAD and the work tree; `--staged` only those in the
+index, judged on the staged blob rather than the work-tree file, so a pre-commit
+run sees exactly what is being committed. PR feedback then costs what the diff costs. Two things do not shrink:
+the controls still run (they judge the detector, not the diff), and the
+tracked-tree floor still applies, so an empty checkout is still VACUOUS INPUT
+rather than "nothing changed". On main -- the branch checked out, or
+GITHUB_REF=refs/heads/main in CI -- both flags are ignored and the whole tree
+is scanned, so a finding that slipped past a scoped PR run is still caught
+where it lands.
+
+LINEAR TIME, BOUNDED MEMORY. Quoted regions are found by a tokenizer, not by
+one regex over the file: a regex that fails at an unterminated quote restarts
+one character later, so `x='` followed by 20 000 escaped quotes on one
+minified line took 7 s and doubled-and-quadrupled from there. The tokenizer
+finds each opener, consumes its body with a backtrack-free body pattern, and
+on failure remembers how far that body reached: every later opener of the same
+kind inside that reach was escaped in the failed scan, so it fails too and is
+skipped in O(1). Regions come out exactly as the regex produced them.
+
+Files above --max-file-mb are not read into memory: they are mmapped,
+tokenized as bytes (quotes, backslash and newline are ASCII and never occur
+inside a UTF-8 sequence), and only multi-line regions are decoded. Each file
+also has a --max-file-seconds budget. Both are REPORTED, never silent: large
+files are listed with their size and time, and a file that runs out of time
+is UNSCANNED, which fails the gate -- unscanned is not clean.
+
 Run modes:
     check_inline_python.py            scan every tracked JS/TS file (the gate)
+    check_inline_python.py --since R  scan files changed since merge-base(R, HEAD)
+    check_inline_python.py --staged   scan files with staged changes
     check_inline_python.py --file P   judge ONE file, for the pre-edit hook
     check_inline_python.py --selftest controls only, no repo scan
+    check_inline_python.py --bench    time the combined scanner against the
+                                      per-shape reference over the tree
 """
 
 import argparse
+import bisect
+import concurrent.futures
+import hashlib
+import json
+import mmap
+import os
 import pathlib
 import re
 import subprocess
 import sys
+import tempfile
+import time
 
 # Statement shapes that only appear in real Python. Each must match at the START
 # of a line inside a quoted region, which is what keeps prose and identifiers
 # from scoring: a JS file may well contain the word "import", but not at the
 # head of a line inside a string, followed by a stdlib module name.
-_SIGNALS = (
-    re.compile(
-        r"^\s*import\s+(os|sys|json|re|pathlib|subprocess|shutil|pwd|grp|time)\b", re.MULTILINE
-    ),
-    re.compile(r"^\s*from\s+[A-Za-z_][\w.]*\s+import\s+\w", re.MULTILINE),
-    re.compile(r"^\s*def\s+[A-Za-z_]\w*\s*\(", re.MULTILINE),
-    re.compile(r"^\s*class\s+[A-Za-z_]\w*\s*[(:]", re.MULTILINE),
-    re.compile(r"^\s*if\s+__name__\s*==", re.MULTILINE),
-    re.compile(r"^\s*(?:el)?if\s+.+:\s*$", re.MULTILINE),
-    re.compile(r"^\s*(?:try|except|finally|else)\s*(?:\w[\w.]*\s*)?:\s*$", re.MULTILINE),
-    re.compile(r"^\s*print\s*\(", re.MULTILINE),
+#
+# Each shape is written WITHOUT its `^\s*` anchor; _SIGNALS adds it back for the
+# per-shape reference engine and _COMBINED shares one anchor between all eight.
+_SHAPES = (
+    r"import\s+(?:os|sys|json|re|pathlib|subprocess|shutil|pwd|grp|time)\b",
+    r"from\s+[A-Za-z_][\w.]*\s+import\s+\w",
+    r"def\s+[A-Za-z_]\w*\s*\(",
+    r"class\s+[A-Za-z_]\w*\s*[(:]",
+    r"if\s+__name__\s*==",
+    r"(?:el)?if\s+.+:\s*$",
+    r"(?:try|except|finally|else)\s*(?:\w[\w.]*\s*)?:\s*$",
+    r"print\s*\(",
+)
+# Left as strings: only the reference engine uses them, and `re` compiles (and
+# caches) them on first use instead of on every gate start.
+_SIGNALS = tuple(r"^\s*" + shape for shape in _SHAPES)
+
+# One anchor, then one optional capturing lookahead per shape. The anchor is a
+# literal newline rather than `^`: the engine can then jump between newlines
+# instead of attempting a match at every character, and a shape is never
+# wanted at offset 0 -- a quoted region starts with its quote. The keyword
+# lookahead keeps lines that cannot be any shape from producing a match object
+# at all. Every shape starts with a non-space keyword, so the indentation run
+# lands on the one position each per-shape search could have matched.
+#
+# The run is `[^\S\n]*+`, not `\s*`: anchored at the LAST newline before the
+# keyword and possessive, so a stretch of k blank lines costs O(k) rather than
+# k restarts that each rescan the rest of it -- 20 000 newlines in one template
+# literal took 8 s the other way.
+_COMBINED = re.compile(
+    r"\n[^\S\n]*+(?=import|from|def|class|if|elif|try|except|finally|else|print)"
+    + "".join(r"(?=(?P<s%d>%s))?" % (i, shape) for i, shape in enumerate(_SHAPES)),
+    re.MULTILINE,
 )
+_ALL_SHAPES = len(_SHAPES)
 
 # `python -c` / `python3 -c` given anything other than a trivial literal. The
 # interpreter NAME on its own is deliberately not a signal (that is the
 # generate-tutorial-audio.ts false positive), so this needs the -c flag.
 _DASH_C = re.compile(r"python3?\s+-c\b")
+_DASH_C_BYTES = re.compile(rb"python3?\s+-c\b")
 
 # Quoted regions: template literals, single and double quotes. Backslash escapes
-# are honoured so an escaped quote does not end a region early.
-_REGION = re.compile(
-    r"`(?:[^`\\]|\\.)*`" r"|'(?:[^'\\\n]|\\.)*'" r'|"(?:[^"\\\n]|\\.)*"',
-    re.DOTALL,
+# are honoured so an escaped quote does not end a region early. regions() finds
+# them with these backtrack-free bodies: matched (never searched) right after an
+# opener, each consumes up to the first unescaped closing quote, or to the
+# newline or end of file that makes the region unterminated.
+_BODY_SOURCES = {
+    "`": r"[^`\\]*(?:\\.[^`\\]*)*",
+    "'": r"[^'\\\n]*(?:\\.[^'\\\n]*)*",
+    '"': r'[^"\\\n]*(?:\\.[^"\\\n]*)*',
+}
+_TOKENS = (
+    re.compile(r"[`'\"]"),
+    {q: re.compile(body, re.DOTALL) for q, body in _BODY_SOURCES.items()},
 )
+_TOKENS_BYTES = (
+    re.compile(rb"[`'\"]"),
+    {ord(q): re.compile(body.encode(), re.DOTALL) for q, body in _BODY_SOURCES.items()},
+)
+# As one regex, kept (uncompiled) as --bench's oracle. It is quadratic on an
+# unterminated quote followed by escaped ones, which is why it is not the gate.
+_REGION_REFERENCE = r"`(?:[^`\\]|\\.)*`" r"|'(?:[^'\\\n]|\\.)*'" r'|"(?:[^"\\\n]|\\.)*"'
 
 MIN_SIGNALS = 2
+MAX_FILE_MB = 4  # above this a file is mmapped and tokenized as bytes
+MAX_FILE_SECONDS = 10.0
+
+
+class OverBudgetError(Exception):
+    """A file ran out of its time budget; it is UNSCANNED, not clean."""
+
+
+def regions(buf, deadline=None):
+    """Yield (start, end) of every quoted region in `buf` (str or bytes-like).
+
+    The same spans `_REGION_REFERENCE` finds, in time linear in len(buf).
+    """
+    openers, bodies = _TOKENS if isinstance(buf, str) else _TOKENS_BYTES
+    reach = dict.fromkeys(bodies, -1)  # per quote: how far its last failed body ran
+    size = len(buf)
+    pos = 0
+    steps = 0
+    while True:
+        m = openers.search(buf, pos)
+        if m is None:
+            return
+        start = m.start()
+        quote = buf[start]
+        steps += 1
+        if deadline is not None and not steps & 1023 and time.monotonic() > deadline:
+            raise OverBudgetError
+        if start < reach[quote]:
+            pos = start + 1  # escaped inside a body that already failed: fails the same way
+            continue
+        end = bodies[quote].match(buf, start + 1).end()
+        if end < size and buf[end] == quote:
+            yield start, end + 1
+            pos = end + 1
+        else:
+            reach[quote] = end
+            pos = start + 1
+
 
+def _score(text, start, end, enough=_ALL_SHAPES):
+    """How many distinct shapes occur in text[start:end] (at most `enough`), in one pass."""
+    seen = [False] * len(_SHAPES)
+    found = 0
+    for m in _COMBINED.finditer(text, start, end):
+        for i, group in enumerate(m.groups()):
+            if group is not None and not seen[i]:
+                seen[i] = True
+                found += 1
+        if found >= enough:
+            break
+    return found
 
-def findings(text):
-    """[(line_number, why)] for one file's source. Empty means clean."""
+
+def _score_reference(text, start, end):
+    """The per-shape engine _score replaced, kept as --bench's oracle."""
+    region = text[start:end]
+    return sum(1 for p in _SIGNALS if re.search(p, region, re.MULTILINE))
+
+
+class _Lines:
+    """Offset -> 1-based line number, from a newline index built on first use."""
+
+    def __init__(self, text):
+        self.text = text
+        self.newlines = None
+
+    def __call__(self, offset):
+        if self.newlines is None:
+            text, newlines, i = self.text, [], self.text.find("\n")
+            while i != -1:
+                newlines.append(i)
+                i = text.find("\n", i + 1)
+            self.newlines = newlines
+        return bisect.bisect_left(self.newlines, offset) + 1
+
+
+class _ByteLines:
+    """Offset -> 1-based line number over a mapped file, without an index.
+
+    Findings are asked for in ascending order, so newlines are counted forward
+    from the previous answer, one bounded slice at a time.
+    """
+
+    _CHUNK = 1 << 20
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.offset = 0
+        self.line = 1
+
+    def __call__(self, offset):
+        if offset < self.offset:
+            self.offset, self.line = 0, 1
+        while self.offset < offset:
+            step = min(offset, self.offset + self._CHUNK)
+            self.line += self.buf[self.offset : step].count(b"\n")
+            self.offset = step
+        return self.line
+
+
+def findings(text, reference=False, deadline=None):
+    """[(line_number, why)] for one file's source. Empty means clean.
+
+    `reference` selects the per-shape engine and the one-regex tokenizer, for
+    --bench only. `deadline` (time.monotonic) raises OverBudgetError when passed.
+    """
+    if reference:
+        score = _score_reference
+        spans = (m.span() for m in re.finditer(_REGION_REFERENCE, text, re.DOTALL))
+    else:
+        score = _score
+        spans = regions(text, deadline)
+    # Every shape that matches inside a region also matches at the same offset in
+    # the whole text (a region never starts with whitespace or ends in `:`), so a
+    # file with fewer than MIN_SIGNALS shapes ANYWHERE cannot hold a flagged
+    # region. That is nearly every file, and one scan settles it.
+    if not reference and _score(text, 0, len(text), MIN_SIGNALS) < MIN_SIGNALS:
+        return []
     out = []
-    for m in _REGION.finditer(text):
-        region = m.group(0)
-        if "\n" not in region:
+    line_of = _Lines(text)
+    for start, end in spans:
+        if text.find("\n", start, end) == -1:
             continue  # a one-line string cannot hold a program worth linting
-        hits = sorted({p.pattern for p in _SIGNALS if p.search(region)})
-        if len(hits) >= MIN_SIGNALS:
+        hits = score(text, start, end)
+        if hits >= MIN_SIGNALS:
             out.append(
                 (
-                    text.count("\n", 0, m.start()) + 1,
+                    line_of(start),
                     "a %d-line quoted region matches %d Python statement shapes"
-                    % (region.count("\n") + 1, len(hits)),
+                    % (text.count("\n", start, end) + 1, hits),
                 )
             )
     if not out:
@@ -105,12 +322,42 @@ def findings(text):
         # in the file that holds it, or from a real .py file, which is the goal.
         return out
     out.extend(
-        (text.count("\n", 0, m.start()) + 1, "python -c executes the embedded source flagged above")
+        (line_of(m.start()), "python -c executes the embedded source flagged above")
         for m in _DASH_C.finditer(text)
     )
     return out
 
 
+def findings_mapped(buf, deadline=None):
+    """findings() for a bytes-like buffer (an mmap), decoding only multi-line regions.
+
+    No whole-file prefilter here: it would need the whole file as text, which is
+    what this path exists to avoid. Its `\\s` in `python -c` is ASCII-only, the
+    one place bytes and text patterns can differ.
+    """
+    out = []
+    line_of = _ByteLines(buf)
+    for start, end in regions(buf, deadline):
+        if buf.find(b"\n", start, end) == -1:
+            continue
+        region = buf[start:end].decode("utf-8", errors="replace")
+        hits = _score(region, 0, len(region))
+        if hits >= MIN_SIGNALS:
+            out.append(
+                (
+                    line_of(start),
+                    "a %d-line quoted region matches %d Python statement shapes"
+                    % (region.count("\n") + 1, hits),
+                )
+            )
+    if out:
+        out.extend(
+            (line_of(m.start()), "python -c executes the embedded source flagged above")
+            for m in _DASH_C_BYTES.finditer(buf)
+        )
+    return out
+
+
 # ---- controls ---------------------------------------------------------------
 # A detector that cannot fire would report a clean tree forever. Both directions
 # are proven before any real file is read: it must FLAG a planted program, and
@@ -124,6 +371,12 @@ _MUST_FLAG = [
         "python -c alongside an embedded program",
         "const s = `\nimport os\ndef go():\n    print(os.getcwd())\n`;\nconst c = `python3 -c '${s}'`;\n",
     ),
+    (
+        # Two shapes on ONE line: the combined scanner must score both, as eight
+        # separate searches did.
+        "a main guard, which is two shapes at once",
+        "// header\n\nconst s = `\nif __name__ == '__main__':\n    pass\n`;\n",
+    ),
 ]
 _MUST_CLEAR = [
     ("naming the interpreter binary", "const pythonBin = process.env.BIN || 'python3';\n"),
@@ -142,10 +395,17 @@ _MUST_CLEAR = [
 
 def selftest():
     bad = 0
+    for name, src in _MUST_FLAG + _MUST_CLEAR:
+        if findings(src) != findings(src, reference=True):
+            print("CONTROL FAILED (engines disagree): %s" % name, file=sys.stderr)
+            bad += 1
     for name, src in _MUST_FLAG:
         if not findings(src):
             print("CONTROL FAILED (should flag): %s" % name, file=sys.stderr)
             bad += 1
+    if [line for line, _ in findings(_MUST_FLAG[-1][1])] != [3]:
+        print("CONTROL FAILED: finding not reported on line 3", file=sys.stderr)
+        bad += 1
     for name, src in _MUST_CLEAR:
         got = findings(src)
         if got:
@@ -157,32 +417,357 @@ def selftest():
 MIN_FILES = 200  # the tree holds ~999; a collapsed glob must not read as clean
 
 
-def tracked_files(root):
+_PATTERNS = ("*.ts", "*.js", "*.cjs", "*.mjs")
+
+
+def _git(root, *args):
     out = subprocess.run(
-        ["git", "-C", str(root), "ls-files", "--", "*.ts", "*.js", "*.cjs", "*.mjs"],
-        capture_output=True,
-        text=True,
-        check=False,
+        ["git", "-C", str(root), *args], capture_output=True, text=True, check=False
     )
-    if out.returncode != 0:
+    return out.stdout if out.returncode == 0 else None
+
+
+def tracked_files(root, index=False):
+    """{path: blob sha} for every tracked JS/TS file, in git's order.
+
+    The sha is the INDEX blob; a path modified in the work tree maps to None, so
+    its bytes are hashed instead of trusting a blob that no longer describes them.
+    With `index`, the blob itself is what gets judged, so every path keeps its sha.
+    """
+    staged = _git(root, "ls-files", "-s", "--", *_PATTERNS)
+    modified = _git(root, "ls-files", "-m", "--", *_PATTERNS)
+    if staged is None or modified is None:
+        return None
+    dirty = set(modified.splitlines())
+    files = {}
+    for line in staged.splitlines():
+        meta, _, rel = line.partition("\t")
+        if rel.startswith("private/"):
+            continue
+        files[rel] = None if rel in dirty and not index else meta.split()[1]
+    return files
+
+
+def blob_sha(data):
+    """What `git hash-object` would print for these bytes."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data, usedforsecurity=False).hexdigest()
+
+
+def detector_version():
+    digest = hashlib.sha256(pathlib.Path(__file__).read_bytes())
+    digest.update(b"python %d.%d" % sys.version_info[:2])
+    return digest.hexdigest()[:16]
+
+
+class _Cache:
+    """Findings by blob sha, valid for exactly one detector version."""
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.dirty = False
+        data = None
+        if path is not None:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = None  # absent or torn: a cache is never worth failing over
+        if not isinstance(data, dict) or data.get("detector") != version:
+            data = {"detector": version, "controls": False, "files": {}}
+        self.data = data
+
+    @property
+    def controls_hold(self):
+        return self.data["controls"] is True
+
+    def record_controls(self):
+        if not self.controls_hold:
+            self.data["controls"] = True
+            self.dirty = True
+
+    def get(self, sha):
+        hits = self.data["files"].get(sha)
+        return None if hits is None else [tuple(h) for h in hits]
+
+    def put(self, sha, hits):
+        self.data["files"][sha] = [list(h) for h in hits]
+        self.dirty = True
+
+    def save(self, keep=None):
+        """Write if anything changed; `keep` prunes entries to the current tree."""
+        if keep is not None:
+            files = self.data["files"]
+            gone = [sha for sha in files if sha not in keep]
+            for sha in gone:
+                del files[sha]
+            self.dirty = self.dirty or bool(gone)
+        if self.path is None or not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(".%s.%d" % (self.path.name, os.getpid()))
+            tmp.write_text(json.dumps(self.data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            print("warning: cannot write %s: %s" % (self.path, exc), file=sys.stderr)
+
+
+CACHE_FILE = ".ci/cache/check_inline_python.json"
+
+
+def judge(path, cache):
+    """Findings for one file by path, from the cache when its blob was seen."""
+    data = path.read_bytes()
+    sha = blob_sha(data)
+    hits = cache.get(sha)
+    if hits is None:
+        hits = findings(data.decode("utf-8", errors="replace"))
+        cache.put(sha, hits)
+    return hits
+
+
+def on_main(root):
+    if os.environ.get("GITHUB_REF") == "refs/heads/main":
+        return True
+    branch = _git(root, "symbolic-ref", "--short", "-q", "HEAD")
+    return branch is not None and branch.strip() == "main"
+
+
+def changed_files(root, since=None):
+    """Changed JS/TS paths since merge-base(since, HEAD), or staged ones; None on a bad rev."""
+    if since is None:
+        out = _git(root, "diff", "--cached", "--name-only", "--diff-filter=ACMR", "--", *_PATTERNS)
+    else:
+        base = _git(root, "merge-base", since, "HEAD")
+        if base is None:
+            return None
+        out = _git(
+            root, "diff", "--name-only", "--diff-filter=ACMR", base.strip(), "--", *_PATTERNS
+        )
+    return None if out is None else set(out.splitlines())
+
+
+def _index_blob(root, sha):
+    """The staged bytes of a blob, as a file: `--staged` judges what is committed."""
+    fh = tempfile.TemporaryFile()  # noqa: SIM115 -- returned open; the caller's `with` closes it
+    try:
+        subprocess.run(
+            ["git", "-C", str(root), "cat-file", "blob", sha],
+            stdout=fh,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        fh.close()
+        raise OSError("cannot read blob %s: %s" % (sha, exc)) from exc
+    fh.seek(0)
+    return fh
+
+
+def scan(job):
+    """(findings, blob sha, budget note) for one job; None if unreadable.
+
+    A job is (root, rel, indexed sha, from index, max bytes in memory, max
+    seconds). From the index, the bytes are the staged blob, not the work-tree
+    file. The note is None, or ("large" | "unscanned", size, seconds); findings
+    are None when unscanned. Module-level and cache-free so a process pool can
+    run it.
+    """
+    root, rel, sha, from_index, max_bytes, max_seconds = job
+    t0 = time.monotonic()
+    deadline = t0 + max_seconds
+    try:
+        with _index_blob(root, sha) if from_index else open(pathlib.Path(root, rel), "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size <= max_bytes:
+                data = fh.read()
+                sha = blob_sha(data) if sha is None else sha
+                try:
+                    return (
+                        findings(data.decode("utf-8", errors="replace"), deadline=deadline),
+                        sha,
+                        None,
+                    )
+                except OverBudgetError:
+                    return None, sha, ("unscanned", size, time.monotonic() - t0)
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                if sha is None:
+                    digest = hashlib.sha1(b"blob %d\0" % size, usedforsecurity=False)
+                    digest.update(buf)
+                    sha = digest.hexdigest()
+                try:
+                    hits = findings_mapped(buf, deadline)
+                except OverBudgetError:
+                    return None, sha, ("unscanned", size, time.monotonic() - t0)
+                return hits, sha, ("large", size, time.monotonic() - t0)
+    except OSError:
         return None
-    return [f for f in out.stdout.split() if not f.startswith("private/")]
+
+
+def scan_all(
+    root, files, cache, jobs, budget=(MAX_FILE_MB << 20, MAX_FILE_SECONDS), from_index=False
+):
+    """Yield (rel, findings, blob sha, note) in `files` order; unreadable files are skipped.
+
+    Unscanned files are yielded with findings None and are not cached. With
+    `from_index`, each file is judged on its staged blob and cached under its sha.
+    """
+    todo = [
+        (str(root), rel, sha, from_index, *budget)
+        for rel, sha in files.items()
+        if sha is None or cache.get(sha) is None
+    ]
+    if jobs != 1 and len(todo) > 1:
+        workers = min(jobs or os.cpu_count() or 1, len(todo))
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        # Small chunks keep one huge bundle from stranding a worker's whole share.
+        results = pool.map(scan, todo, chunksize=max(1, len(todo) // (workers * 8)))
+    else:
+        pool = None
+        results = map(scan, todo)
+    # Decided up front, not per iteration: a blob shared by two paths is cached by
+    # the first one's result, and re-asking the cache would desynchronise `results`.
+    queued = {job[1] for job in todo}
+    try:
+        for rel, indexed in files.items():
+            sha, note = indexed, None
+            if rel not in queued:
+                hits = cache.get(indexed)
+            else:
+                result = next(results)
+                if result is None:
+                    continue
+                hits, sha, note = result
+                if hits is not None:
+                    cache.put(sha, hits)
+            yield rel, hits, sha, note
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def bench(root, files, rounds):
+    """Both engines over the same texts; a disagreement voids the timing."""
+    texts = []
+    for rel in files:
+        try:
+            texts.append((rel, (root / rel).read_text(encoding="utf-8", errors="replace")))
+        except OSError:
+            continue
+    timings = {}
+    verdicts = {}
+    for name, reference in (("per-shape", True), ("combined", False)):
+        best = None
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            verdicts[name] = [findings(text, reference) for _, text in texts]
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    differ = [
+        rel
+        for (rel, _), a, b in zip(texts, verdicts["per-shape"], verdicts["combined"], strict=True)
+        if a != b
+    ]
+    if differ:
+        print("ENGINES DISAGREE on %d file(s), e.g. %s" % (len(differ), differ[0]), file=sys.stderr)
+        return 1
+    print(
+        "%d files, %.1f MB, best of %d: per-shape %.1f ms, combined %.1f ms (%.1fx)"
+        % (
+            len(texts),
+            sum(len(t) for _, t in texts) / 1e6,
+            rounds,
+            timings["per-shape"] * 1000,
+            timings["combined"] * 1000,
+            timings["per-shape"] / timings["combined"],
+        )
+    )
+    return bench_adversarial()
+
+
+# Inputs built to make a regex tokenizer or scorer go quadratic. Each is timed
+# at n and 10n: the reference at n only (at 10n it runs for minutes), the gate
+# at both, in memory and mapped, and the verdicts must agree at n.
+_ADVERSARIAL = (
+    ("unterminated ` then escaped `", lambda n: "`" + "\\`" * n),
+    ("minified line: unterminated ' then escaped '", lambda n: "x='" + "\\'" * n),
+    ("blank lines inside a template", lambda n: "`" + "\n" * n + "`"),
+    ("one long colon-less if line", lambda n: "`\nimport os\nif " + "a" * n + "\n`"),
+    ("many short strings", lambda n: "'a', " * n),
+    ("a real program padded with blank lines", lambda n: "`\nimport os" + "\n" * n + "def f():\n`"),
+)
+
+
+def bench_adversarial(n=4000):
+    bad = 0
+    for name, make in _ADVERSARIAL:
+        row = []
+        for size in (n, 10 * n):
+            text = make(size)
+            t0 = time.perf_counter()
+            got = findings(text)
+            row.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            mapped = findings_mapped(text.encode())
+            row.append(time.perf_counter() - t0)
+            if size == n:
+                t0 = time.perf_counter()
+                want = findings(text, reference=True)
+                row.append(time.perf_counter() - t0)
+                if not got == mapped == want:
+                    print("ENGINES DISAGREE on adversarial input: %s" % name, file=sys.stderr)
+                    bad += 1
+        print(
+            "  %-44s n=%d: reference %7.1f ms, gate %5.1f ms (mapped %5.1f); 10n: gate %5.1f ms"
+            " (mapped %5.1f)"
+            % (name, n, row[2] * 1000, row[0] * 1000, row[1] * 1000, row[3] * 1000, row[4] * 1000)
+        )
+    return 1 if bad else 0
 
 
 def main(argv=None):
     ap = argparse.ArgumentParser(description=__doc__)
     ap.add_argument("--file", help="judge a single file (used by the pre-edit hook)")
     ap.add_argument("--selftest", action="store_true", help="run controls only")
+    ap.add_argument(
+        "--bench", type=int, nargs="?", const=5, metavar="ROUNDS", help="time both engines"
+    )
+    ap.add_argument("--no-cache", action="store_true", help="neither read nor write the cache")
+    ap.add_argument(
+        "--jobs", type=int, default=1, metavar="N", help="scan in N processes (0: one per core)"
+    )
+    ap.add_argument(
+        "--max-file-mb",
+        type=float,
+        default=MAX_FILE_MB,
+        help="files above this are mmapped and tokenized as bytes (default %(default)s)",
+    )
+    ap.add_argument(
+        "--max-file-seconds",
+        type=float,
+        default=MAX_FILE_SECONDS,
+        help="a file still unfinished after this is UNSCANNED and fails the gate",
+    )
+    scope = ap.add_mutually_exclusive_group()
+    scope.add_argument("--since", metavar="REV", help="only files changed since merge-base(REV)")
+    scope.add_argument("--staged", action="store_true", help="only files with staged changes")
     args = ap.parse_args(argv)
 
     root = pathlib.Path(__file__).resolve().parents[3]
+    cache = _Cache(
+        None if args.no_cache or args.selftest or args.bench else root / CACHE_FILE,
+        detector_version(),
+    )
 
-    if selftest():
-        print(
-            "refusing to report a verdict: the detector's own controls do not hold",
-            file=sys.stderr,
-        )
-        return 1
+    if not cache.controls_hold:
+        if selftest():
+            print(
+                "refusing to report a verdict: the detector's own controls do not hold",
+                file=sys.stderr,
+            )
+            return 1
+        cache.record_controls()
     if args.selftest:
         print("controls hold: %d flag-cases, %d clear-cases" % (len(_MUST_FLAG), len(_MUST_CLEAR)))
         return 0
@@ -190,16 +775,19 @@ def main(argv=None):
     if args.file:
         p = pathlib.Path(args.file)
         try:
-            text = p.read_text(encoding="utf-8", errors="replace")
+            hits = judge(p, cache)
         except OSError as exc:
             print("cannot read %s: %s" % (p, exc), file=sys.stderr)
             return 1
-        hits = findings(text)
+        cache.save()
         for line, why in hits:
             print("%s:%d: inline Python -- %s" % (p, line, why), file=sys.stderr)
         return 1 if hits else 0
 
-    files = tracked_files(root)
+    # --staged judges the index, not the work tree: a partially staged file is
+    # scanned as it will be committed, never as it happens to sit on disk.
+    from_index = args.staged and not on_main(root)
+    files = tracked_files(root, index=from_index)
     if files is None:
         print("VACUOUS INPUT: %s is not a git work tree" % root, file=sys.stderr)
         return 1
@@ -211,15 +799,55 @@ def main(argv=None):
         )
         return 1
 
+    if args.bench:
+        return bench(root, list(files), args.bench)
+
+    scoped = args.since is not None or args.staged
+    if scoped and on_main(root):
+        print("on main: scanning the full tree regardless of --since/--staged", file=sys.stderr)
+        scoped = False
+    if scoped:
+        changed = changed_files(root, args.since)
+        if changed is None:
+            print("cannot resolve --since %s against HEAD" % args.since, file=sys.stderr)
+            return 1
+        files = {rel: sha for rel, sha in files.items() if rel in changed}
+        what = "changed JS/TS file(s) (%s)" % ("staged" if args.staged else "since %s" % args.since)
+    else:
+        what = "tracked JS/TS file(s)"
+
     total = 0
-    for rel in files:
-        try:
-            text = (root / rel).read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            continue
-        for line, why in findings(text):
+    seen = set()
+    large = []
+    unscanned = []
+    budget = (int(args.max_file_mb * (1 << 20)), args.max_file_seconds)
+    for rel, hits, sha, note in scan_all(root, files, cache, args.jobs, budget, from_index):
+        seen.add(sha)
+        if note is not None:
+            (large if note[0] == "large" else unscanned).append((rel, *note[1:]))
+        for line, why in hits or ():
             print("%s:%d: inline Python -- %s" % (rel, line, why), file=sys.stderr)
             total += 1
+    for rel, size, seconds in large:
+        print(
+            "note: %s is %.2f MB, over the %.2f MB in-memory budget; scanned mapped in %.2f s"
+            % (rel, size / 1e6, args.max_file_mb, seconds),
+            file=sys.stderr,
+        )
+    for rel, size, seconds in unscanned:
+        print(
+            "UNSCANNED: %s (%.1f MB) exceeded the %.1f s budget after %.2f s"
+            % (rel, size / 1e6, args.max_file_seconds, seconds),
+            file=sys.stderr,
+        )
+    # Only a full run knows which blobs are gone; a scoped one must not prune.
+    cache.save(keep=None if scoped else seen)
+    if unscanned:
+        print(
+            "%d file(s) were not scanned to the end; that is not a clean result.\n"
+            "Raise --max-file-seconds, or exclude the file from the tracked tree." % len(unscanned),
+            file=sys.stderr,
+        )
     if total:
         print(file=sys.stderr)
         print(
@@ -229,7 +857,9 @@ def main(argv=None):
             file=sys.stderr,
         )
         return 1
-    print("no inline Python in %d tracked JS/TS file(s)" % len(files))
+    if unscanned:
+        return 1
+    print("no inline Python in %d %s" % (len(files), what))
     return 0
 
 
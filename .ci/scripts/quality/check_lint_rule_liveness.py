@@ -21,17 +21,64 @@ ADDING A RULE MEANS ADDING A SPECIMEN. That is deliberate friction. A rule with
 no specimen here is reported as unproven and fails the gate, because "we forgot
 to write the test" and "the rule cannot fire" look identical from outside, and
 this whole file exists because that ambiguity cost the repo five rules.
+
+ONE ESLINT, HOWEVER MANY SPECIMENS, AND NOTHING IN THE TREE. Specimens are linted
+in memory by eslint-lint-harness.cjs, one persistent Node process driven over
+a pipe: ESLint#lintText takes each specimen's text with the virtual path it is
+configured AS, so no probe file is ever written into the translations
+directory and two runs can share a checkout. Each specimen (and the control)
+gets its own virtual path and the results come back per path. Node startup and
+config loading are paid once, so adding a specimen costs one more lintText,
+not one more eslint.
+
+EVERY CUSTOM NAMESPACE, NOT ONLY i18n. The rule set is discovered, not listed:
+the harness reports every plugin namespace whose rules are the objects
+eslint-rules/ exports (today `custom`, `i18n`, `i18n-source`), plus the `files`
+globs of every config block that configures one of them. Each glob is turned
+into a representative virtual path and its config resolved, and a rule is
+ENABLED when any of those paths resolves it above 'off'. The resolution is
+cached in .ci/cache/check_lint_rule_liveness.json under a hash of
+eslint.config.js, eslint-rules/ and this file, so an unchanged config costs no
+resolution at all; the specimens themselves run every time, in one batch.
+
+Rules whose violation is a relation to real sibling files (other locales, the
+command tree, the English source, tutorial transcripts) get LIVE_SPECIMENS:
+builders that read those files on every run and plant the violation in a copy.
+Siblings a rule reads through a directory option are copied into a temporary
+fixture directory, and the harness points that option at it for the
+specimen's path only. A builder that finds no material fails the gate rather
+than waiving its rule. NO_SPECIMEN_YET remains for a rule that has neither
+kind of specimen yet; it is printed on every run, and an entry that stops
+being needed fails the gate.
 """
 
 import argparse
+import hashlib
 import json
+import os
 import pathlib
+import re
 import subprocess
 import sys
+import tempfile
 
-# rule id -> (filename written into the fixture, content that MUST trip it)
+# The specimen's (virtual) path must sit FLAT in the translations directory,
+# not in a temp subdirectory. eslint.config.js matches these rules with
+# `packages/www/src/i18n/translations/*.json` -- a SINGLE star, which does not
+# cross a directory boundary. The first version of this gate wrote its fixtures
+# into a nested mkdtemp and every rule came back "dead"; measured, a nested path
+# resolves 0 i18n rules and a flat one resolves 5. The gate was broken, not the
+# rules, and it would have been a very convincing accusation.
+SPECIMEN_DIR = "packages/www/src/i18n/translations"
+SPECIMEN_STEM = "zz-rule-liveness-probe"
+WWW_LOCALE = SPECIMEN_DIR + "/tr.json"
+
+# rule id -> (path the specimen is linted AS, content that MUST trip it)
 #
-# Content is chosen to violate exactly one rule so a specimen cannot pass by
+# The path only chooses the directory and the suffix: the basename is replaced
+# by SPECIMEN_STEM-<n> so every specimen in the batch has its own virtual path
+# (and a rule that checks file names sees a name nobody would commit). Content
+# is chosen to violate exactly one rule so a specimen cannot pass by
 # accidentally tripping a neighbour. Keep them minimal; a big specimen makes a
 # failure hard to read.
 SPECIMENS = {
@@ -42,17 +89,17 @@ SPECIMENS = {
     # under the wrong key is silent, and reads exactly like a dead rule -- the
     # first draft of this file made that mistake and accused all three.
     "i18n/seo-title-length": (
-        "tr.json",
+        WWW_LOCALE,
         '{\n  "pages": {\n    "x": {\n      "meta": {\n        "title": "%s"\n'
         "      }\n    }\n  }\n}\n" % ("uzun baslik " * 12),
     ),
     "i18n/seo-description-length": (
-        "tr.json",
+        WWW_LOCALE,
         '{\n  "pages": {\n    "x": {\n      "meta": {\n        "description": "%s"\n'
         "      }\n    }\n  }\n}\n" % ("cok uzun aciklama " * 20),
     ),
     "i18n/seo-no-duplicate-h1-title": (
-        "tr.json",
+        WWW_LOCALE,
         (
             '{\n  "pages": {\n    "x": {\n      "meta": {\n        "title": "Yedekleme Cozumu"\n'
             '      },\n      "hero": {\n        "title": "Yedekleme Cozumu"\n'
@@ -63,120 +110,792 @@ SPECIMENS = {
     # decision (see eslint.config.js), so this gate does not require them to
     # fire -- but the specimens stay, so the day someone turns one back on it is
     # proven live in the same commit rather than years later.
-    "i18n/sorted-keys": ("tr.json", '{\n  "b": "1",\n  "a": "2"\n}\n'),
-    "i18n/no-empty-translations": ("tr.json", '{\n  "a": ""\n}\n'),
+    "i18n/sorted-keys": (WWW_LOCALE, '{\n  "b": "1",\n  "a": "2"\n}\n'),
+    "i18n/no-empty-translations": (WWW_LOCALE, '{\n  "a": ""\n}\n'),
+    # custom/* -- the repo's TS/JSX rules. Each path is inside the block that
+    # enables the rule (e.g. the www SEO rules are on for packages/www/src only,
+    # and packages/*/src/**/*.js is globally ignored, hence .ts there).
+    "custom/no-direct-sftp-client": (
+        "packages/cli/src/probe.ts",
+        "export const client = new SFTPClient();\n",
+    ),
+    "custom/prefer-const-arrays": (
+        "packages/shared/src/probe.ts",
+        "export const PROBE_VALUES = ['a', 'b'];\n",
+    ),
+    "custom/no-hardcoded-nullish-defaults": (
+        "packages/shared/src/probe.ts",
+        "export const probe = (v?: number) => v ?? 42;\n",
+    ),
+    "custom/no-duplicate-translation-props": (
+        "packages/shared/src/probe.ts",
+        "export interface ProbeProps {\n  t: TypedTFunction;\n  tCommon: TypedTFunction;\n}\n",
+    ),
+    "custom/require-testid": (
+        "packages/shared/src/probe.tsx",
+        "export const Probe = () => <Button onClick={() => {}}>Go</Button>;\n",
+    ),
+    "custom/no-hardcoded-cli-text": (
+        "packages/cli/src/probe.ts",
+        (
+            "declare const outputService: { success(m: string): void };\n"
+            "outputService.success('Repository deployed successfully');\n"
+        ),
+    ),
+    "custom/require-translation": (
+        "packages/cli/src/probe.ts",
+        "export const probe = (t: (k: string) => string) => t('cli:zzLivenessProbe.missing');\n",
+    ),
+    "custom/require-translation-key-arg": (
+        "packages/cli/src/probe.ts",
+        (
+            "declare function errorResult(key: string): void;\n"
+            "errorResult('commands.zzLivenessProbe.missing');\n"
+        ),
+    ),
+    "custom/e2e-test-naming-convention": ("packages/e2e-tests/tests/probe.test.ts", "export {};\n"),
+    "custom/seo-require-img-alt": (
+        "packages/www/src/probe.tsx",
+        'export const Probe = () => <img src="/probe.png" />;\n',
+    ),
+    "custom/seo-no-vague-anchor-text": (
+        "packages/www/src/probe.tsx",
+        'export const Probe = () => <a href="/en/docs">click here</a>;\n',
+    ),
+    "custom/seo-no-hash-breadcrumb-url": (
+        "packages/www/src/probe.ts",
+        "export const breadcrumbItems = [{ name: 'Solutions', url: '/en/#solutions' }];\n",
+    ),
+    "custom/seo-no-trailing-slash-internal-link": (
+        "packages/www/src/probe.ts",
+        "export const nav = { href: '/en/docs/' };\n",
+    ),
+    "custom/require-data-track": (
+        "packages/www/src/probe.tsx",
+        "export const Probe = () => <button onClick={() => {}}>Go</button>;\n",
+    ),
+    "custom/no-hardcoded-text": (
+        "private/account/web/src/probe.tsx",
+        "export const Probe = () => <p>Deploy the repository now</p>;\n",
+    ),
+    "custom/no-unawaited-drizzle-terminator": (
+        "private/account/src/probe.ts",
+        (
+            "declare const db: any;\ndeclare const table: unknown;\n"
+            "export function probe() {\n  db.insert(table).values({}).run();\n}\n"
+        ),
+    ),
 }
 
+# Rules whose violation is a RELATION between files: the linted text against a
+# sibling locale, the English source, the command tree or cli.json. A constant
+# cannot carry that, and a constant that guesses at live content goes quietly
+# stale the day the content changes. So each of these builds its specimen from
+# the live files at run time, and the siblings it needs are copies of live
+# files in a temporary fixture directory, named after the specimen's own stem.
+# Rules that read siblings from a directory option get that option re-pointed
+# at the fixture for the specimen's path only; the rest read the live tree
+# directly (command-tree.json and en/cli.json are fixed paths in the rule).
+#
+# rule id -> builder(live, stem) -> (path linted AS, content, options or None)
+#
+# A builder that cannot find what it needs in the live files raises
+# LiveSpecimenError, and the gate fails naming the rule: a missing input must
+# not read as a rule that was proven.
+CLI_LOCALES = "packages/cli/src/i18n/locales"
+CLI_SOURCE = "packages/cli/src"
+COMMAND_TREE = "packages/cli/scripts/command-tree.json"
+TRANSCRIPTS = "packages/www/src/data/tutorial-transcripts"
+SIBLING = "tr"
+
+# Mirrors GLOBAL_FLAGS and the token cleanup in
+# eslint-rules/i18n/no-undefined-cli-flags.js, which both flag rules share.
+GLOBAL_FLAGS = ("--output", "--context", "--lang", "--version", "--help", "--help-all")
+LONG_FLAG = re.compile(r"--[a-z][a-z0-9-]*")
+LEADING_TOKEN_CHARS = re.compile(r"^[('\"`\[]+")
+TRAILING_TOKEN_CHARS = re.compile(r"[)'\"`\].,;:!?]+$")
+PLACEHOLDER = re.compile(r"\{\{[^}]+\}\}")
+
+
+class LiveSpecimenError(Exception):
+    """The live files do not hold what a specimen needs."""
+
+
+class LiveFiles:
+    """Read-only access to the live tree, plus a fixture directory per specimen."""
+
+    def __init__(self, harness, root, fixtures):
+        self.harness = harness
+        self.root = root
+        self.fixtures = pathlib.Path(fixtures)
+        self._json = {}
+
+    def text(self, rel):
+        try:
+            return (self.root / rel).read_text(encoding="utf-8")
+        except OSError as exc:
+            raise LiveSpecimenError("cannot read %s: %s" % (rel, exc.strerror)) from exc
+
+    def json(self, rel):
+        if rel not in self._json:
+            try:
+                self._json[rel] = json.loads(self.text(rel))
+            except ValueError as exc:
+                raise LiveSpecimenError("%s is not JSON: %s" % (rel, exc)) from exc
+        return self._json[rel]
+
+    def fixture(self, stem, files=None, dirs=()):
+        """A fresh directory holding `files` ({relative path: text}) and `dirs`."""
+        top = self.fixtures / stem
+        for rel in dirs:
+            (top / rel).mkdir(parents=True, exist_ok=True)
+        for rel, text in (files or {}).items():
+            (top / rel).parent.mkdir(parents=True, exist_ok=True)
+            (top / rel).write_text(text, encoding="utf-8")
+        top.mkdir(parents=True, exist_ok=True)
+        return str(top)
+
+    def configured(self, rule, path):
+        """The rule's resolved setting at `path`, or None."""
+        return (self.harness.request(op="config", filePath=path).get("rules") or {}).get(rule)
+
+    def options(self, rule, path, **overrides):
+        """The rule's configured options at `path`, with `overrides` merged
+        into the first (object) option."""
+        value = self.configured(rule, path)
+        if value is None or not severity(value):
+            raise LiveSpecimenError("%s is not enabled at %s" % (rule, path))
+        opts = list(value[1:]) if isinstance(value, list) else []
+        first = dict(opts[0]) if opts and isinstance(opts[0], dict) else {}
+        first.update(overrides)
+        return [first, *opts[1:]]
+
+
+def _leaves(obj, prefix=()):
+    """(key path tuple, value) for every string leaf of a nested JSON object."""
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            yield from _leaves(value, (*prefix, key))
+        elif isinstance(value, str):
+            yield (*prefix, key), value
+
 
-def enabled_rules(root, probe):
-    """{rule id: severity} for every i18n/* rule ESLint resolves for `probe`."""
-    out = subprocess.run(
-        ["npx", "eslint", "--print-config", probe],
-        capture_output=True,
-        text=True,
-        cwd=str(root),
-        check=False,
+def _lookup(obj, keys):
+    for key in keys:
+        if not isinstance(obj, dict) or key not in obj:
+            return None
+        obj = obj[key]
+    return obj
+
+
+def _nest(keys, value):
+    for key in reversed(keys):
+        value = {key: value}
+    return value
+
+
+def _dump(obj):
+    return json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+
+
+def _first(pairs, what):
+    for found in pairs:
+        return found
+    raise LiveSpecimenError("no %s in the live files" % what)
+
+
+def _flags(text):
+    """The `--flag` tokens of a string, tokenised as the flag rules do."""
+    found = []
+    for token in text.split():
+        cleaned = TRAILING_TOKEN_CHARS.sub("", LEADING_TOKEN_CHARS.sub("", token))
+        m = LONG_FLAG.match(cleaned)
+        if m and m.group(0) not in found:
+            found.append(m.group(0))
+    return found
+
+
+def _valid_flags(live):
+    tree = live.json(COMMAND_TREE)
+    flags = set(GLOBAL_FLAGS)
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for option in node.get("options") or ():
+            flags.update(LONG_FLAG.findall(option.get("flags", "")))
+        stack.extend(node.get("subcommands") or ())
+    flags.update("--" + f[5:] for f in list(flags) if f.startswith("--no-"))
+    return flags
+
+
+def _mangle(flag, text, taken):
+    """`text` with its first `flag` token agglutinated into one nobody registered."""
+    for suffix in ("-ta", "-ista", "-vorbedingung"):
+        if flag + suffix not in taken:
+            return re.sub(re.escape(flag) + r"(?![a-z0-9-])", flag + suffix, text, count=1)
+    raise LiveSpecimenError("every agglutinated form of %s is a real flag" % flag)
+
+
+def _leaf_commands(live, exempt):
+    """Commands the live tree says take no positional, as `rdc` would spell them."""
+    out = []
+
+    def walk(node, parts):
+        subs = node.get("subcommands") or []
+        path = " ".join(parts)
+        if parts and not subs and not node.get("arguments") and path != "run":
+            out.append(path)
+        for sub in subs:
+            walk(sub, [*parts, sub["name"]])
+
+    walk(live.json(COMMAND_TREE), [])
+    return [p for p in sorted(out) if not any(("rdc " + p).startswith(x) for x in exempt)]
+
+
+def _missing_key(live, stem):
+    """en is live en/cli.json; the fixture's sibling copy lost one key."""
+    rule = "i18n/cross-language-consistency"
+    path = "%s/en/%s.json" % (CLI_LOCALES, stem)
+    english = live.text(CLI_LOCALES + "/en/cli.json")
+    sibling = live.json("%s/%s/cli.json" % (CLI_LOCALES, SIBLING))
+    keys = _first(
+        (k for k, _ in _leaves(live.json(CLI_LOCALES + "/en/cli.json")) if _lookup(sibling, k)),
+        "key shared by en and %s cli.json" % SIBLING,
     )
-    if out.returncode != 0:
-        return None
-    try:
-        cfg = json.loads(out.stdout)
-    except ValueError:
-        return None
-    rules = {}
-    for key, value in (cfg.get("rules") or {}).items():
-        if not key.startswith("i18n/"):
-            continue
-        rules[key] = value[0] if isinstance(value, list) else value
-    return rules
+    sibling = json.loads(json.dumps(sibling))
+    del _lookup(sibling, keys[:-1])[keys[-1]]
+    fixture = live.fixture(
+        stem, {"en/%s.json" % stem: english, "%s/%s.json" % (SIBLING, stem): _dump(sibling)}
+    )
+    return path, english, live.options(rule, path, localesDir=fixture)
 
 
-# The specimen must sit FLAT in the translations directory, not in a temp
-# subdirectory. eslint.config.js matches these rules with
-# `packages/www/src/i18n/translations/*.json` -- a SINGLE star, which does not
-# cross a directory boundary. The first version of this gate wrote its fixtures
-# into a nested mkdtemp and every rule came back "dead"; measured, a nested path
-# resolves 0 i18n rules and a flat one resolves 5. The gate was broken, not the
-# rules, and it would have been a very convincing accusation.
-SPECIMEN_DIR = "packages/www/src/i18n/translations"
-SPECIMEN_STEM = "zz-rule-liveness-probe"
+def _missing_file(live, stem):
+    """en is live en/cli.json; the fixture's sibling locale has no file for it.
+
+    A single dropped key cannot trip minimumCoverage 100: coverage is rounded,
+    and one key of cli.json rounds back to 100%.
+    """
+    rule = "i18n/translation-coverage"
+    path = "%s/en/%s.json" % (CLI_LOCALES, stem)
+    english = live.text(CLI_LOCALES + "/en/cli.json")
+    fixture = live.fixture(stem, {"en/%s.json" % stem: english}, dirs=(SIBLING,))
+    return path, english, live.options(rule, path, localesDir=fixture)
 
 
-def fires(root, rule, filename, content):
-    """True when `rule` reports on its own specimen."""
-    suffix = pathlib.Path(filename).suffix or ".json"
-    target = root / SPECIMEN_DIR / (SPECIMEN_STEM + suffix)
+def _english_copied(live, stem):
+    """A sibling value copied verbatim from a live English value that needs translating."""
+    rule = "i18n/no-untranslated-values"
+    path = "%s/%s/%s.json" % (CLI_LOCALES, SIBLING, stem)
+    opts = live.options(rule, path)
     try:
-        target.write_text(content, encoding="utf-8")
-        out = subprocess.run(
-            ["npx", "eslint", str(target), "-f", "json", "--rule", json.dumps({rule: "error"})],
-            capture_output=True,
-            text=True,
-            cwd=str(root),
-            check=False,
-        )
+        allowed = [re.compile(p) for p in opts[0].get("allowedPatterns", ())]
+    except re.error as exc:
+        raise LiveSpecimenError("allowedPatterns is not portable: %s" % exc) from exc
+    english = live.json(CLI_LOCALES + "/en/cli.json")
+    keys, value = _first(
+        (
+            (k, v)
+            for k, v in _leaves(english)
+            if len(v) >= opts[0].get("minLength", 3)
+            and re.search("[a-zA-Z]", v)
+            and not re.match(r"^\{\{[^}]+\}\}$", v.strip())
+            and not re.match(r"^(https?://|/)", v)
+            and not re.match("^[A-Z_]+$", v.strip())
+            and not any(p.search(v) for p in allowed)
+        ),
+        "English value that needs translating",
+    )
+    fixture = live.fixture(stem, {"en/%s.json" % stem: live.text(CLI_LOCALES + "/en/cli.json")})
+    return path, _dump(_nest(keys, value)), live.options(rule, path, localesDir=fixture)
+
+
+def _placeholder_dropped(live, stem):
+    """A live sibling translation with the English placeholders stripped out."""
+    rule = "i18n/interpolation-consistency"
+    path = "%s/%s/%s.json" % (CLI_LOCALES, SIBLING, stem)
+    sibling = live.json("%s/%s/cli.json" % (CLI_LOCALES, SIBLING))
+    keys, value = _first(
+        (
+            (k, PLACEHOLDER.sub("", _lookup(sibling, k)))
+            for k, v in _leaves(live.json(CLI_LOCALES + "/en/cli.json"))
+            if PLACEHOLDER.search(v) and isinstance(_lookup(sibling, k), str)
+        ),
+        "translated value with a placeholder",
+    )
+    fixture = live.fixture(stem, {"en/%s.json" % stem: live.text(CLI_LOCALES + "/en/cli.json")})
+    return path, _dump(_nest(keys, value)), live.options(rule, path, localesDir=fixture)
+
+
+def _flag_agglutinated(live, stem):
+    """A live sibling translation whose `--flag` grew a case ending."""
+    rule = "i18n/cli-flag-consistency"
+    path = "%s/%s/%s.json" % (CLI_LOCALES, SIBLING, stem)
+    valid = _valid_flags(live)
+    sibling = live.json("%s/%s/cli.json" % (CLI_LOCALES, SIBLING))
+    keys, flag, english, value = _first(
+        (
+            (k, flag, v, _lookup(sibling, k))
+            for k, v in _leaves(live.json(CLI_LOCALES + "/en/cli.json"))
+            if isinstance(_lookup(sibling, k), str)
+            for flag in _flags(v)
+            if flag in _flags(_lookup(sibling, k))
+        ),
+        "translated value that keeps an English --flag",
+    )
+    value = _mangle(flag, value, valid | set(_flags(english)))
+    fixture = live.fixture(stem, {"en/%s.json" % stem: live.text(CLI_LOCALES + "/en/cli.json")})
+    return path, _dump(_nest(keys, value)), live.options(rule, path, localesDir=fixture)
+
+
+def _flag_unregistered(live, stem):
+    """A live English value naming a flag that no command in the live tree registers."""
+    rule = "i18n/no-undefined-cli-flags"
+    path = "%s/en/%s.json" % (CLI_LOCALES, stem)
+    opts = live.options(rule, path)[0]
+    exempt = tuple(opts.get("exemptKeyPrefixes", ()))
+    taken = _valid_flags(live) | set(opts.get("exemptFlags", ()))
+    keys, flag, value = _first(
+        (
+            (k, flag, v)
+            for k, v in _leaves(live.json(CLI_LOCALES + "/en/cli.json"))
+            if not ".".join(k).startswith(exempt)
+            for flag in _flags(v)
+        ),
+        "English value naming a --flag",
+    )
+    return path, _dump(_nest(keys, _mangle(flag, value, taken))), None
+
+
+def _exempt_commands(live, stem):
+    """Command prefixes either positional rule exempts. The source rule's
+    defaults are the same EXEMPT_COMMAND_PREFIXES the locale block is given."""
+    prefixes = []
+    for rule, path in (
+        ("i18n/no-positional-cli-syntax", "%s/en/%s.json" % (CLI_LOCALES, stem)),
+        ("custom/no-positional-cli-syntax-source", "%s/%s.ts" % (CLI_SOURCE, stem)),
+    ):
+        value = live.configured(rule, path)
+        if isinstance(value, list) and len(value) > 1 and isinstance(value[1], dict):
+            prefixes += value[1].get("exemptCommandPrefixes", ())
+    return prefixes
+
+
+def _positional_locale(live, stem):
+    """A locale string passing a positional to a live command that takes none."""
+    command = _first(
+        _leaf_commands(live, _exempt_commands(live, stem)), "command that takes no positional"
+    )
+    return "%s/en/%s.json" % (CLI_LOCALES, stem), _dump({"probe": "rdc %s shop" % command}), None
+
+
+def _positional_source(live, stem):
+    """The same positional, as a TypeScript string literal."""
+    command = _first(
+        _leaf_commands(live, _exempt_commands(live, stem)), "command that takes no positional"
+    )
+    return "%s/%s.ts" % (CLI_SOURCE, stem), "export const probe = 'rdc %s shop';\n" % command, None
+
+
+def _transcript_untranslated(live, stem):
+    """A live sibling transcript with one event's text put back into English."""
+    rule = "i18n/no-untranslated-tutorial-transcript-values"
+    path = "%s/%s/%s.json" % (TRANSCRIPTS, SIBLING, stem)
+    opts = live.options(rule, path)
+    casts = sorted(
+        p.name
+        for p in (live.root / TRANSCRIPTS / "en").glob("*.json")
+        if (live.root / TRANSCRIPTS / SIBLING / p.name).is_file()
+    )
+    cast, index, text = _first(
+        (
+            (cast, i, event["text"])
+            for cast in casts
+            for i, event in enumerate(live.json("%s/en/%s" % (TRANSCRIPTS, cast)).get("events", ()))
+            if isinstance(event.get("text"), str)
+            and len(event["text"].strip()) >= opts[0].get("minLength", 3)
+        ),
+        "English transcript event with text",
+    )
+    translated = json.loads(json.dumps(live.json("%s/%s/%s" % (TRANSCRIPTS, SIBLING, cast))))
+    events = translated.get("events") or []
+    if index >= len(events) or not isinstance(events[index], dict):
+        raise LiveSpecimenError("%s/%s has no event %d" % (SIBLING, cast, index))
+    events[index]["text"] = text
+    fixture = live.fixture(stem, {"en/%s.json" % stem: live.text("%s/en/%s" % (TRANSCRIPTS, cast))})
+    return path, _dump(translated), live.options(rule, path, transcriptsDir=fixture)
+
+
+def _summary_missing(live, stem):
+    """.description(t(KEY)) of a live key whose English text crosses 100 characters."""
+    keys, _ = _first(
+        (
+            (k, v)
+            for k, v in _leaves(live.json(CLI_LOCALES + "/en/cli.json"))
+            if len(v) > 100 and not any(re.search(r"[.'\\]", part) for part in k)
+        ),
+        "English value over 100 characters",
+    )
+    return (
+        "%s/%s.ts" % (CLI_SOURCE, stem),
+        (
+            "declare const program: { description(text: string): unknown };\n"
+            "declare function t(key: string): string;\n"
+            "program.description(t('%s'));\n" % ".".join(keys)
+        ),
+        None,
+    )
+
+
+def _variable_missing(live, stem):
+    """t() of a live key with a {{variable}}, called without it."""
+    keys, _ = _first(
+        (
+            (k, v)
+            for k, v in _leaves(live.json(CLI_LOCALES + "/en/cli.json"))
+            if re.search(r"\{\{\w+\}\}", v) and not any(re.search(r"[.:'\\]", part) for part in k)
+        ),
+        "English value with a {{variable}}",
+    )
+    return (
+        "%s/%s.ts" % (CLI_SOURCE, stem),
+        (
+            "declare function t(key: string, options?: object): string;\n"
+            "export const probe = t('cli:%s');\n" % ".".join(keys)
+        ),
+        None,
+    )
+
+
+LIVE_SPECIMENS = {
+    "i18n/cross-language-consistency": _missing_key,
+    "i18n/translation-coverage": _missing_file,
+    "i18n/no-untranslated-values": _english_copied,
+    "i18n/interpolation-consistency": _placeholder_dropped,
+    "i18n/cli-flag-consistency": _flag_agglutinated,
+    "i18n/no-undefined-cli-flags": _flag_unregistered,
+    "i18n/no-positional-cli-syntax": _positional_locale,
+    "custom/no-positional-cli-syntax-source": _positional_source,
+    "i18n/no-untranslated-tutorial-transcript-values": _transcript_untranslated,
+    "custom/require-command-summary": _summary_missing,
+    "i18n-source/interpolation-match": _variable_missing,
+}
+
+# Enabled rules with no specimen yet, each with the reason one is not simple.
+# Every entry is debt, printed on every run. An entry for a rule that gains a
+# specimen or stops being enabled FAILS the gate, so the table cannot rot into
+# a list of rules nobody checks. Empty today: every enabled rule has a
+# specimen, constant or live-built.
+NO_SPECIMEN_YET = {}
+
+
+HARNESS = pathlib.Path(__file__).with_name("eslint-lint-harness.cjs")
+
+
+class HarnessError(Exception):
+    """The lint harness did not answer the question."""
+
+
+class LintHarness:
+    """One long-lived eslint-lint-harness.cjs process, asked over its stdio."""
+
+    def __init__(self, root):
         try:
-            report = json.loads(out.stdout)
-        except ValueError:
-            return False
-        return any(
-            msg.get("ruleId") == rule for entry in report for msg in entry.get("messages", [])
-        )
-    finally:
-        # ALWAYS, including on an exception: a stray locale file left behind
-        # would be picked up by the locale-set gates as a real one.
-        target.unlink(missing_ok=True)
+            self.proc = subprocess.Popen(
+                ["node", str(HARNESS)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=str(root),
+            )
+        except OSError as exc:
+            raise HarnessError("could not launch node: %s" % exc) from exc
+        hello = self._read()
+        if not hello.get("ready"):
+            self.close()
+            raise HarnessError(
+                "harness did not start: %s" % (hello.get("error") or "(no reason given)")
+            )
+        self.version = hello.get("version")
+
+    def _read(self):
+        line = self.proc.stdout.readline()
+        if not line:
+            err = self.proc.stderr.read() if self.proc.poll() is not None else ""
+            raise HarnessError(
+                "harness closed its output (exit=%s)\n%s" % (self.proc.poll(), err[:800])
+            )
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            raise HarnessError("harness wrote a non-JSON line: %r" % line[:200]) from exc
+
+    def request(self, **req):
+        try:
+            self.proc.stdin.write(json.dumps(req) + "\n")
+            self.proc.stdin.flush()
+        except OSError as exc:
+            raise HarnessError("harness stopped reading: %s" % exc) from exc
+        reply = self._read()
+        if not reply.get("ok"):
+            raise HarnessError("%s: %s" % (req.get("op"), reply.get("error")))
+        return reply
+
+    def close(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        for stream in (self.proc.stdout, self.proc.stderr):
+            if stream:
+                stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+CACHE_FILE = ".ci/cache/check_lint_rule_liveness.json"
+JS_SUFFIXES = (".js", ".jsx", ".cjs", ".mjs", ".ts", ".tsx")
+
+
+def severity(value):
+    """A resolved rule setting as 0/1/2 ('off'/'warn'/'error' normalised)."""
+    sev = value[0] if isinstance(value, list) else value
+    return {"off": 0, "warn": 1, "error": 2}.get(sev, sev) if isinstance(sev, str) else sev
+
+
+def _expand_braces(glob):
+    m = re.search(r"\{([^{}]*)\}", glob)
+    if m is None:
+        return [glob]
+    head, tail = glob[: m.start()], glob[m.end() :]
+    return [out for alt in m.group(1).split(",") for out in _expand_braces(head + alt + tail)]
+
+
+def representatives(glob):
+    """Virtual paths a `files` glob matches, one per brace alternative.
+
+    `**/` collapses to nothing and each remaining wildcard becomes the stem, so
+    `packages/cli/src/**/*.{js,ts}` yields packages/cli/src/<stem>.js and .ts.
+    EVERY alternative, not the first: packages/*/src/**/*.js is globally
+    ignored, and a .js representative alone would resolve no config at all.
+    Extglobs and classes are skipped rather than guessed at.
+    """
+    if "!(" in glob or "[" in glob:
+        return []
+    out = []
+    for concrete in _expand_braces(glob.removeprefix("./")):
+        path = concrete.replace("**/", "").replace("**", SPECIMEN_STEM)
+        out.append(path.replace("*", SPECIMEN_STEM).replace("?", "z"))
+    return out
+
+
+def config_key(root):
+    """What resolution depends on: eslint.config.js, every file in eslint-rules/
+    (plugin membership lives there), this file (it turns globs into paths) and
+    the installed eslint."""
+    digest = hashlib.sha256()
+    inputs = [root / "eslint.config.js", pathlib.Path(__file__), HARNESS]
+    inputs += sorted((root / "eslint-rules").rglob("*.js"))
+    inputs.append(root / "node_modules/eslint/package.json")
+    for path in inputs:
+        digest.update(path.relative_to(root).as_posix().encode())
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"\0missing")
+    return digest.hexdigest()[:16]
+
+
+def resolve_rules(harness, root, use_cache=True):
+    """({namespace: [rule names]}, {rule id: max severity anywhere}, cached?).
+
+    Severity is the highest any representative path resolves, so a rule that
+    is 'off' in one block and 'error' in another counts as enabled.
+    """
+    key = config_key(root)
+    cache = root / CACHE_FILE
+    if use_cache:
+        try:
+            data = json.loads(cache.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None  # absent or torn: a cache is never worth failing over
+        if isinstance(data, dict) and data.get("key") == key:
+            return data["namespaces"], data["rules"], True
+
+    found = harness.request(op="discover")
+    namespaces = found["namespaces"]
+    rules = {}
+    for glob in found["globs"]:
+        for path in representatives(glob):
+            cfg = harness.request(op="config", filePath=path).get("rules")
+            for rule_id, value in (cfg or {}).items():
+                ns, _, name = rule_id.rpartition("/")
+                if name in namespaces.get(ns, ()):
+                    rules[rule_id] = max(rules.get(rule_id, 0), severity(value))
+
+    if use_cache:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache.with_name(".%s.%d" % (cache.name, os.getpid()))
+            tmp.write_text(
+                json.dumps({"key": key, "namespaces": namespaces, "rules": rules}),
+                encoding="utf-8",
+            )
+            os.replace(tmp, cache)
+        except OSError as exc:
+            print("warning: cannot write %s: %s" % (cache, exc), file=sys.stderr)
+    return namespaces, rules, False
+
+
+def specimen_path(path, n):
+    """`path` with its basename replaced by SPECIMEN_STEM-<n>, suffix kept."""
+    folder, _, name = path.rpartition("/")
+    return "%s/%s-%d.%s" % (folder, SPECIMEN_STEM, n, name.partition(".")[2] or "json")
+
+
+def fire_all(harness, specimens):
+    """For each (rule, path, content, options), whether `rule` reported on it.
+
+    ONE harness request for the whole list. Each specimen has its own virtual
+    flat path (SPECIMEN_STEM-<n>) with only its own rule switched on there, and
+    a specimen proves its rule only if THAT rule reported on THAT path, so a
+    neighbour firing on it proves nothing. `options`, when not None, replaces
+    the rule's configured options on that path.
+
+    RAISES when a specimen was ignored or failed to parse: neither is "the rule
+    did not fire", and must not be scored as a dead rule.
+    """
+    batch = []
+    for rule, path, content, options in specimens:
+        spec = {
+            "filePath": path,
+            "text": content,
+            "rule": rule,
+            "untyped": path.endswith(JS_SUFFIXES),
+        }
+        if options is not None:
+            spec["options"] = options
+        batch.append(spec)
+    results = harness.request(op="lint", specimens=batch)["results"]
+    verdicts = []
+    for spec, result in zip(batch, results, strict=True):
+        if result["filePath"] != spec["filePath"]:
+            raise HarnessError(
+                "asked about %s, harness answered about %s" % (spec["filePath"], result["filePath"])
+            )
+        if result["ignored"] or result["fatal"]:
+            raise HarnessError(
+                "%s (for %s) was %s"
+                % (
+                    spec["filePath"],
+                    spec["rule"],
+                    "ignored by the config"
+                    if result["ignored"]
+                    else "unparseable: %s" % "; ".join(result["fatal"]),
+                )
+            )
+        verdicts.append(spec["rule"] in result["ruleIds"])
+    return verdicts
 
 
 def main(argv=None):
     # No --selftest flag: the controls are not a separate mode, they run inline
     # on EVERY invocation (see the sorted-keys negative control below). A mode
     # nobody remembers to run is how a control stops controlling anything.
-    argparse.ArgumentParser(description=__doc__).parse_args(argv)
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument(
+        "--no-cache", action="store_true", help="resolve configs afresh; neither read nor write"
+    )
+    args = ap.parse_args(argv)
 
     root = pathlib.Path(__file__).resolve().parents[3]
-    probe = "packages/www/src/i18n/translations/tr.json"
-    if not (root / probe).is_file():
+    if not (root / WWW_LOCALE).is_file():
         print(
-            "VACUOUS INPUT: %s is missing, so no rule set can be resolved" % probe, file=sys.stderr
+            "VACUOUS INPUT: %s is missing, so the control has no real locale beside it"
+            % WWW_LOCALE,
+            file=sys.stderr,
         )
         return 1
 
-    rules = enabled_rules(root, probe)
-    if rules is None:
-        print("cannot resolve the eslint config for %s" % probe, file=sys.stderr)
+    try:
+        with LintHarness(root) as harness:
+            return judge(harness, root, not args.no_cache)
+    except HarnessError as exc:
+        print("cannot drive eslint, so no verdict is possible:\n  %s" % exc, file=sys.stderr)
         return 1
-    if len(rules) < 2:
+
+
+def judge(harness, root, use_cache):
+    namespaces, resolved, cached = resolve_rules(harness, root, use_cache)
+    registered = sorted("%s/%s" % (ns, name) for ns, names in namespaces.items() for name in names)
+    if len(namespaces) < 2 or len(resolved) < 10:
         print(
-            "VACUOUS INPUT: only %d i18n rule(s) resolved for %s. A gate that proves\n"
-            "nothing exits 0 and reads exactly like a healthy rule set." % (len(rules), probe),
+            "VACUOUS INPUT: %d custom namespace(s) discovered and %d of their rule(s)\n"
+            "resolved by any config block. A gate that proves nothing exits 0 and\n"
+            "reads exactly like a healthy rule set." % (len(namespaces), len(resolved)),
             file=sys.stderr,
         )
         return 1
 
-    on = sorted(r for r, sev in rules.items() if sev)
-    off = sorted(r for r, sev in rules.items() if not sev)
+    on = sorted(r for r, sev in resolved.items() if sev)
+    off = sorted(r for r, sev in resolved.items() if not sev)
+    unconfigured = [r for r in registered if r not in resolved]
 
     # CONTROL: the harness must be able to say NO. A rule pointed at a specimen
     # that does not violate it has to come back dead, or every verdict below is
-    # meaningless.
-    if fires(root, "i18n/sorted-keys", "tr.json", '{\n  "a": "1",\n  "b": "2"\n}\n'):
+    # meaningless. It rides in the same batch as the real specimens, so it
+    # exercises exactly the demultiplexing they depend on.
+    control = (
+        "i18n/sorted-keys",
+        specimen_path(WWW_LOCALE, 0),
+        '{\n  "a": "1",\n  "b": "2"\n}\n',
+        None,
+    )
+    specified = SPECIMENS.keys() | LIVE_SPECIMENS.keys()
+    waived = [rule for rule in on if rule not in specified and rule in NO_SPECIMEN_YET]
+    unproven = [rule for rule in on if rule not in specified and rule not in NO_SPECIMEN_YET]
+    stale = sorted(r for r in NO_SPECIMEN_YET if r in specified or r not in on)
+    # Live specimens are built per run: the fixture directory lives only until
+    # the batch is linted, and a builder that finds no material fails the gate.
+    batch, unbuilt = [control], {}
+    with tempfile.TemporaryDirectory(prefix="rule-liveness-") as fixtures:
+        live = LiveFiles(harness, root, fixtures)
+        for n, rule in enumerate((r for r in on if r in specified), 1):
+            if rule in SPECIMENS:
+                path, content = SPECIMENS[rule]
+                batch.append((rule, specimen_path(path, n), content, None))
+                continue
+            try:
+                batch.append((rule, *LIVE_SPECIMENS[rule](live, "%s-%d" % (SPECIMEN_STEM, n))))
+            except LiveSpecimenError as exc:
+                unbuilt[rule] = str(exc)
+        verdicts = fire_all(harness, batch)
+    proven = [spec[0] for spec in batch[1:]]
+    if verdicts[0]:
         print(
             "CONTROL FAILED: sorted-keys 'fired' on ALREADY-SORTED input, so this\n"
             "harness cannot distinguish firing from not firing. Refusing a verdict.",
             file=sys.stderr,
         )
         return 1
+    dead = [rule for rule, ok in zip(proven, verdicts[1:], strict=True) if not ok]
 
-    dead, unproven = [], []
-    for rule in on:
-        spec = SPECIMENS.get(rule)
-        if spec is None:
-            unproven.append(rule)
-            continue
-        if not fires(root, rule, *spec):
-            dead.append(rule)
-
+    if stale:
+        print(
+            "%d NO_SPECIMEN_YET entr(y/ies) no longer apply -- the rule has a specimen\n"
+            "or is not enabled anywhere. Delete them so the table stays true:" % len(stale),
+            file=sys.stderr,
+        )
+        for rule in stale:
+            print("    %s" % rule, file=sys.stderr)
     if unproven:
         print(
             "%d enabled rule(s) have no specimen here, so nothing proves they can fire:"
@@ -185,7 +904,11 @@ def main(argv=None):
         )
         for rule in unproven:
             print("    %s" % rule, file=sys.stderr)
-        print("  Add one to SPECIMENS: input that MUST trip the rule.", file=sys.stderr)
+        print(
+            "  Add one to SPECIMENS: input that MUST trip the rule, linted as a path\n"
+            "  inside the config block that enables it.",
+            file=sys.stderr,
+        )
     if dead:
         print(
             "%d ENABLED rule(s) did NOT fire on a violation they are supposed to catch:"
@@ -199,13 +922,37 @@ def main(argv=None):
             "  to report. Fix the rule -- do not lower its severity to hide this.",
             file=sys.stderr,
         )
-    if unproven or dead:
+    if unbuilt:
+        print(
+            "%d live-built specimen(s) could not be built, so nothing proves those\n"
+            "rules can fire:" % len(unbuilt),
+            file=sys.stderr,
+        )
+        for rule, why in sorted(unbuilt.items()):
+            print("    %s -- %s" % (rule, why), file=sys.stderr)
+    if unproven or dead or stale or unbuilt:
         return 1
 
     print(
-        "%d enabled i18n rule(s) each fired on a planted violation; %d off by "
-        "documented decision" % (len(on), len(off))
+        "%d enabled custom rule(s) across %s each fired on a planted violation (%d built "
+        "from live files); %d off by documented decision; config %s"
+        % (
+            len(proven),
+            ", ".join(sorted(namespaces)),
+            sum(rule in LIVE_SPECIMENS for rule in proven),
+            len(off),
+            "resolution cached" if cached else "resolved",
+        )
     )
+    if waived:
+        print("  %d enabled rule(s) still await a specimen (NO_SPECIMEN_YET):" % len(waived))
+        for rule in waived:
+            print("    %s -- %s" % (rule, NO_SPECIMEN_YET[rule]))
+    if unconfigured:
+        print(
+            "  %d registered rule(s) are configured by no block at all: %s"
+            % (len(unconfigured), ", ".join(unconfigured))
+        )
     return 0
 
 
@@ -29,13 +29,58 @@ WHAT IT DOES NOT DO. It does not judge whether a file's rules are the right
 rules -- only that some linter sees it. A file linted by a config that happens
 to enable nothing would pass here and be caught by the liveness gate instead.
 The two are complements and neither subsumes the other.
+
+HOW IGNORE STATUS IS READ. The first version passed every candidate to one
+`eslint -f json` run and read "File ignored" off the report, which lints ~1000
+files in full to answer a yes/no question. Ignore status is decided by the
+config alone, so the scan now asks eslint-ignore-probe.cjs -- one persistent
+Node process holding one resolved ESLint instance, queried per path over a pipe
+with `isPathIgnored`. No file is parsed and no rule runs.
+
+A faster instrument is a new instrument, and this file exists because an
+instrument was trusted without proof. So a CONTROL re-asks the slow path about
+a sample (every fast-path "ignored" answer up to a cap, a spread of "linted"
+answers, and the known-ignored eslint.config.js) and refuses a verdict on any
+disagreement. `--slow` runs the original full-report scan instead.
+
+BIOME IS ASKED IN BATCHES, AND REMEMBERED. The allowlist control used to start
+biome once per probe path. Now every anchor goes in one invocation and every
+canary in another: biome reports one "Checked N files" count per run, and a
+group that is supposed to agree is settled by that count alone (a mixed group
+is bisected to name the offenders). Verdicts are cached in
+.ci/cache/check_lint_scope_coverage.json under a hash of biome.json and the
+installed biome version, so an unchanged config costs no biome start at all
+and a new canary costs one. `--no-cache` ignores and leaves the cache alone.
+
+THE COVERAGE INDEX. `--index` also writes .ci/cache/lint_coverage_index.json,
+{"files": {path: {"linters": [...], "exempt": reason}}} for every tracked js/ts
+file, plus the eslint and biome config keys it was built under. Coverage
+depends on a path and a config, never on file content, so the index is updated
+incrementally: new paths are probed, departed ones dropped, and a linter's
+whole column is re-probed only when its key changes. `--query PATH...` answers
+from it without starting a linter whenever it is current. A refresh trusts
+isPathIgnored only behind the same slow-path CONTROL the gate runs, and a key
+that cannot be read (no installed linter version) dates nothing: None == None
+is not "unchanged", so such an index is never built and never served.
+
+INCREMENTAL VERDICTS. Coverage can only change when eslint.config.js,
+biome.json, a linter version, this file (the ESLINT_EXEMPT* tables live here)
+or the tracked file set changes. A passing run records its file set under a
+fingerprint of the rest; the next run with the same fingerprint asks eslint
+only about files added since. A removed file cannot uncover anything. Every
+FULL_RUN_EVERY (a week) the whole tree is re-proven regardless, and `--full`
+forces it.
 """
 
 import argparse
+import hashlib
 import json
+import os
 import pathlib
+import re
 import subprocess
 import sys
+import time
 
 # Extensions a linter is expected to cover, and the tool responsible.
 JS_EXT = (".js", ".jsx", ".cjs", ".mjs", ".ts", ".tsx")
@@ -72,12 +117,43 @@ ESLINT_EXEMPT_EXACT = {
     ),
 }
 
-# A path that MUST be outside biome's includes. If biome starts processing it,
+# Paths that MUST be outside biome's includes. If biome starts processing one,
 # the allowlist has been discarded -- which is exactly what a stray comment in
-# the `files` object does, silently.
-BIOME_CANARY = "packages/www/src/i18n/translations/.translation-hashes.json"
-# A path that MUST be inside it, so "everything is out of scope" cannot pass.
-BIOME_ANCHOR = "packages/cli/src/index.ts"
+# the `files` object does, silently. One per kind of exclusion, so a partial
+# loss (one negated glob stops matching) is caught as well as a total one.
+BIOME_CANARIES = (
+    "packages/www/src/i18n/translations/.translation-hashes.json",
+    "packages/cli/src/types/py-modules.d.ts",
+    "packages/shared/src/cli-contract/data/contract.generated.ts",
+    "packages/www/public/search-index-de.json",
+)
+# Paths that MUST be inside it, so "everything is out of scope" cannot pass.
+BIOME_ANCHORS = (
+    "packages/cli/src/index.ts",
+    ".ci/scripts/ci/scope-engine.cjs",
+)
+
+# The persistent ignore-status helper, and how much of its output the control
+# re-derives the slow way. Sized so the control stays a few seconds of real
+# linting rather than the minutes the full slow path costs.
+PROBE = pathlib.Path(__file__).with_name("eslint-ignore-probe.cjs")
+CONTROL_IGNORED_CAP = 8
+CONTROL_LINTED_SPREAD = 8
+# Requests in flight per write. Bounded so neither side can fill its pipe while
+# the other is blocked writing: a chunk's answers stay well under the 64 KiB a
+# pipe buffers.
+PROBE_CHUNK = 256
+
+# Probe verdicts that depend only on config, reused until that config changes.
+CACHE_FILE = ".ci/cache/check_lint_scope_coverage.json"
+# The per-file coverage map other gates and people query instead of re-running
+# eslint. Same lifetime rules as the cache: generated, never committed.
+INDEX_FILE = ".ci/cache/lint_coverage_index.json"
+INDEX_VERSION = 1
+# A reused verdict is only as good as the fingerprint behind it, and drift the
+# fingerprint cannot see (a linter behaving differently under the same version
+# string, a hand-edited cache) is bounded by re-proving everything this often.
+FULL_RUN_EVERY = 7 * 24 * 3600
 
 
 def tracked(root, patterns):
@@ -116,18 +192,150 @@ def eslint_ignored(root, paths):
         return None
     ignored = []
     for entry in report:
-        rel = entry["filePath"].split("/console/")[-1]
+        # eslint reports absolute paths; relative to the root, not to a guessed
+        # checkout directory name, or every answer misses in a clone named otherwise.
+        rel = pathlib.Path(os.path.relpath(entry["filePath"], root)).as_posix()
         if any("File ignored" in (m.get("message") or "") for m in entry.get("messages", [])):
             ignored.append(rel)
     return ignored
 
 
+class EslintProbeError(Exception):
+    """The ignore-status helper did not answer the question."""
+
+
+class EslintIgnoreProbe:
+    """One long-lived eslint-ignore-probe.cjs process, asked over its stdio.
+
+    Every answer is checked against the path that was asked, so a helper that
+    drops or reorders a line is an error here rather than a shifted verdict.
+    """
+
+    def __init__(self, root):
+        try:
+            self.proc = subprocess.Popen(
+                ["node", str(PROBE)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=str(root),
+            )
+        except OSError as exc:
+            raise EslintProbeError("could not launch node: %s" % exc) from exc
+        hello = self._read()
+        if not hello.get("ready"):
+            self.close()
+            raise EslintProbeError(
+                "helper did not start: %s" % (hello.get("error") or "(no reason given)")
+            )
+        self.version = hello.get("version")
+
+    def _read(self):
+        line = self.proc.stdout.readline()
+        if not line:
+            err = self.proc.stderr.read() if self.proc.poll() is not None else ""
+            raise EslintProbeError(
+                "helper closed its output (exit=%s)\n%s" % (self.proc.poll(), err[:800])
+            )
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            raise EslintProbeError("helper wrote a non-JSON line: %r" % line[:200]) from exc
+
+    def ignored(self, paths):
+        """{path: bool} for every path in `paths`; raises on any unanswered one."""
+        answers = {}
+        for at in range(0, len(paths), PROBE_CHUNK):
+            chunk = paths[at : at + PROBE_CHUNK]
+            try:
+                self.proc.stdin.write("".join(p + "\n" for p in chunk))
+                self.proc.stdin.flush()
+            except OSError as exc:
+                raise EslintProbeError("helper stopped reading: %s" % exc) from exc
+            for path in chunk:
+                reply = self._read()
+                if reply.get("path") != path:
+                    raise EslintProbeError(
+                        "asked about %s, helper answered about %s" % (path, reply.get("path"))
+                    )
+                if "error" in reply:
+                    raise EslintProbeError("%s: %s" % (path, reply["error"]))
+                answers[path] = bool(reply["ignored"])
+        return answers
+
+    def close(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        for stream in (self.proc.stdout, self.proc.stderr):
+            if stream:
+                stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def control_sample(candidates, answers):
+    """The paths the slow path re-checks: fast-path positives, a spread of
+    negatives, and every exact exemption (known ignored by a global pattern)."""
+    positives = sorted(p for p in candidates if answers[p])[:CONTROL_IGNORED_CAP]
+    negatives = [p for p in candidates if not answers[p]]
+    step = max(1, len(negatives) // CONTROL_LINTED_SPREAD)
+    return positives + negatives[::step][:CONTROL_LINTED_SPREAD] + sorted(ESLINT_EXEMPT_EXACT)
+
+
+def fast_ignored(root, candidates):
+    """(ignored list, None) via the helper, or (None, reason) when no verdict
+    can be trusted -- the helper failed, or the slow path disagrees with it."""
+    try:
+        with EslintIgnoreProbe(root) as probe:
+            answers = probe.ignored(candidates + sorted(ESLINT_EXEMPT_EXACT))
+    except EslintProbeError as exc:
+        return None, "the ignore-status helper failed: %s" % exc
+
+    # ---- CONTROL: the fast answers must match the slow path on a sample -----
+    sample = control_sample(candidates, answers)
+    slow = eslint_ignored(root, sample)
+    if slow is None:
+        return None, "could not read eslint's report for the control sample"
+    slow = set(slow)
+    wrong = [p for p in sample if answers[p] != (p in slow)]
+    if wrong:
+        return None, (
+            "CONTROL FAILED: isPathIgnored and a real eslint run disagree on %d of %d\n"
+            "  sampled path(s), so the fast path is not measuring what the slow one does:\n%s"
+            % (
+                len(wrong),
+                len(sample),
+                "\n".join("    %s  fast=%s slow=%s" % (p, answers[p], p in slow) for p in wrong),
+            )
+        )
+    if not all(answers[p] for p in ESLINT_EXEMPT_EXACT):
+        return None, (
+            "CONTROL FAILED: the helper says eslint LINTS a file known to sit behind a\n"
+            "  global ignore (%s). It cannot see ignores, so 'nothing ignored' from it\n"
+            "  would mean nothing." % ", ".join(sorted(ESLINT_EXEMPT_EXACT))
+        )
+    return [p for p in candidates if answers[p]], None
+
+
 class BiomeUnreadableError(Exception):
     """biome did not answer the question at all."""
 
 
-def biome_processes(root, path):
-    """True when biome's file selection admits `path`, False when it excludes it.
+_CHECKED = re.compile(r"\bChecked (\d+) files?\b")
+
+
+def biome_count(root, paths):
+    """How many of `paths` biome's file selection admits, from ONE invocation.
 
     RAISES rather than guessing when biome did not run. The first version
     returned `"No files were processed" not in output`, which quietly turned
@@ -138,7 +346,7 @@ def biome_processes(root, path):
     """
     try:
         out = subprocess.run(
-            ["npx", "--no-install", "biome", "format", path],
+            ["npx", "--no-install", "biome", "format", *paths],
             capture_output=True,
             text=True,
             cwd=str(root),
@@ -148,18 +356,313 @@ def biome_processes(root, path):
         raise BiomeUnreadableError("could not launch biome: %s" % exc) from exc
     blob = out.stdout + out.stderr
     if "No files were processed" in blob:
-        return False
-    if "Checked " in blob:
-        return True
+        return 0
+    m = _CHECKED.search(blob)
+    if m:
+        return int(m.group(1))
     raise BiomeUnreadableError(
         "biome produced neither 'Checked' nor 'No files were processed' for %s\n"
-        "  exit=%s\n  output:\n%s" % (path, out.returncode, blob[:800] or "  (empty)")
+        "  exit=%s\n  output:\n%s" % (" ".join(paths), out.returncode, blob[:800] or "  (empty)")
     )
 
 
+def biome_admits(root, paths):
+    """{path: admitted} for distinct `paths`, batched.
+
+    biome reports one count per run, not a per-file list, so a batch whose
+    paths all agree is settled by one invocation -- the healthy case for a
+    group of anchors or a group of canaries -- and a mixed batch is bisected
+    down to the paths that differ. Dozens of canaries cost one biome start.
+    """
+    if not paths:
+        return {}
+    n = biome_count(root, paths)
+    if n == 0:
+        return dict.fromkeys(paths, False)
+    if n == len(paths):
+        return dict.fromkeys(paths, True)
+    if len(paths) == 1:
+        raise BiomeUnreadableError("biome checked %d files for the one path %s" % (n, paths[0]))
+    half = len(paths) // 2
+    return {**biome_admits(root, paths[:half]), **biome_admits(root, paths[half:])}
+
+
+def config_key(root, config, package):
+    """What a verdict from one linter depends on: its config file and its version.
+
+    None when the installed version cannot be read, and then nothing is cached:
+    a verdict keyed on the config alone would survive a linter upgrade that
+    changes how the same config is read.
+    """
+    try:
+        data = (root / config).read_bytes()
+        meta = json.loads(
+            (root / "node_modules" / package / "package.json").read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return None
+    digest = hashlib.sha256(data)
+    digest.update(b"\0%s %s" % (package.encode(), str(meta.get("version")).encode()))
+    return digest.hexdigest()[:16]
+
+
+def biome_key(root):
+    return config_key(root, "biome.json", "@biomejs/biome")
+
+
+def eslint_key(root):
+    return config_key(root, "eslint.config.js", "eslint")
+
+
+def verdict_fingerprint(root):
+    """Everything a coverage verdict depends on besides the file list: both
+    linter configs with their versions, and this gate itself -- which carries
+    the ESLINT_EXEMPT* tables and the probe paths -- plus its Node helper.
+    None when a linter version cannot be read, and then nothing is reused."""
+    keys = (eslint_key(root), biome_key(root))
+    if None in keys:
+        return None
+    digest = hashlib.sha256(pathlib.Path(__file__).read_bytes())
+    digest.update(PROBE.read_bytes())
+    digest.update(("\0%s\0%s" % keys).encode())
+    return digest.hexdigest()[:16]
+
+
+def reusable_verdict(cache, fingerprint, now):
+    """The file set of the last passing run under `fingerprint`, or None when
+    there is none, it is from another fingerprint, or a full run is due."""
+    last = cache.section("verdict", fingerprint)
+    if not last or now - last.get("full_at", 0) >= FULL_RUN_EVERY:
+        return None
+    return set(last.get("files", ()))
+
+
+def record_verdict(cache, fingerprint, files, now, full):
+    previous = cache.section("verdict", fingerprint).get("full_at", 0)
+    cache.update(
+        "verdict", fingerprint, {"files": sorted(files), "full_at": now if full else previous}
+    )
+
+
+def write_json(path, data):
+    """Replace `path` atomically; a failed write warns and leaves the old file."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(".%s.%d" % (path.name, os.getpid()))
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        print("warning: cannot write %s: %s" % (path, exc), file=sys.stderr)
+
+
+class _Cache:
+    """Named sections of probe verdicts, each valid for exactly one key."""
+
+    def __init__(self, path):
+        self.path = path
+        self.dirty = False
+        data = None
+        if path is not None:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = None  # absent or torn: a cache is never worth failing over
+        self.data = data if isinstance(data, dict) else {}
+
+    def section(self, name, key):
+        """The section's entries, emptied first if they were made under another key."""
+        entry = self.data.get(name)
+        if key is None:
+            return {}
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            entry = self.data[name] = {"key": key, "entries": {}}
+            self.dirty = True
+        return entry["entries"]
+
+    def update(self, name, key, entries):
+        if key is None or not entries:
+            return
+        self.section(name, key).update(entries)
+        self.dirty = True
+
+    def save(self):
+        if self.path is not None and self.dirty:
+            write_json(self.path, self.data)
+
+
+def biome_verdicts(root, groups, cache):
+    """{path: admitted} for every path in `groups`, probing only what the cache
+    cannot answer, one batch per group so each batch is expected to agree."""
+    key = biome_key(root)
+    known = cache.section("biome", key)
+    fresh = {}
+    for group in groups:
+        fresh.update(biome_admits(root, [p for p in dict.fromkeys(group) if p not in known]))
+    cache.update("biome", key, fresh)
+    return {**known, **fresh}
+
+
+def biome_groups(paths):
+    """`paths` batched by top-level area and full suffix.
+
+    biome's includes are written per area and per suffix (`*.d.ts`,
+    `*.generated.ts`), so a batch cut along those lines usually agrees with
+    itself and costs one invocation; a mixed batch is bisected by biome_admits.
+    """
+    groups = {}
+    for path in paths:
+        area = "/".join(path.split("/")[:2])
+        suffix = path.rsplit("/", 1)[-1].partition(".")[2]
+        groups.setdefault((area, suffix), []).append(path)
+    return [groups[k] for k in sorted(groups)]
+
+
+class IndexKeyError(Exception):
+    """A linter's config key cannot be read, so no index can be dated by it."""
+
+
+def load_index(root):
+    try:
+        data = json.loads((root / INDEX_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    if None in data.get("keys", {None: None}).values():
+        return None
+    return data
+
+
+def index_keys(root):
+    """{linter: config key}; raises IndexKeyError when any key cannot be read."""
+    keys = {"eslint": eslint_key(root), "biome": biome_key(root)}
+    unkeyed = sorted(tool for tool, key in keys.items() if key is None)
+    if unkeyed:
+        raise IndexKeyError(
+            "cannot read the installed %s version, so there is no key to tell a\n"
+            "  current index from a stale one" % " or ".join(unkeyed)
+        )
+    return keys
+
+
+def update_index(root, files, index):
+    """The coverage index for tracked `files`, reusing whatever `index` still holds.
+
+    Coverage is a property of a PATH under a config, never of file content, so
+    an entry stays valid until its linter's config key changes or the path
+    leaves the tree. Only new paths are probed otherwise; a changed key re-probes
+    that one linter's column for every path. Returns (index, {linter: probed}).
+    Raises IndexKeyError / EslintProbeError / BiomeUnreadableError rather than
+    writing a guess; eslint answers pass the same CONTROL as the gate's own.
+    """
+    keys = index_keys(root)
+    old_keys = (index or {}).get("keys", {})
+    old = (index or {}).get("files", {})
+    todo = {
+        tool: [p for p in files if old_keys.get(tool) != key or p not in old]
+        for tool, key in keys.items()
+    }
+    eslint_in = {}
+    if todo["eslint"]:
+        ignored, why = fast_ignored(root, todo["eslint"])
+        if ignored is None:
+            raise EslintProbeError(why)
+        ignored = set(ignored)
+        eslint_in = {p: p not in ignored for p in todo["eslint"]}
+    biome_in = {}
+    for group in biome_groups(todo["biome"]):
+        biome_in.update(biome_admits(root, group))
+
+    entries = {}
+    for path in files:
+        linters = set(old.get(path, {}).get("linters", ()))
+        for tool, answers in (("eslint", eslint_in), ("biome", biome_in)):
+            if path in answers:
+                (linters.add if answers[path] else linters.discard)(tool)
+        entry = {"linters": sorted(linters)}
+        why = exempt(path)
+        if why:
+            entry["exempt"] = why
+        entries[path] = entry
+    index = {"version": INDEX_VERSION, "keys": keys, "files": entries}
+    return index, {tool: len(paths) for tool, paths in todo.items()}
+
+
+def refresh_index(root, files):
+    """Update the on-disk index to `files`; returns (index, probe counts)."""
+    index, probed = update_index(root, files, load_index(root))
+    write_json(root / INDEX_FILE, index)
+    return index, probed
+
+
+def describe(path, entry):
+    if entry is None:
+        return "%s: not in the index (not a tracked js/ts file)" % path
+    line = "%s: %s" % (path, ", ".join(entry["linters"]) or "linted by NOTHING")
+    if "exempt" in entry:
+        line += "  [exempt: %s]" % entry["exempt"]
+    return line
+
+
+def query(root, paths, as_json):
+    """Answer from the index, refreshing it first only when it cannot answer:
+    a config key moved, or a path asked about is not in it yet."""
+    paths = [p.removeprefix("./") for p in paths]
+    try:
+        keys = index_keys(root)
+    except IndexKeyError as exc:
+        print("refusing to answer from %s: %s" % (INDEX_FILE, exc), file=sys.stderr)
+        return 1
+    index = load_index(root)
+    if index is None or index["keys"] != keys or any(p not in index["files"] for p in paths):
+        files = tracked(root, ["*" + e for e in JS_EXT])
+        if files is None:
+            print("not a git work tree, so nothing can be enumerated", file=sys.stderr)
+            return 1
+        try:
+            index, _ = refresh_index(root, files)
+        except (IndexKeyError, EslintProbeError, BiomeUnreadableError) as exc:
+            print("cannot refresh %s: %s" % (INDEX_FILE, exc), file=sys.stderr)
+            return 1
+    found = {p: index["files"].get(p) for p in paths}
+    if as_json:
+        print(json.dumps(found, indent=2, sort_keys=True))
+    else:
+        for path, entry in found.items():
+            print(describe(path, entry))
+    return 0
+
+
 def main(argv=None):
-    argparse.ArgumentParser(description=__doc__).parse_args(argv)
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument(
+        "--slow",
+        action="store_true",
+        help="read ignore status from a full `eslint -f json` run instead of the helper",
+    )
+    ap.add_argument("--no-cache", action="store_true", help="neither read nor write the cache")
+    ap.add_argument(
+        "--full",
+        action="store_true",
+        help="re-prove every file even when a verdict for the same inputs is cached",
+    )
+    ap.add_argument(
+        "--index",
+        action="store_true",
+        help="after a passing verdict, bring %s up to date" % INDEX_FILE,
+    )
+    ap.add_argument(
+        "--query",
+        nargs="+",
+        metavar="PATH",
+        help="print which linters cover PATH(s) from the index, and exit",
+    )
+    ap.add_argument("--json", action="store_true", help="with --query, print JSON")
+    args = ap.parse_args(argv)
     root = pathlib.Path(__file__).resolve().parents[3]
+    if args.query:
+        return query(root, args.query, args.json)
+    cache = _Cache(None if args.no_cache else root / CACHE_FILE)
 
     files = tracked(root, ["*" + e for e in JS_EXT])
     if files is None:
@@ -177,9 +680,18 @@ def main(argv=None):
     # Both directions, because one alone is satisfiable by a broken config: an
     # allowlist that admits everything passes the anchor, and one that admits
     # nothing passes the canary.
+    missing = [p for p in BIOME_ANCHORS + BIOME_CANARIES if not (root / p).is_file()]
+    if missing:
+        print(
+            "VACUOUS CONTROL: biome probe path(s) no longer exist:\n%s\n"
+            "  A canary that is gone is 'not processed' for the wrong reason, and an\n"
+            "  anchor that is gone proves nothing. Point them at real files."
+            % "\n".join("    %s" % p for p in missing),
+            file=sys.stderr,
+        )
+        return 1
     try:
-        anchor_in = biome_processes(root, BIOME_ANCHOR)
-        canary_in = biome_processes(root, BIOME_CANARY)
+        admitted = biome_verdicts(root, (BIOME_ANCHORS, BIOME_CANARIES), cache)
     except BiomeUnreadableError as exc:
         print(
             "CANNOT PROBE BIOME, so no verdict about its scope is possible:\n  %s\n"
@@ -188,31 +700,46 @@ def main(argv=None):
             file=sys.stderr,
         )
         return 1
-    if not anchor_in:
+    finally:
+        cache.save()
+    outside = [p for p in BIOME_ANCHORS if not admitted[p]]
+    if outside:
         print(
-            "CONTROL FAILED: biome does not process %s, which is squarely inside its\n"
-            "includes. Its file selection is broken, so nothing below is meaningful."
-            % BIOME_ANCHOR,
+            "CONTROL FAILED: biome does not process %s, squarely inside its includes.\n"
+            "  Its file selection is broken, so nothing below is meaningful." % ", ".join(outside),
             file=sys.stderr,
         )
         return 1
-    if canary_in:
+    leaked = [p for p in BIOME_CANARIES if admitted[p]]
+    if leaked:
         print(
-            "biome is processing %s, which is EXCLUDED by biome.json.\n"
+            "biome is processing %s, EXCLUDED by biome.json.\n"
             "  Its `includes` allowlist is not in force. The usual cause is a `//`\n"
             "  comment somewhere in the `files` object: biome then discards the whole\n"
             "  list with NO parse error and NO warning, and lint scope silently\n"
             "  widens (measured 2026-08-06: 631 files -> 1428, 3657 errors).\n"
-            "  Move the comment outside `files`." % BIOME_CANARY,
+            "  Move the comment outside `files`." % ", ".join(leaked),
             file=sys.stderr,
         )
         return 1
 
     # ---- the real scan ------------------------------------------------------
-    candidates = [f for f in files if not exempt(f)]
-    ignored = eslint_ignored(root, candidates)
+    # Incremental when the inputs a verdict depends on are unchanged: files
+    # that were already proven under this exact fingerprint can only have
+    # become uncovered through one of its inputs, so only new paths are asked.
+    now = int(time.time())
+    fingerprint = verdict_fingerprint(root)
+    proven = None if args.full or args.slow else reusable_verdict(cache, fingerprint, now)
+    scope = files if proven is None else [f for f in files if f not in proven]
+    candidates = [f for f in scope if not exempt(f)]
+    ignored = []
+    if candidates and args.slow:
+        ignored = eslint_ignored(root, candidates)
+        why = "could not read eslint's report" if ignored is None else None
+    elif candidates:
+        ignored, why = fast_ignored(root, candidates)
     if ignored is None:
-        print("could not read eslint's report; refusing a verdict", file=sys.stderr)
+        print("%s; refusing a verdict" % why, file=sys.stderr)
         return 1
 
     if ignored:
@@ -234,10 +761,28 @@ def main(argv=None):
         )
         return 1
 
+    record_verdict(cache, fingerprint, files, now, full=proven is None)
+    cache.save()
+    linted = sum(1 for f in files if not exempt(f))
     print(
         "%d tracked js/ts file(s) reach a linter (%d exempt by documented reason); "
-        "biome's allowlist is in force" % (len(candidates), len(files) - len(candidates))
+        "biome's allowlist is in force" % (linted, len(files) - linted)
     )
+    if proven is not None:
+        print(
+            "  incremental: configs and exemptions unchanged since the last full run, "
+            "%d new file(s) checked (--full to re-prove all)" % len(scope)
+        )
+    if args.index:
+        try:
+            index, probed = refresh_index(root, files)
+        except (IndexKeyError, EslintProbeError, BiomeUnreadableError) as exc:
+            print("cannot refresh %s: %s" % (INDEX_FILE, exc), file=sys.stderr)
+            return 1
+        print(
+            "%s: %d path(s), probed %d via eslint and %d via biome"
+            % (INDEX_FILE, len(index["files"]), probed["eslint"], probed["biome"])
+        )
     return 0
 
 
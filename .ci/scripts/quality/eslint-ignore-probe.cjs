@@ -0,0 +1,63 @@
+#!/usr/bin/env node
+// Answers "does eslint ignore this path?" WITHOUT linting it, for
+// check_lint_scope_coverage.py.
+//
+// The gate used to learn ignore status by running `eslint -f json` over every
+// tracked js/ts file and reading "File ignored" warnings off the report. That
+// lints ~1000 files in full -- every rule, every parser -- to answer a yes/no
+// question the config alone decides. This asks the config directly:
+// ESLint#isPathIgnored resolves eslint.config.js once and then evaluates the
+// global ignores per path, no parse, no rules.
+//
+// Protocol, one persistent process over a pipe:
+//   stdout line 1: {"ready": true, "version": "<eslint version>"}
+//                  or {"ready": false, "error": "..."} and exit 1
+//   then, for each newline-delimited repo-relative path read from stdin, in
+//   order, exactly one line: {"path": p, "ignored": true|false}
+//                            or {"path": p, "error": "..."}
+// A path the helper cannot answer is an `error` line, never a guessed boolean:
+// the caller refuses a verdict on it rather than counting it either way.
+//
+// eslint is resolved from the repo root (the cwd), not from this file, so the
+// probe uses exactly the eslint `npx eslint` would.
+
+'use strict';
+
+const path = require('path');
+const readline = require('readline');
+
+function emit(obj) {
+  process.stdout.write(JSON.stringify(obj) + '\n');
+}
+
+async function main() {
+  const cwd = process.cwd();
+  let eslint;
+  let version;
+  try {
+    const { ESLint } = require(require.resolve('eslint', { paths: [cwd] }));
+    eslint = new ESLint({ cwd });
+    version = ESLint.version;
+    // Force config resolution now, so a broken eslint.config.js is a startup
+    // failure rather than the same error repeated once per path.
+    await eslint.isPathIgnored(path.join(cwd, 'package.json'));
+  } catch (err) {
+    emit({ ready: false, error: String((err && err.message) || err) });
+    process.exitCode = 1;
+    return;
+  }
+  emit({ ready: true, version });
+
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of rl) {
+    if (!line) continue;
+    try {
+      const ignored = await eslint.isPathIgnored(path.resolve(cwd, line));
+      emit({ path: line, ignored: Boolean(ignored) });
+    } catch (err) {
+      emit({ path: line, error: String((err && err.message) || err) });
+    }
+  }
+}
+
+main();
@@ -0,0 +1,176 @@
+#!/usr/bin/env node
+// Lints IN-MEMORY text under a virtual path, for check_lint_rule_liveness.py.
+//
+// The liveness gate used to write each specimen into
+// packages/www/src/i18n/translations, because that is the only place the i18n
+// rules' flat-config glob matches. That serialized every run on one directory,
+// could leave a stray locale file behind for the locale gates to find, and
+// stopped two CI lanes from sharing a checkout. ESLint#lintText takes the text
+// directly plus the `filePath` it should be configured AS; the path never has
+// to exist, so nothing touches the disk.
+//
+// Protocol, one persistent process over a pipe, one JSON object per line:
+//   stdout line 1: {"ready": true, "version": "<eslint version>"}
+//                  or {"ready": false, "error": "..."} and exit 1
+//   then one reply line per request line, in order:
+//     {"op": "config", "filePath": p}
+//       -> {"ok": true, "rules": {id: [severity, ...options]}}
+//          (rules null when no config applies to p)
+//     {"op": "lint", "specimens": [{"filePath": p, "text": t, "rule": id,
+//                                   "untyped": bool, "options": [...]?}, ...]}
+//       -> {"ok": true, "results": [{"filePath": p, "ruleIds": [...],
+//                                    "ignored": bool, "fatal": [...]}, ...]}
+//     {"op": "discover"}
+//       -> {"ok": true, "namespaces": {ns: [rule, ...]}, "globs": [...]}
+//     anything that throws -> {"ok": false, "error": "..."}
+//
+// Each specimen's rule is switched on for THAT virtual path only (one
+// overrideConfig block per specimen), so a batch can mix rules from plugins
+// that are registered for different globs without enabling any rule where its
+// plugin does not exist. Only the batch's own rules run at all: the point is
+// whether THEY fire, and the other few hundred rules a path resolves would only
+// add time. `options`, when present, replaces the rule's configured options
+// on that path: a rule that reads sibling files from a directory option is
+// pointed at a fixture directory built from live files, so its specimen can
+// be a real cross-file violation without writing into the tree. `untyped` clears projectService for that path -- a virtual file is
+// in no tsconfig, so type-aware parsing would reject it, and no custom rule in
+// eslint-rules/ reads type information.
+//
+// `discover` answers which plugin namespaces are the repo's OWN: a namespace
+// counts when its rules are the very objects exported from eslint-rules/
+// (identity, not name, so a third-party plugin that happens to share a rule
+// name is never mistaken for one). `globs` are the `files` patterns of every
+// config block that configures one of those namespaces' rules.
+//
+// eslint is resolved from the repo root (the cwd), not from this file, so the
+// harness uses exactly the eslint `npx eslint` would.
+
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+const { pathToFileURL } = require('url');
+
+function emit(obj) {
+  process.stdout.write(JSON.stringify(obj) + '\n');
+}
+
+function* jsFiles(dir) {
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const full = path.join(dir, entry.name);
+    if (entry.isDirectory()) yield* jsFiles(full);
+    else if (entry.name.endsWith('.js')) yield full;
+  }
+}
+
+async function discover(cwd) {
+  const own = new Set();
+  for (const file of jsFiles(path.join(cwd, 'eslint-rules'))) {
+    for (const value of Object.values(await import(pathToFileURL(file).href))) {
+      if (value && typeof value.create === 'function') own.add(value);
+    }
+  }
+  const configs = [
+    (await import(pathToFileURL(path.join(cwd, 'eslint.config.js')).href)).default,
+  ].flat(Infinity);
+  const namespaces = {};
+  for (const block of configs) {
+    for (const [ns, plugin] of Object.entries((block && block.plugins) || {})) {
+      for (const [name, rule] of Object.entries((plugin && plugin.rules) || {})) {
+        if (own.has(rule)) (namespaces[ns] = namespaces[ns] || new Set()).add(name);
+      }
+    }
+  }
+  const globs = new Set();
+  for (const block of configs) {
+    const configures = Object.keys((block && block.rules) || {}).some(
+      (id) => id.includes('/') && id.slice(0, id.lastIndexOf('/')) in namespaces
+    );
+    if (!configures) continue;
+    for (const glob of block.files || ['**/*']) {
+      if (typeof glob === 'string') globs.add(glob);
+    }
+  }
+  const names = {};
+  for (const [ns, rules] of Object.entries(namespaces)) names[ns] = [...rules].sort();
+  return { namespaces: names, globs: [...globs].sort() };
+}
+
+function linter(ESLint, cwd, specimens) {
+  const overrideConfig = specimens.map((s) => ({
+    files: [s.filePath],
+    ...(s.untyped
+      ? { languageOptions: { parserOptions: { projectService: false, project: false } } }
+      : {}),
+    rules: { [s.rule]: s.options ? ['error', ...s.options] : 'error' },
+  }));
+  const wanted = new Set(specimens.map((s) => s.rule));
+  try {
+    return new ESLint({ cwd, overrideConfig, ruleFilter: ({ ruleId }) => wanted.has(ruleId) });
+  } catch {
+    // An eslint without `ruleFilter` still answers correctly, only slower.
+    return new ESLint({ cwd, overrideConfig });
+  }
+}
+
+// One unmodified instance answers every `config` request: it resolves
+// eslint.config.js once, then each path is a lookup.
+let plain = null;
+
+async function handle(ESLint, cwd, req) {
+  if (req.op === 'discover') {
+    return discover(cwd);
+  }
+  if (req.op === 'config') {
+    plain = plain || new ESLint({ cwd });
+    const config = await plain.calculateConfigForFile(
+      path.resolve(cwd, req.filePath)
+    );
+    return { rules: config ? config.rules || {} : null };
+  }
+  if (req.op === 'lint') {
+    const eslint = linter(ESLint, cwd, req.specimens);
+    const results = [];
+    for (const s of req.specimens) {
+      const [result] = await eslint.lintText(s.text, {
+        filePath: path.resolve(cwd, s.filePath),
+        warnIgnored: true,
+      });
+      const messages = result ? result.messages : [];
+      results.push({
+        filePath: s.filePath,
+        ruleIds: [...new Set(messages.map((m) => m.ruleId).filter(Boolean))],
+        ignored: messages.some((m) => !m.ruleId && /File ignored/.test(m.message || '')),
+        fatal: messages.filter((m) => m.fatal).map((m) => m.message),
+      });
+    }
+    return { results };
+  }
+  throw new Error('unknown op: ' + req.op);
+}
+
+async function main() {
+  const cwd = process.cwd();
+  let ESLint;
+  try {
+    ({ ESLint } = require(require.resolve('eslint', { paths: [cwd] })));
+  } catch (err) {
+    emit({ ready: false, error: String((err && err.message) || err) });
+    process.exitCode = 1;
+    return;
+  }
+  emit({ ready: true, version: ESLint.version });
+
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of rl) {
+    if (!line) continue;
+    try {
+      emit({ ok: true, ...(await handle(ESLint, cwd, JSON.parse(line))) });
+    } catch (err) {
+      emit({ ok: false, error: String((err && err.message) || err) });
+    }
+  }
+}
+
+main();
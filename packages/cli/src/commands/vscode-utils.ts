@@ -4,6 +4,7 @@
  */
 
 import { t } from '../i18n/index.js';
+import type { SetupReport } from '../remote/vscode/index.js';
 import { outputService } from '../services/core/output.js';
 
 export interface VSCodeInstallationInfo {
@@ -66,3 +67,34 @@ export function displayActiveConnections(connections: string[]): void {
     outputService.info(`  - ${conn}`);
   });
 }
+
+/**
+ * Display the remote setup script's per-step timing (`vscode connect --timing`)
+ */
+export function displaySetupReport(report: SetupReport | undefined): void {
+  if (!report) {
+    outputService.info(t('commands.vscode.connect.setupTimingUnavailable'));
+    return;
+  }
+
+  outputService.info(
+    t('commands.vscode.connect.setupTiming', {
+      total: report.totalMs.toFixed(1),
+      chown: report.chownMs.toFixed(1),
+    })
+  );
+  const width = Math.max(...report.steps.map((step) => step.name.length));
+  report.steps.forEach((step) => {
+    let state = '';
+    if (step.changed !== undefined) {
+      state = step.changed
+        ? t('commands.vscode.connect.setupTimingChanged')
+        : t('commands.vscode.connect.setupTimingUnchanged');
+    }
+    const ms = step.ms.toFixed(1).padStart(8);
+    outputService.info(`  ${step.name.padEnd(width)}  ${ms} ms  ${state}`.trimEnd());
+    if (step.detail) {
+      outputService.info(`  ${''.padEnd(width)}  ${step.detail}`);
+    }
+  });
+}
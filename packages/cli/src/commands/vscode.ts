@@ -25,6 +25,8 @@ import {
   persistSSHKey,
   removePersistedKeys,
   removeSSHConfigEntry,
+  type ServerCacheOptions,
+  type SetupReport,
   setHostRemotePlatform,
   setHostServerInstallPath,
 } from '../remote/vscode/index.js';
@@ -48,6 +50,7 @@ import { registerVSCodeServeCommands } from './vscode-serve.js';
 import {
   displayActiveConnections,
   displayConfigurationStatus,
+  displaySetupReport,
   displayVSCodeInstallation,
 } from './vscode-utils.js';
 
@@ -62,6 +65,7 @@ interface VSCodeConnectOptions {
   urlOnly?: boolean;
   newWindow?: boolean;
   skipEnvSetup?: boolean;
+  timing?: boolean;
   insiders?: boolean;
   browser?: boolean;
   open?: boolean;
@@ -135,9 +139,29 @@ async function setupSSHConfig(
 
 interface VSCodeInfo {
   path: string;
+  commit?: string;
   isInsiders?: boolean;
 }
 
+/**
+ * The host-wide server cache for this client build, or undefined when the
+ * local build commit is unknown (VS Code found by path, not by command).
+ * It sits beside the shared `.vscode-server` at the datastore root, so every
+ * repo a universal user connects to draws from one copy.
+ */
+function serverCacheFor(
+  connectionDetails: ConnectionDetails,
+  vscodeInfo: VSCodeInfo,
+  insidersOption?: boolean
+): ServerCacheOptions | undefined {
+  if (!vscodeInfo.commit || !connectionDetails.datastore) return undefined;
+  return {
+    root: `${connectionDetails.datastore}/.vscode-server-cache`,
+    commit: vscodeInfo.commit,
+    quality: (insidersOption ?? vscodeInfo.isInsiders) ? 'insider' : 'stable',
+  };
+}
+
 async function configureVSCodeAndSettings(
   connectionName: string,
   connectionDetails: ConnectionDetails,
@@ -283,10 +307,16 @@ async function pinClusterNamespace(
   }
 }
 
+/**
+ * Runs the remote env bootstrap. Returns setup-script.py's timing report when
+ * the script ran and printed one; undefined on any failure, which is logged
+ * and otherwise non-fatal exactly as before.
+ */
 async function setupRemoteEnvironment(
   connectionDetails: ConnectionDetails,
-  repositoryName?: string
-): Promise<void> {
+  repositoryName?: string,
+  serverCache?: ServerCacheOptions
+): Promise<SetupReport | undefined> {
   const sshConnection = new SSHConnection(
     connectionDetails.privateKey,
     connectionDetails.known_hosts,
@@ -301,7 +331,7 @@ async function setupRemoteEnvironment(
   try {
     await sshConnection.setup();
 
-    await withSpinner(t('commands.vscode.connect.settingUpEnv'), async () => {
+    return await withSpinner(t('commands.vscode.connect.settingUpEnv'), async () => {
       // For per-repo connections, sandbox-gateway already runs as universalUser
       // (via --run-as). Telling ensureVSCodeEnvSetup that sshUser == universalUser
       // skips the sudo wrapper that would fail inside the Landlock sandbox.
@@ -316,15 +346,21 @@ async function setupRemoteEnvironment(
         universalUser: connectionDetails.universalUser,
         sshUser: effectiveSshUser,
         serverInstallPath,
+        serverCache,
+        // Never the resident setup agent from inside a repo sandbox: it runs
+        // outside Landlock, so a request to it would be a way out.
+        useAgent: !repositoryName,
         agentSocketPath: sshConnection.agentSocketPath,
       });
 
       if (!setupResult.success) {
         debugLog(`Remote env setup warning: ${setupResult.error}`);
       }
+      return setupResult.report;
     });
   } catch (error) {
     debugLog(`Remote env setup error: ${error instanceof Error ? error.message : String(error)}`);
+    return undefined;
   } finally {
     await sshConnection.cleanup();
   }
@@ -437,7 +473,14 @@ async function connectVSCode(target: string, options: VSCodeConnectOptions): Pro
   );
 
   if (!options.skipEnvSetup && connectionDetails.environment) {
-    await setupRemoteEnvironment(connectionDetails, repositoryName);
+    const report = await setupRemoteEnvironment(
+      connectionDetails,
+      repositoryName,
+      serverCacheFor(connectionDetails, vscodeInfo, options.insiders)
+    );
+    if (options.timing) {
+      displaySetupReport(report);
+    }
   }
 
   const remotePath =
@@ -591,6 +634,7 @@ ${t('help.examples')}
     .option('--url-only', t('options.urlOnly'))
     .option('-n, --new-window', t('options.newWindow'))
     .option('--skip-env-setup', t('options.skipEnvSetup'))
+    .option('--timing', t('options.vscodeTiming'))
     .option('--insiders', t('options.insiders'))
     .option('--browser', t('options.vscodeBrowser'))
     .option('--no-open', t('options.vscodeNoOpen'))
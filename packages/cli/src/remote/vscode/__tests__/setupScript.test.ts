@@ -0,0 +1,509 @@
+import { type ChildProcess, execFileSync, execSync, spawn } from 'node:child_process';
+import { createHash } from 'node:crypto';
+import {
+  chmodSync,
+  existsSync,
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  statSync,
+  symlinkSync,
+  writeFileSync,
+} from 'node:fs';
+import { createConnection } from 'node:net';
+import { tmpdir, userInfo } from 'node:os';
+import { join, resolve } from 'node:path';
+import { afterEach, beforeEach, describe, expect, it } from 'vitest';
+import { buildSetupCommand, parseSetupReport, type SetupReport } from '../bootstrap.js';
+
+// setup-script.py runs on the REMOTE host; here it runs against a temp
+// serverInstallPath owned by the test user, which exercises the same code path
+// minus the SSH hop. No sudo: universalUser is whoever runs the suite.
+const SCRIPT = resolve(import.meta.dirname, '../setup-script.py');
+
+let installPath: string;
+
+beforeEach(() => {
+  installPath = mkdtempSync(join(tmpdir(), 'vscode-setup-'));
+});
+
+afterEach(() => {
+  rmSync(installPath, { recursive: true, force: true });
+});
+
+function setupConfig(overrides: Record<string, unknown> = {}): Record<string, unknown> {
+  return {
+    envBlock: 'export REDIACC_MACHINE=m1',
+    bashFunctions: 'status() { :; }',
+    universalUser: userInfo().username,
+    serverInstallPath: installPath,
+    markerStart: '# --- START ---',
+    markerEnd: '# --- END ---',
+    ...overrides,
+  };
+}
+
+function runSetup(overrides: Record<string, unknown> = {}): SetupReport {
+  const config = JSON.stringify(setupConfig(overrides));
+  const stdout = execFileSync('python3', [SCRIPT, config], { encoding: 'utf8' });
+  const report = parseSetupReport(stdout);
+  if (!report) throw new Error(`no setup report in stdout: ${stdout}`);
+  return report;
+}
+
+describe('setup-script.py report', () => {
+  it('prints one JSON report naming the env file', () => {
+    const report = runSetup();
+    expect(report.envFile).toBe(join(installPath, '.vscode-server', 'rediacc-env.sh'));
+    expect(readFileSync(report.envFile, 'utf8')).toContain('export REDIACC_MACHINE=m1');
+    expect(report.totalMs).toBeGreaterThan(0);
+  });
+
+  it('times every step and flags file writes as changed on first run', () => {
+    const report = runSetup();
+    const names = report.steps.map((s) => s.name);
+    expect(names).toEqual(
+      expect.arrayContaining(['user-lookup', 'write:rediacc-env.sh', 'merge:settings.json'])
+    );
+    for (const step of report.steps.filter((s) => s.name.startsWith('write:'))) {
+      expect(step.changed).toBe(true);
+    }
+  });
+
+  it('reports unchanged files on an identical second run (control: a real change flips it)', () => {
+    runSetup();
+    const again = runSetup();
+    const env = again.steps.find((s) => s.name === 'write:rediacc-env.sh');
+    expect(env?.changed).toBe(false);
+
+    const edited = runSetup({ envBlock: 'export REDIACC_MACHINE=m2' });
+    expect(edited.steps.find((s) => s.name === 'write:rediacc-env.sh')?.changed).toBe(true);
+  });
+});
+
+describe('setup-script.py lazy helpers', () => {
+  const LIBRARY = 'greet() {\n  echo "hi $1"\n}\nexport -f greet 2>/dev/null || true\n';
+
+  function helperGenerations(): string[] {
+    return readdirSync(join(installPath, '.vscode-server', 'bashrc-rediacc.d'));
+  }
+
+  it('keeps function bodies out of the env snapshot and loads them on first call', () => {
+    const report = runSetup({ bashFunctions: LIBRARY });
+    const snapshot = readFileSync(report.envFile, 'utf8');
+    expect(snapshot).not.toContain('echo "hi');
+    expect(snapshot).toContain('export -f greet');
+
+    const out = execFileSync('bash', ['--norc', '-c', '. "$1"; greet there', 'x', report.envFile], {
+      encoding: 'utf8',
+    });
+    expect(out).toBe('hi there\n');
+  });
+
+  it('keeps the previous helper generation for open terminals and prunes older ones', () => {
+    runSetup({ bashFunctions: LIBRARY });
+    const [first] = helperGenerations();
+    runSetup({ bashFunctions: `${LIBRARY}# v2\n` });
+    expect(helperGenerations()).toHaveLength(2);
+    runSetup({ bashFunctions: `${LIBRARY}# v3\n` });
+    expect(helperGenerations()).toHaveLength(2);
+    expect(helperGenerations()).not.toContain(first);
+  });
+
+  it('leaves a function defined inside a block eager (control)', () => {
+    const report = runSetup({ bashFunctions: 'if true; then\n  inner() { echo in; }\nfi\n' });
+    expect(readFileSync(report.envFile, 'utf8')).toContain('inner() { echo in; }');
+  });
+});
+
+describe('setup-script.py settings merge', () => {
+  const PROFILE = 'terminal.integrated.defaultProfile.linux';
+
+  function settingsPath(): string {
+    return join(installPath, '.vscode-server', 'data', 'Machine', 'settings.json');
+  }
+
+  function seedSettings(text: string): void {
+    mkdirSync(join(installPath, '.vscode-server', 'data', 'Machine'), { recursive: true });
+    writeFileSync(settingsPath(), text);
+  }
+
+  function mergeStep(report: SetupReport) {
+    return report.steps.find((s) => s.name === 'merge:settings.json');
+  }
+
+  it('keeps every user key and sets the managed ones', () => {
+    seedSettings(JSON.stringify({ 'workbench.colorTheme': 'Dark', [PROFILE]: 'zsh' }));
+    runSetup();
+    const merged = JSON.parse(readFileSync(settingsPath(), 'utf8')) as Record<string, unknown>;
+    expect(merged['workbench.colorTheme']).toBe('Dark');
+    expect(merged[PROFILE]).toBe('bash');
+  });
+
+  it('does not rewrite a file whose managed keys already match', () => {
+    runSetup();
+    const before = statSync(settingsPath()).mtimeMs;
+    const again = runSetup();
+    expect(mergeStep(again)?.changed).toBe(false);
+    expect(statSync(settingsPath()).mtimeMs).toBe(before);
+  });
+
+  it('backs up an unparseable file instead of silently replacing it', () => {
+    seedSettings('{ not json');
+    const report = runSetup();
+    expect(mergeStep(report)?.changed).toBe(true);
+    expect(readFileSync(`${settingsPath()}.bak`, 'utf8')).toBe('{ not json');
+    const merged = JSON.parse(readFileSync(settingsPath(), 'utf8')) as Record<string, unknown>;
+    expect(merged[PROFILE]).toBe('bash');
+  });
+
+  it('reads JSONC comments and trailing commas as the user meant them', () => {
+    seedSettings('{\n  // theme\n  "workbench.colorTheme": "Dark",\n  "u": "http://x//y",\n}\n');
+    runSetup();
+    const merged = JSON.parse(readFileSync(settingsPath(), 'utf8')) as Record<string, unknown>;
+    expect(merged['workbench.colorTheme']).toBe('Dark');
+    expect(merged.u).toBe('http://x//y');
+    // Comments cannot survive json.dumps, so the original is kept beside it.
+    expect(existsSync(`${settingsPath()}.bak`)).toBe(true);
+  });
+});
+
+describe('setup-script.py server cache', () => {
+  const COMMIT = '0123456789abcdef0123456789abcdef01234567';
+  let cacheRoot: string;
+  let userA: string;
+  let userB: string;
+
+  beforeEach(() => {
+    cacheRoot = join(installPath, 'cache');
+    userA = join(installPath, 'a');
+    userB = join(installPath, 'b');
+  });
+
+  function serverDir(home: string): string {
+    return join(home, '.vscode-server', 'cli', 'servers', `Stable-${COMMIT}`, 'server');
+  }
+
+  function runFor(home: string): SetupReport {
+    return runSetup({
+      serverInstallPath: home,
+      serverCache: { root: cacheRoot, commit: COMMIT, quality: 'stable' },
+    });
+  }
+
+  function cacheStep(report: SetupReport) {
+    return report.steps.find((s) => s.name === 'seed:server-cache');
+  }
+
+  /** Where this uid's runs publish: root fills the shared tree, others their own. */
+  function cacheEntry(): string {
+    const uid = process.getuid?.() ?? 0;
+    return uid === 0
+      ? join(cacheRoot, 'shared', COMMIT)
+      : join(cacheRoot, 'users', String(uid), COMMIT);
+  }
+
+  /** A server build VS Code downloaded into `home` on an earlier connect. */
+  function writeDownloadedServer(home: string, commit = COMMIT): void {
+    mkdirSync(join(serverDir(home), 'bin'), { recursive: true });
+    writeFileSync(join(serverDir(home), 'product.json'), JSON.stringify({ commit }));
+  }
+
+  /** A stand-in for vscode-server-linux-x64.tar.gz: one top-level dir, a product.json. */
+  function writeFakeServerTarball(): void {
+    const src = join(installPath, 'src', 'vscode-server-linux-x64');
+    mkdirSync(join(src, 'bin'), { recursive: true });
+    writeFileSync(join(src, 'product.json'), JSON.stringify({ commit: COMMIT }));
+    writeFileSync(join(src, 'bin', 'code-server'), '#!/bin/sh\n');
+    mkdirSync(cacheRoot, { recursive: true });
+    execFileSync('tar', [
+      'czf',
+      join(cacheRoot, `${COMMIT}.tar.gz`),
+      '-C',
+      join(installPath, 'src'),
+      'vscode-server-linux-x64',
+    ]);
+  }
+
+  it('is a cold no-op when nothing is cached yet (control)', () => {
+    const report = runFor(userA);
+    expect(cacheStep(report)?.changed).toBe(false);
+    expect(existsSync(serverDir(userA))).toBe(false);
+  });
+
+  it('unpacks a cached tarball and seeds the server by hard link', () => {
+    writeFakeServerTarball();
+    const report = runFor(userA);
+    expect(cacheStep(report)?.changed).toBe(true);
+
+    const seeded = statSync(join(serverDir(userA), 'bin', 'code-server'));
+    const cached = statSync(join(cacheEntry(), 'server', 'bin', 'code-server'));
+    expect(seeded.ino).toBe(cached.ino);
+    expect(existsSync(join(serverDir(userA), '.rediacc-manifest.json'))).toBe(false);
+  });
+
+  it('creates its own cache directory private whatever the umask', () => {
+    const config = JSON.stringify(
+      setupConfig({
+        serverInstallPath: userA,
+        serverCache: { root: cacheRoot, commit: COMMIT, quality: 'stable' },
+      })
+    );
+    execFileSync('sh', ['-c', 'umask 0 && exec python3 "$0" "$1"', SCRIPT, config]);
+    const own = statSync(join(cacheRoot, 'users', String(process.getuid?.() ?? 0)));
+    expect(own.mode & 0o777).toBe(0o700);
+    expect(statSync(cacheRoot).mode & 0o022).toBe(0);
+  });
+
+  it('refuses a cached file changed since it was published (control: intact, it seeds)', () => {
+    writeFakeServerTarball();
+    expect(cacheStep(runFor(userA))?.changed).toBe(true);
+
+    writeFileSync(join(cacheEntry(), 'server', 'bin', 'code-server'), '#!/bin/sh\nid\n');
+    const tampered = cacheStep(runFor(userB));
+    expect(tampered?.changed).toBe(false);
+    expect(tampered?.detail).toMatch(/differ from the manifest/);
+    expect(existsSync(serverDir(userB))).toBe(false);
+  });
+
+  it('refuses a cache root that others can write', () => {
+    writeFakeServerTarball();
+    chmodSync(cacheRoot, 0o777);
+    const report = runFor(userA);
+    expect(cacheStep(report)?.detail).toMatch(/untrusted cache .*writable by group or others/);
+    expect(existsSync(serverDir(userA))).toBe(false);
+  });
+
+  it('does not publish a server whose product.json names another commit', () => {
+    writeDownloadedServer(userA, 'f'.repeat(40));
+    expect(cacheStep(runFor(userA))?.detail).toMatch(/not cached yet/);
+  });
+
+  it("publishes a downloaded server and extensions for the same user's next install", () => {
+    writeDownloadedServer(userA);
+    const ext = join(userA, '.vscode-server', 'extensions', 'ms-python.python-2026.1.0');
+    mkdirSync(ext, { recursive: true });
+    writeFileSync(join(ext, 'package.json'), '{}');
+
+    runFor(userA);
+    const second = runFor(userB);
+
+    expect(cacheStep(second)?.changed).toBe(true);
+    expect(existsSync(join(serverDir(userB), 'product.json'))).toBe(true);
+    expect(
+      existsSync(
+        join(userB, '.vscode-server', 'extensions', 'ms-python.python-2026.1.0', 'package.json')
+      )
+    ).toBe(true);
+  });
+
+  it('refuses a commit that is not a hash, since it becomes a path', () => {
+    const report = runSetup({
+      serverInstallPath: userA,
+      serverCache: { root: cacheRoot, commit: '../../etc', quality: 'stable' },
+    });
+    expect(cacheStep(report)?.detail).toMatch(/no valid commit/);
+  });
+});
+
+// The agent refuses peers that run with no_new_privs (what a sandbox sets), so
+// it cannot answer a suite that itself runs under one.
+const NO_NEW_PRIVS = (() => {
+  try {
+    return /^NoNewPrivs:\s*1\s*$/m.test(readFileSync('/proc/self/status', 'utf8'));
+  } catch {
+    return false;
+  }
+})();
+
+describe.skipIf(NO_NEW_PRIVS)('setup-script.py agent', () => {
+  const SHA = createHash('sha256').update(readFileSync(SCRIPT)).digest('hex');
+  let agent: ChildProcess;
+  let socketPath: string;
+  let home: string;
+
+  beforeEach(async () => {
+    // Its own $HOME, so the allowlist a cold run registers is the test's.
+    home = mkdtempSync(join(tmpdir(), 'vscode-agent-home-'));
+    socketPath = join(home, 'agent.sock');
+    agent = spawn('python3', [SCRIPT, '--agent', '--socket', socketPath], {
+      stdio: 'ignore',
+      env: { ...process.env, HOME: home },
+    });
+    const deadline = Date.now() + 10_000;
+    while (!existsSync(socketPath)) {
+      if (Date.now() > deadline) throw new Error('agent did not bind its socket');
+      await new Promise((r) => setTimeout(r, 20));
+    }
+  });
+
+  afterEach(() => {
+    agent.kill();
+    rmSync(home, { recursive: true, force: true });
+  });
+
+  function register(overrides: Record<string, unknown> = {}): void {
+    const config = JSON.stringify(setupConfig(overrides));
+    execFileSync('python3', [SCRIPT, config, '--allow-agent'], {
+      env: { ...process.env, HOME: home },
+    });
+  }
+
+  function ask(request: Record<string, unknown>): Promise<Record<string, unknown>> {
+    return new Promise((resolvePromise, reject) => {
+      let data = '';
+      const conn = createConnection(socketPath, () => conn.end(`${JSON.stringify(request)}\n`));
+      conn.on('data', (chunk: Buffer) => {
+        data += chunk.toString();
+      });
+      conn.on('end', () => resolvePromise(JSON.parse(data) as Record<string, unknown>));
+      conn.on('error', reject);
+    });
+  }
+
+  it('refuses an unregistered install path (control: once registered, it serves)', async () => {
+    const refused = await ask({ v: 1, sha: SHA, config: setupConfig() });
+    expect(refused).toMatchObject({ ok: false });
+    expect(String(refused.error)).toContain('never registered');
+    expect(existsSync(join(installPath, '.vscode-server'))).toBe(false);
+
+    register();
+    expect((await ask({ v: 1, sha: SHA, config: setupConfig() })).ok).toBe(true);
+  });
+
+  it('matches registered roots after resolving links, not by prefix', async () => {
+    register();
+    const sibling = mkdtempSync(join(tmpdir(), 'vscode-setup-'));
+    try {
+      symlinkSync(sibling, join(installPath, 'link'));
+      const escape = await ask({
+        v: 1,
+        sha: SHA,
+        config: setupConfig({ serverInstallPath: join(installPath, 'link') }),
+      });
+      expect(escape).toMatchObject({ ok: false });
+      expect(existsSync(join(sibling, '.vscode-server'))).toBe(false);
+    } finally {
+      rmSync(sibling, { recursive: true, force: true });
+    }
+  });
+
+  it('runs a setup request and answers with the same report a cold run prints', async () => {
+    register();
+    const response = await ask({ v: 1, sha: SHA, config: setupConfig() });
+    const report = parseSetupReport(JSON.stringify(response));
+    expect(response.ok).toBe(true);
+    expect(report?.via).toBe('agent');
+    expect(report?.envFile).toBe(join(installPath, '.vscode-server', 'rediacc-env.sh'));
+    expect(readFileSync(report?.envFile ?? '', 'utf8')).toContain('REDIACC_MACHINE=m1');
+  });
+
+  it('serves repeat requests from one process (control: the second is a no-op)', async () => {
+    register();
+    await ask({ v: 1, sha: SHA, config: setupConfig() });
+    const second = parseSetupReport(
+      JSON.stringify(await ask({ v: 1, sha: SHA, config: setupConfig() }))
+    );
+    expect(second?.steps.find((s) => s.name === 'write:rediacc-env.sh')?.changed).toBe(false);
+  });
+
+  it('answers a client built from another script version with stale, then exits', async () => {
+    register();
+    const envFile = join(installPath, '.vscode-server', 'rediacc-env.sh');
+    const response = await ask({
+      v: 1,
+      sha: '0'.repeat(64),
+      config: setupConfig({ envBlock: 'export REDIACC_MACHINE=m9' }),
+    });
+    expect(response).toMatchObject({ ok: false, stale: true });
+    await new Promise((r) => agent.once('exit', r));
+    expect(existsSync(socketPath)).toBe(false);
+    expect(readFileSync(envFile, 'utf8')).not.toContain('m9');
+  });
+});
+
+describe('buildSetupCommand', () => {
+  const config = JSON.stringify({ envBlock: "export A='x'" });
+
+  it('quotes the script and config once each into shell variables', () => {
+    const command = buildSetupCommand('print(1)\n', config, 'alice', 'alice', true);
+    expect(command.startsWith('sh -c ')).toBe(true);
+    expect(command.split('print(1)').length).toBe(2);
+    expect(command.split('envBlock').length).toBe(2);
+  });
+
+  it("switches users with -H so the agent socket is under the target's home", () => {
+    const command = buildSetupCommand('print(1)\n', config, 'rediacc', 'alice', true);
+    expect(command.startsWith("sudo -H -u 'rediacc' sh -c ")).toBe(true);
+  });
+
+  it('leaves the agent out of a sandboxed connect (control: shared connects use it)', () => {
+    const sandboxed = buildSetupCommand('print(1)\n', config, 'alice', 'alice', false);
+    expect(sandboxed).not.toContain('UNIX-CONNECT');
+    expect(sandboxed).not.toContain('--install-agent');
+    expect(sandboxed).not.toContain('--allow-agent');
+
+    const shared = buildSetupCommand('print(1)\n', config, 'alice', 'alice', true);
+    expect(shared).toContain('--allow-agent');
+    expect(shared).toContain('--install-agent');
+  });
+
+  it('reinstalls the agent only when its file differs or no socket is up', () => {
+    const home = mkdtempSync(join(tmpdir(), 'vscode-agent-home-'));
+    try {
+      // A python3 that only records how it was called, so the program's
+      // shell logic runs without starting a real agent.
+      const bin = join(home, 'bin');
+      mkdirSync(bin);
+      const calls = join(home, 'calls');
+      writeFileSync(join(bin, 'python3'), `#!/bin/sh\necho "$1" >>'${calls}'\n`, { mode: 0o755 });
+      writeFileSync(join(bin, 'socat'), '#!/bin/sh\n', { mode: 0o755 });
+      const command = buildSetupCommand('print(1)\n', config, 'a', 'a', true);
+      const run = () =>
+        execSync(command, {
+          env: { ...process.env, HOME: home, PATH: `${bin}:${process.env.PATH}` },
+        });
+      const installs = () =>
+        readFileSync(calls, 'utf8')
+          .split('\n')
+          .filter((line) => line.endsWith('vscode-setup-agent.py')).length;
+
+      run();
+      expect(installs()).toBe(1);
+      mkdirSync(join(home, '.cache', 'rediacc'), { recursive: true });
+      execFileSync('python3', [
+        '-c',
+        'import socket,sys; socket.socket(socket.AF_UNIX).bind(sys.argv[1])',
+        join(home, '.cache', 'rediacc', 'vscode-setup.sock'),
+      ]);
+      run();
+      expect(installs()).toBe(1);
+      writeFileSync(join(home, '.local', 'share', 'rediacc', 'vscode-setup-agent.py'), 'old');
+      run();
+      expect(installs()).toBe(2);
+    } finally {
+      rmSync(home, { recursive: true, force: true });
+    }
+  });
+});
+
+describe('parseSetupReport', () => {
+  it('finds the report after login-shell noise', () => {
+    const line = JSON.stringify({ envFile: '/x/rediacc-env.sh', totalMs: 1, steps: [] });
+    expect(parseSetupReport(`Welcome to host\n${line}\n`)?.envFile).toBe('/x/rediacc-env.sh');
+  });
+
+  it("unwraps the agent's ok envelope", () => {
+    const report = { envFile: '/x/rediacc-env.sh', totalMs: 1, steps: [], via: 'agent' };
+    const line = JSON.stringify({ ok: true, report });
+    expect(parseSetupReport(line)?.via).toBe('agent');
+    expect(parseSetupReport(JSON.stringify({ ok: false, stale: true }))).toBeUndefined();
+  });
+
+  it('returns undefined when no report was printed', () => {
+    expect(parseSetupReport('Traceback (most recent call last):\n')).toBeUndefined();
+    expect(parseSetupReport('{"unrelated": true}')).toBeUndefined();
+  });
+});
@@ -7,6 +7,7 @@
  */
 
 import { spawn } from 'node:child_process';
+import { createHash } from 'node:crypto';
 import { DEFAULTS } from '@rediacc/shared/config';
 import { BASHRC_REDIACC_CONTENT } from '../repository/bashFunctions.js';
 import { formatBashExports, needsUserSwitch } from './envCompose.js';
@@ -17,6 +18,21 @@ import { formatBashExports, needsUserSwitch } from './envCompose.js';
 const REDIACC_MARKER_START = '# --- REDIACC MANAGED START ---';
 const REDIACC_MARKER_END = '# --- REDIACC MANAGED END ---';
 
+/**
+ * Host-wide VS Code server cache, keyed by the local client's build commit.
+ * The remote setup seeds the install path from it, checked against each
+ * tree's manifest, so the first connect skips the download. Each user's
+ * builds and extensions stay that user's; only a root-owned, read-only
+ * server tree is shared (see "TRUST" in setup-script.py).
+ */
+export interface ServerCacheOptions {
+  /** Cache root on the remote host, shared by every user and repo */
+  root: string;
+  /** 40-hex build commit of the local VS Code client */
+  commit: string;
+  quality: 'stable' | 'insider';
+}
+
 /**
  * Options for remote environment setup
  */
@@ -33,12 +49,43 @@ interface RemoteEnvSetupOptions {
   sshUser: string;
   /** Server install path (e.g., /mnt/rediacc) */
   serverInstallPath: string;
+  /** Shared server cache to seed the install path from (see setup-script.py) */
+  serverCache?: ServerCacheOptions;
+  /**
+   * Ask (and register with) the resident setup agent. Only for connects that
+   * are NOT confined to a repo sandbox; see buildSetupCommand.
+   */
+  useAgent?: boolean;
   /** Optional SSH agent socket path */
   agentSocketPath?: string;
   /** Optional callback for logging */
   onLog?: (message: string) => void;
 }
 
+/** One timed step of setup-script.py; `changed` is set for file writes only. */
+export interface SetupStepTiming {
+  name: string;
+  ms: number;
+  changed?: boolean;
+  /** Free-text outcome for steps that can be skipped (e.g. the server cache) */
+  detail?: string;
+}
+
+/**
+ * The JSON object setup-script.py prints on success. Times are measured inside
+ * the remote interpreter, so SSH handshake and Python startup are NOT in
+ * `totalMs`; the gap between it and the spinner's wall time is that overhead.
+ */
+export interface SetupReport {
+  envFile: string;
+  totalMs: number;
+  chownMs: number;
+  chownCalls: number;
+  steps: SetupStepTiming[];
+  /** `agent` when the resident setup agent answered, `exec` for a cold `python3 -c` */
+  via?: 'agent' | 'exec';
+}
+
 /**
  * Result of remote environment setup
  */
@@ -46,6 +93,7 @@ interface RemoteEnvSetupResult {
   success: boolean;
   error?: string;
   envFilePath?: string;
+  report?: SetupReport;
 }
 
 /**
@@ -62,7 +110,8 @@ interface RemoteEnvSetupResult {
 function buildSetupConfig(
   envBlock: string,
   universalUser: string,
-  serverInstallPath: string
+  serverInstallPath: string,
+  serverCache?: ServerCacheOptions
 ): string {
   return JSON.stringify({
     envBlock,
@@ -71,6 +120,7 @@ function buildSetupConfig(
     serverInstallPath,
     markerStart: REDIACC_MARKER_START,
     markerEnd: REDIACC_MARKER_END,
+    serverCache,
   });
 }
 
@@ -93,11 +143,112 @@ async function loadSetupScript(): Promise<string> {
   return mod.default;
 }
 
+/**
+ * Extracts setup-script.py's report from remote stdout.
+ *
+ * Scans from the LAST line backwards: a login shell's motd or a profile that
+ * echoes can put text ahead of it, and the report is always the final line the
+ * script writes. Returns undefined rather than throwing, because a missing
+ * report must not turn a successful setup into a failed connect.
+ *
+ * Accepts both shapes: the bare report a cold run prints, and the agent's
+ * `{"ok":true,"report":{...}}` envelope.
+ */
+export function parseSetupReport(stdout: string): SetupReport | undefined {
+  const lines = stdout.trim().split('\n');
+  for (let i = lines.length - 1; i >= 0; i--) {
+    const line = lines[i].trim();
+    if (!line.startsWith('{')) continue;
+    try {
+      const raw = JSON.parse(line) as { ok?: boolean; report?: unknown };
+      const parsed = (raw.ok === true ? raw.report : raw) as Partial<SetupReport> | undefined;
+      if (typeof parsed?.envFile === 'string' && Array.isArray(parsed.steps)) {
+        return parsed as SetupReport;
+      }
+    } catch {
+      // not the report; keep looking
+    }
+  }
+  return undefined;
+}
+
 /** Single-quotes a value for POSIX sh. Applies to VALUES only, never to code. */
 function shellSingleQuote(s: string): string {
   return `'${s.replaceAll("'", "'\\''")}'`;
 }
 
+/** Agent paths under the remote user's home; must match setup-script.py. */
+const AGENT_SOCKET = '.cache/rediacc/vscode-setup.sock';
+const AGENT_SCRIPT = '.local/share/rediacc/vscode-setup-agent.py';
+const AGENT_PROTOCOL = 1;
+
+/**
+ * Builds the remote shell program: ask the resident setup agent first, fall
+ * back to a cold `python3 -c` run, then (re)install the agent for next time.
+ *
+ * With `useAgent` false the program is the cold run alone: no socket probe,
+ * no install. A per-repo connect runs inside the repo's Landlock sandbox, and
+ * the agent is an unsandboxed process of the same user, so talking to it would
+ * be a way out. The agent refuses such peers and unregistered paths itself;
+ * the CLI just never asks.
+ *
+ * All in ONE ssh command, so a missing, stale or failed agent costs no extra
+ * round trip. The warm path is `printf | socat` -- no interpreter starts. The
+ * request carries the script's sha256; an agent running an older copy answers
+ * `stale` and exits, and the cold run behind it writes the new copy -- only
+ * when the installed copy differs or no socket is up, so a refused request
+ * (say, for a path not yet registered) does not restart a current agent.
+ *
+ * The source and config are each quoted ONCE into shell variables and reused,
+ * because the whole program is a single argv element on the remote side and
+ * the kernel caps one of those at 128 KiB.
+ */
+export function buildSetupCommand(
+  script: string,
+  config: string,
+  universalUser: string,
+  sshUser: string,
+  useAgent: boolean
+): string {
+  const vars = [`p=${shellSingleQuote(script)}`, `c=${shellSingleQuote(config)}`];
+  if (!useAgent) {
+    return wrapForUser([...vars, 'python3 -c "$p" "$c"'].join('\n'), universalUser, sshUser);
+  }
+
+  const sha = createHash('sha256').update(script).digest('hex');
+  const program = [
+    ...vars,
+    `s="$HOME/${AGENT_SOCKET}"`,
+    'if [ -S "$s" ]; then',
+    `  q=$(printf '{"v":${AGENT_PROTOCOL},"sha":"${sha}","config":%s}' "$c")`,
+    '  if command -v socat >/dev/null 2>&1; then',
+    '    r=$(printf \'%s\\n\' "$q" | socat -t60 - "UNIX-CONNECT:$s" 2>/dev/null)',
+    '  elif command -v nc >/dev/null 2>&1; then',
+    '    r=$(printf \'%s\\n\' "$q" | nc -U -N "$s" 2>/dev/null)',
+    '  fi',
+    '  case "$r" in \'{"ok":true,\'*) printf \'%s\\n\' "$r"; exit 0;; esac',
+    'fi',
+    'python3 -c "$p" "$c" --allow-agent || exit $?',
+    'if command -v socat >/dev/null 2>&1 || command -v nc >/dev/null 2>&1; then',
+    `  a="$HOME/${AGENT_SCRIPT}"`,
+    '  if ! [ -S "$s" ] || ! printf \'%s\' "$p" | cmp -s - "$a"; then',
+    '    mkdir -p "${a%/*}" && printf \'%s\' "$p" >"$a.$$" && mv -f "$a.$$" "$a" &&',
+    '      python3 "$a" --install-agent >/dev/null 2>&1',
+    '  fi',
+    'fi',
+    'exit 0',
+  ].join('\n');
+  return wrapForUser(program, universalUser, sshUser);
+}
+
+/** Runs `program` under sh, as `universalUser` when the SSH user differs. */
+function wrapForUser(program: string, universalUser: string, sshUser: string): string {
+  // -H: the agent socket lives under the universal user's home, not the caller's.
+  return needsUserSwitch(sshUser, universalUser)
+    ? `sudo -H -u ${shellSingleQuote(universalUser)} sh -c ${shellSingleQuote(program)}`
+    : `sh -c ${shellSingleQuote(program)}`;
+}
+
 /**
  * Executes a command on the remote machine via SSH
  *
@@ -189,6 +340,8 @@ export async function ensureVSCodeEnvSetup(
     universalUser,
     sshUser,
     serverInstallPath,
+    serverCache,
+    useAgent = false,
     agentSocketPath,
     onLog,
   } = options;
@@ -202,14 +355,13 @@ export async function ensureVSCodeEnvSetup(
     const envBlock = formatBashExports(envVars);
 
     // The script is a fixed program; only the config varies.
-    const script = shellSingleQuote(await loadSetupScript());
-    const config = shellSingleQuote(buildSetupConfig(envBlock, universalUser, serverInstallPath));
-
-    // Build command to execute
-    // If we need user switching, wrap in sudo
-    const command = needsUserSwitch(sshUser, universalUser)
-      ? `sudo -u ${shellSingleQuote(universalUser)} python3 -c ${script} ${config}`
-      : `python3 -c ${script} ${config}`;
+    const command = buildSetupCommand(
+      await loadSetupScript(),
+      buildSetupConfig(envBlock, universalUser, serverInstallPath, serverCache),
+      universalUser,
+      sshUser,
+      useAgent
+    );
 
     log('Executing remote setup script...');
 
@@ -229,13 +381,12 @@ export async function ensureVSCodeEnvSetup(
 
     log('VS Code environment setup complete');
 
-    // Extract env file path from output if available
-    const pathMatch = /Environment setup complete: (.+)/.exec(result.stdout);
-    const envFilePath = pathMatch ? pathMatch[1].trim() : undefined;
+    const report = parseSetupReport(result.stdout);
 
     return {
       success: true,
-      envFilePath,
+      envFilePath: report?.envFile,
+      report,
     };
   } catch (error) {
     const errorMessage = error instanceof Error ? error.message : String(error);
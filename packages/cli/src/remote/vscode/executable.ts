@@ -92,20 +92,27 @@ async function checkEnvVSCodePath(isWSL = false): Promise<VSCodeInfo | null> {
 }
 
 /**
- * Gets VS Code version from a command.
+ * Gets VS Code version and build commit from a command.
+ *
+ * `--version` prints version, commit and arch on three lines. The commit is
+ * what names the matching server build on the remote, so the server cache
+ * seeded by setup-script.py is keyed on it.
  *
  * Inside WSL we set `DONT_PROMPT_WSL_INSTALL=1` so the Linux `code` script
  * doesn't pop its "Do you want to continue anyway?" advisory prompt during
  * detection — that prompt would either hang on stdin or exit with code 1
  * and make us think VS Code isn't installed.
  */
-function getVSCodeVersion(cmd: string): string | undefined {
+function getVSCodeVersion(cmd: string): { version: string; commit?: string } | undefined {
   try {
-    return execSync(`${cmd} --version`, {
+    const [version, commit = ''] = execSync(`${cmd} --version`, {
       encoding: 'utf8',
       timeout: 5000,
       env: wslCodeEnv(),
-    }).split('\n')[0];
+    })
+      .split('\n')
+      .map((line) => line.trim());
+    return { version, commit: /^[0-9a-f]{40}$/.test(commit) ? commit : undefined };
   } catch {
     return undefined;
   }
@@ -117,9 +124,9 @@ function getVSCodeVersion(cmd: string): string | undefined {
 async function findVSCodeByCommand(isWSL = false): Promise<VSCodeInfo | null> {
   for (const cmd of VSCODE_COMMANDS) {
     if (await commandExists(cmd)) {
-      const version = getVSCodeVersion(cmd);
-      if (version !== undefined) {
-        return { path: cmd, version, isInsiders: cmd === 'code-insiders', isWSL };
+      const info = getVSCodeVersion(cmd);
+      if (info !== undefined) {
+        return { path: cmd, ...info, isInsiders: cmd === 'code-insiders', isWSL };
       }
     }
   }
@@ -4,7 +4,7 @@
  */
 
 // Remote environment bootstrap
-export { ensureVSCodeEnvSetup } from './bootstrap.js';
+export { ensureVSCodeEnvSetup, type ServerCacheOptions, type SetupReport } from './bootstrap.js';
 // Executable detection and launching
 export {
   findVSCode,
@@ -16,22 +16,76 @@ user-switch path.
 The fix is not better escaping. There is NO interpolation into this file at
 all: every value arrives as JSON in argv[1], so the only quoting left is
 shell-quoting a single opaque argument. A value can no longer become code.
+
+OUTPUT. One JSON object on stdout (see SetupReport): the env file path, total
+wall time, and a per-step duration with whether each file actually changed.
+bootstrap.ts parses it, and `rdc vscode connect --timing` prints it, so a slow
+connect can be attributed to a step instead of guessed at.
+
+AGENT. Installed as a file, the same program also runs as a resident per-user
+agent behind a unix socket, so a repeat connect is one socket round trip
+instead of an interpreter start. See "resident agent" below; `--bench` measures
+the difference on the host it runs on.
 """
 
 import contextlib
+import hashlib
 import json
 import os
 import pathlib
 import pwd
+import re
+import shlex
+import shutil
+import socket
+import stat
+import statistics
+import struct
+import subprocess
 import sys
+import tarfile
+import tempfile
+import time
+
+
+class SetupReport:
+    """Per-step wall time and change flags for one run, printed as JSON at exit."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = []
+        self.chown_ms = 0.0
+        self.chown_calls = 0
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Time the body; the yielded dict may be given a `changed` flag."""
+        entry = {"name": name}
+        t0 = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["ms"] = _ms(time.perf_counter() - t0)
+            self.steps.append(entry)
 
-_CONFIG = json.loads(sys.argv[1]) if len(sys.argv) > 1 else {}
-ENV_BLOCK = _CONFIG["envBlock"]
-BASH_FUNCTIONS = _CONFIG["bashFunctions"]
-UNIVERSAL_USER = _CONFIG["universalUser"]
-SERVER_INSTALL_PATH = _CONFIG["serverInstallPath"]
-MARKER_START = _CONFIG["markerStart"]
-MARKER_END = _CONFIG["markerEnd"]
+    def as_dict(self, env_file):
+        return {
+            "envFile": str(env_file),
+            "totalMs": _ms(time.perf_counter() - self.started),
+            # chown time is ALSO inside the step that issued it; this is the
+            # subset, reported separately because on a root-squashed or
+            # network mount it is the part that turns slow on its own.
+            "chownMs": round(self.chown_ms, 3),
+            "chownCalls": self.chown_calls,
+            "steps": self.steps,
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+REPORT = SetupReport()
 
 
 def get_uid_gid(username):
@@ -45,8 +99,11 @@ def get_uid_gid(username):
 
 def safe_chown(path, uid, gid):
     """chown that gracefully degrades when running without root (e.g., inside sandbox)"""
+    t0 = time.perf_counter()
     with contextlib.suppress(OSError):
         os.chown(path, uid, gid)
+    REPORT.chown_ms += (time.perf_counter() - t0) * 1000
+    REPORT.chown_calls += 1
 
 
 def ensure_dir(path, mode=0o755, uid=None, gid=None):
@@ -59,18 +116,32 @@ def ensure_dir(path, mode=0o755, uid=None, gid=None):
 
 
 def write_file_atomic(path, content, mode=0o644, uid=None, gid=None):
-    """Write file atomically with proper permissions"""
+    """Write file atomically with proper permissions. True when the content changed.
+
+    Identical content is NOT rewritten -- only its mode and owner are enforced --
+    so a reconnect leaves mtimes alone and VS Code's settings watcher quiet.
+    """
     path = pathlib.Path(path)
+    try:
+        if path.read_text() == content:
+            os.chmod(path, mode)
+            if uid is not None and gid is not None:
+                safe_chown(path, uid, gid)
+            return False
+    except (OSError, ValueError):
+        pass
     temp_path = path.with_suffix(".tmp")
     temp_path.write_text(content)
     os.chmod(temp_path, mode)
     if uid is not None and gid is not None:
         safe_chown(temp_path, uid, gid)
     temp_path.rename(path)
+    return True
 
 
-def update_managed_content(path, new_content, mode=0o644, uid=None, gid=None):
-    """Update managed section in a file, preserving other content"""
+def update_managed_content(path, new_content, markers, mode=0o644, uid=None, gid=None):
+    """Update managed section in a file, preserving other content. True when it changed."""
+    marker_start, marker_end = markers
     path = pathlib.Path(path)
 
     existing = ""
@@ -78,15 +149,15 @@ def update_managed_content(path, new_content, mode=0o644, uid=None, gid=None):
         existing = path.read_text()
 
     # Check for existing managed section
-    start_idx = existing.find(MARKER_START)
-    end_idx = existing.find(MARKER_END)
+    start_idx = existing.find(marker_start)
+    end_idx = existing.find(marker_end)
 
-    managed_block = f"{MARKER_START}\n{new_content}\n{MARKER_END}"
+    managed_block = f"{marker_start}\n{new_content}\n{marker_end}"
 
     if start_idx != -1 and end_idx != -1:
         # Replace existing managed section
         new_content_full = (
-            existing[:start_idx] + managed_block + existing[end_idx + len(MARKER_END) :]
+            existing[:start_idx] + managed_block + existing[end_idx + len(marker_end) :]
         )
     else:
         # Append managed section
@@ -94,67 +165,1196 @@ def update_managed_content(path, new_content, mode=0o644, uid=None, gid=None):
             existing.rstrip() + "\n\n" + managed_block + "\n" if existing else managed_block + "\n"
         )
 
-    write_file_atomic(path, new_content_full, mode, uid, gid)
+    return write_file_atomic(path, new_content_full, mode, uid, gid)
+
+
+def _strip_jsonc(text):
+    """`text` with JSONC comments and trailing commas removed.
+
+    VS Code writes and accepts settings.json as JSONC, so a user's hand-edited
+    file with a `// note` in it is valid to VS Code and invalid to json.loads.
+    String-aware, so a `//` inside a URL value survives. Linear, one pass per
+    concern; no regex can be both string-aware and this simple.
+    """
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch == '"':
+            j = i + 1
+            while j < n and text[j] != '"':
+                j += 2 if text[j] == "\\" else 1
+            out.append(text[i : j + 1])
+            i = j + 1
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            i = n if j == -1 else j
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            i = n if j == -1 else j + 2
+        else:
+            out.append(ch)
+            i += 1
+    text = "".join(out)
+    out = []
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == '"':
+            j = i + 1
+            while j < n and text[j] != '"':
+                j += 2 if text[j] == "\\" else 1
+            out.append(text[i : j + 1])
+            i = j + 1
+            continue
+        if ch == ",":
+            j = i + 1
+            while j < n and text[j] in " \t\r\n":
+                j += 1
+            if j < n and text[j] in "}]":
+                i += 1
+                continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def read_settings(path):
+    """(settings dict or None, strict) for a VS Code settings file.
+
+    `strict` is True when the file is absent or plain JSON -- i.e. rewriting it
+    with json.dumps loses nothing. JSONC parses to the same dict but comments
+    would not survive a rewrite; garbage parses to None.
+    """
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return {}, True
+    except (OSError, ValueError):
+        # OSError: unreadable. ValueError: not UTF-8 (UnicodeDecodeError).
+        return None, False
+    try:
+        doc = json.loads(text)
+        strict = True
+    except ValueError:
+        try:
+            doc = json.loads(_strip_jsonc(text))
+        except ValueError:
+            return None, False
+        strict = False
+    if not isinstance(doc, dict):
+        return None, False
+    return doc, strict
+
+
+_MISSING = object()
+
+
+def merge_settings(path, managed, mode=0o644, uid=None, gid=None):
+    """Set ONLY the `managed` keys in a settings file. Returns (changed, backup path or None).
+
+    Every other key -- a user's theme, a hundred extension settings -- is kept.
+    The comparison is semantic (parsed values, not text), so a file VS Code has
+    reformatted or reordered is still recognised as already correct and is not
+    rewritten; on a no-op reconnect the file is read once and never written.
+
+    The old behaviour on a parse failure was to replace the user's settings with
+    ours, silently. Now a file that must be rewritten but cannot be reproduced
+    exactly (unparseable, or JSONC whose comments json.dumps would drop) is
+    first moved to `<name>.bak`. One generation only: the next such rewrite
+    replaces it, so a host does not accumulate backups of our own output.
+    """
+    path = pathlib.Path(path)
+    settings, strict = read_settings(path)
+    if settings is not None and all(
+        settings.get(key, _MISSING) == value for key, value in managed.items()
+    ):
+        return False, None
+
+    backup = None
+    if not strict and path.exists():
+        backup = path.with_name(path.name + ".bak")
+        os.replace(path, backup)
+    merged = dict(settings or {})
+    merged.update(managed)
+    write_file_atomic(path, json.dumps(merged, indent=2) + "\n", mode, uid, gid)
+    return True, backup
+
+
+# ---- shared server cache ----------------------------------------------------
+# VS Code's first connect to a host downloads and unpacks a ~60 MB server build
+# for the client's commit, then its extensions -- most of the time a first
+# connect takes. Every per-repo serverInstallPath pays it again for
+# byte-identical files.
+#
+# Layout under the cache root, keyed by the client's commit hash:
+#
+#   <root>/<commit>.tar.gz                  optional: a server tarball to unpack
+#   <root>/shared/<commit>/server/          root-owned, read-only; server only
+#   <root>/users/<uid>/<commit>/server/     one user's own server build
+#   <root>/users/<uid>/<commit>/extensions/X/
+#
+# and what gets seeded into an install path (the layout Remote-SSH's exec
+# server looks for before it downloads anything):
+#
+#   <setup_dir>/cli/servers/<Quality>-<commit>/server/
+#   <setup_dir>/extensions/X/
+#
+# TRUST. A seeded file is code the seeding user runs, so the cache never hands
+# one user what another unprivileged user can still write:
+#
+#   - A user publishes only into <root>/users/<uid>/ (mode 0700, made so
+#     whatever the umask), from files it owns. Hard links there share inodes
+#     with that user's own installs and no one else's.
+#   - <root>/shared/ is written only by root, only from a tarball root or the
+#     user itself owns, and is made read-only. It never holds extensions, so
+#     what one user installs never reaches another.
+#   - Every tree is published with a manifest of sha256 per file. Seeding
+#     creates exactly what the manifest lists and checks each file's owner,
+#     mode and hash before linking it; one mismatch abandons the seed and the
+#     connect goes cold. "product.json exists" is no longer the test, and a
+#     published server must name the commit it is filed under.
+#   - Each directory on the way (root, users/, users/<uid>/, shared/) must be
+#     owned by root or the user and not writable by others (users/ may be
+#     sticky, like /tmp). Sharing across users therefore needs the root and
+#     users/ to be root-owned: a root-run setup creates them, or an
+#     administrator does with `install -d -m 0755 <root>` and
+#     `install -d -m 1777 <root>/users`.
+#
+# Files are HARD-LINKED, so repos cost one copy on disk and seeding is a
+# metadata walk plus a hash. Where a link is refused -- another filesystem
+# (EXDEV), or fs.protected_hardlinks refusing a root-owned file -- the file is
+# copied instead and the report says how many.
+#
+# Every publish and every seed is built in a temp directory and renamed into
+# place, so a concurrent connect sees either nothing or a complete tree, never
+# half of one. Linked files share their inode with the cache, so they are never
+# chowned here. VS Code replaces an extension by installing a NEW versioned
+# directory, never by editing one in place.
+
+_COMMIT = re.compile(r"^[0-9a-f]{40}$")
+_MANIFEST = ".rediacc-manifest.json"
+
+
+class CacheIntegrityError(Exception):
+    """A cache tree that may not be used: untrusted owner or mode, or bad contents."""
+
+
+def _untrusted(st, uid):
+    """Why an lstat result may not be trusted by `uid`, or None."""
+    if st.st_uid not in (0, uid):
+        return "owned by uid %d" % st.st_uid
+    if st.st_mode & 0o022 and not (stat.S_ISDIR(st.st_mode) and st.st_mode & stat.S_ISVTX):
+        return "writable by group or others"
+    return None
+
+
+def _check_dir(path, uid, private=False):
+    """Raise CacheIntegrityError unless `path` is a directory `uid` may trust."""
+    st = os.lstat(path)
+    why = None if stat.S_ISDIR(st.st_mode) else "not a directory"
+    why = why or _untrusted(st, uid)
+    if private and not why and (st.st_uid != uid or st.st_mode & 0o077):
+        why = "not private to uid %d" % uid
+    if why:
+        raise CacheIntegrityError("%s: %s" % (path, why))
+
+
+def _make_dir(path, mode):
+    """Create `path` with exactly `mode`, umask notwithstanding; keep an existing one."""
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        return
+    os.chmod(path, mode)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_tree(src, dst):
+    """Recreate `src` at `dst` with hard-linked files. Returns (linked, copied)."""
+    linked = copied = 0
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        target_dir = os.path.join(dst, rel) if rel != "." else dst
+        os.makedirs(target_dir, exist_ok=True)
+        for name in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+            source = os.path.join(dirpath, name)
+            target = os.path.join(target_dir, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+                continue
+            try:
+                os.link(source, target)
+                linked += 1
+            except OSError:
+                shutil.copy2(source, target)
+                copied += 1
+    return linked, copied
+
+
+def seal_tree(tree, uid, readonly=False):
+    """Write `tree`'s manifest after checking every entry is `uid`'s to publish.
+
+    Group and other write bits are cleared; `readonly` clears every write bit,
+    for the root-owned shared tree.
+    """
+    manifest = {"dirs": [], "files": {}, "links": {}}
+    for dirpath, dirnames, filenames in os.walk(tree):
+        rel_dir = os.path.relpath(dirpath, tree)
+        if rel_dir != ".":
+            manifest["dirs"].append(rel_dir)
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            rel = os.path.normpath(os.path.join(rel_dir, name))
+            st = os.lstat(path)
+            if stat.S_ISLNK(st.st_mode):
+                manifest["links"][rel] = os.readlink(path)
+                continue
+            if st.st_uid not in (0, uid):
+                raise CacheIntegrityError("%s: owned by uid %d" % (path, st.st_uid))
+            mode = st.st_mode & ~(0o222 if readonly else 0o022)
+            if mode != st.st_mode:
+                os.chmod(path, stat.S_IMODE(mode))
+            if stat.S_ISREG(st.st_mode):
+                manifest["files"][rel] = _sha256(path)
+            elif not stat.S_ISDIR(st.st_mode):
+                raise CacheIntegrityError("%s: not a file, directory or link" % path)
+    write_file_atomic(os.path.join(tree, _MANIFEST), json.dumps(manifest, sort_keys=True))
+    if readonly:
+        os.chmod(os.path.join(tree, _MANIFEST), 0o444)
+        for rel in [*manifest["dirs"], "."]:
+            os.chmod(os.path.join(tree, rel), 0o555)  # noqa: S103 -- read-only is the point
+    return manifest
+
+
+def seed_tree(src, dst, trust_uid, uid=None, gid=None):
+    """Build `dst` from what `src`'s manifest lists, verified. Returns (linked, copied).
+
+    Raises CacheIntegrityError on a missing, changed, foreign-owned or
+    world-writable file; `dst` is a temp directory the caller discards.
+    """
+    manifest_path = os.path.join(src, _MANIFEST)
+    why = _untrusted(os.lstat(manifest_path), trust_uid)
+    if why:
+        raise CacheIntegrityError("%s: %s" % (manifest_path, why))
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    rels = [*manifest["dirs"], *manifest["files"], *manifest["links"]]
+    if any(os.path.isabs(rel) or ".." in rel.split(os.sep) for rel in rels):
+        raise CacheIntegrityError("%s: path outside the tree" % manifest_path)
+    for rel in ["", *sorted(manifest["dirs"])]:
+        os.makedirs(os.path.join(dst, rel), exist_ok=True)
+        if uid is not None and gid is not None:
+            safe_chown(os.path.join(dst, rel), uid, gid)
+    linked = copied = 0
+    for rel, want in sorted(manifest["files"].items()):
+        source = os.path.join(src, rel)
+        st = os.lstat(source)
+        why = "not a regular file" if not stat.S_ISREG(st.st_mode) else None
+        why = why or _untrusted(st, trust_uid)
+        if not why and _sha256(source) != want:
+            why = "contents differ from the manifest"
+        if why:
+            raise CacheIntegrityError("%s: %s" % (source, why))
+        try:
+            os.link(source, os.path.join(dst, rel))
+            linked += 1
+        except OSError:
+            shutil.copy2(source, os.path.join(dst, rel))
+            copied += 1
+    for rel, target in sorted(manifest["links"].items()):
+        os.symlink(target, os.path.join(dst, rel))
+    return linked, copied
+
+
+def _publish(final, build):
+    """Run `build(tmp)` and rename tmp to `final`. False when `final` appeared first."""
+    final = pathlib.Path(final)
+    final.parent.mkdir(parents=True, exist_ok=True)
+    tmp = final.parent / (".%s.%d.tmp" % (final.name, os.getpid()))
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        result = build(tmp)
+        os.rename(tmp, final)
+    except CacheIntegrityError:
+        _discard(tmp)
+        raise
+    except OSError:
+        # ENOTEMPTY/EEXIST from a concurrent publisher is a win for both; any
+        # other failure leaves the destination exactly as it was.
+        _discard(tmp)
+        if final.exists():
+            return None
+        raise
+    return result
+
+
+def _discard(tree):
+    """rmtree that also removes a tree sealed read-only."""
+
+    def writable(func, path, _exc):
+        os.chmod(os.path.dirname(path), 0o700)
+        func(path)
+
+    if os.path.lexists(tree):
+        shutil.rmtree(tree, onerror=writable)
+
+
+def _unpack_server(tarball, dest):
+    """Unpack a VS Code server tarball into `dest`, dropping its one top-level dir."""
+    with tarfile.open(tarball) as tar:
+        members = tar.getmembers()
+        tops = {m.name.split("/", 1)[0] for m in members}
+        strip = len(tops) == 1 and any(m.isdir() and m.name in tops for m in members)
+        if strip:
+            (top,) = tops
+            for m in members:
+                m.name = m.name[len(top) + 1 :] if m.name != top else "."
+            members = [m for m in members if m.name != "."]
+        # The "data" filter refuses absolute paths, `..` and device nodes; it is
+        # the default from Python 3.14 and exists back to 3.8.17/3.11.4.
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, members=members, filter="data")
+        else:
+            tar.extractall(dest, members=members)  # noqa: S202 -- older Python, no filter API
+    # Unpacked bytes are new data, not links; count them as copies.
+    return 0, sum(1 for m in members if m.isfile())
+
+
+def _product_commit(server):
+    """The commit a server build's product.json names, or None."""
+    try:
+        with open(os.path.join(server, "product.json")) as f:
+            return json.load(f).get("commit")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _cache_entries(root, commit, euid):
+    """(own entry, shared entry or None), creating the caller's own namespace.
+
+    Raises CacheIntegrityError when a directory on either path is untrusted.
+    """
+    if not root.exists():
+        root.mkdir(parents=True, exist_ok=True)
+        os.chmod(root, 0o755)  # noqa: S103 -- others read it; see TRUST
+    _check_dir(root, euid)
+    users = root / "users"
+    _make_dir(users, 0o1777)
+    _check_dir(users, euid)
+    own = users / str(euid)
+    _make_dir(own, 0o700)
+    _check_dir(own, euid, private=True)
+    shared = root / "shared"
+    if euid == 0:
+        _make_dir(shared, 0o755)
+    try:
+        _check_dir(root, 0)
+        _check_dir(shared, 0)
+    except (CacheIntegrityError, FileNotFoundError):
+        return own / commit, None
+    return own / commit, shared / commit
+
+
+def _trusted_file(path, euid):
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    return stat.S_ISREG(st.st_mode) and _untrusted(st, euid) is None
+
+
+def seed_server_cache(setup_dir, cache, uid=None, gid=None):
+    """Publish to and seed from the server cache. Returns a report dict."""
+    commit = str(cache.get("commit") or "")
+    if not _COMMIT.match(commit):
+        # The commit becomes a path component; anything but a hash is refused
+        # rather than sanitised.
+        return {"changed": False, "detail": "skipped: no valid commit"}
+    quality = "Insiders" if cache.get("quality") == "insider" else "Stable"
+    root = pathlib.Path(cache["root"])
+    user_server = setup_dir / "cli" / "servers" / ("%s-%s" % (quality, commit)) / "server"
+    user_ext = setup_dir / "extensions"
+    euid = os.geteuid()
+    try:
+        own, shared = _cache_entries(root, commit, euid)
+    except OSError as exc:
+        # Inside a repo sandbox the datastore-level cache is typically outside
+        # the Landlock allowlist. That is a cold connect, not a failed one.
+        return {"changed": False, "detail": "skipped: cache unavailable (%s)" % exc.strerror}
+    except CacheIntegrityError as exc:
+        return {"changed": False, "detail": "skipped: untrusted cache (%s)" % exc}
+    try:
+        return _seed(own, shared, root / (commit + ".tar.gz"), user_server, user_ext, uid, gid)
+    except CacheIntegrityError as exc:
+        return {"changed": False, "detail": "skipped: %s" % exc}
+
+
+def _seed(own, shared, tarball, user_server, user_ext, uid, gid):
+    commit = own.name
+    euid = os.geteuid()
+    source = "cache"
+    linked = copied = 0
+
+    def sealed(build, readonly=False):
+        def run(tmp):
+            got = build(tmp)
+            seal_tree(tmp, euid, readonly)
+            return got
+
+        return run
+
+    # Where the server comes from, first match wins: this user's own entry, the
+    # root-owned shared one, the user's own download, a trusted tarball.
+    entry = own
+    if not (own / "server" / _MANIFEST).is_file():
+        if shared is not None and (shared / "server" / _MANIFEST).is_file():
+            entry = shared
+        elif _product_commit(user_server) == commit:
+            source = "published"
+            got = _publish(own / "server", sealed(lambda tmp: link_tree(user_server, tmp)))
+            if got:
+                linked, copied = linked + got[0], copied + got[1]
+        elif _trusted_file(tarball, euid):
+            source = "tarball"
+            if shared is not None and euid == 0:
+                entry = shared
+            got = _publish(
+                entry / "server",
+                sealed(lambda tmp: _unpack_server(tarball, tmp), readonly=entry is shared),
+            )
+            if got:
+                linked, copied = linked + got[0], copied + got[1]
+        else:
+            return {"changed": False, "detail": "cold: %s not cached yet" % commit[:12]}
+
+    # Extensions stay in this user's own entry, both ways, one directory at a
+    # time, and never overwrite.
+    published_ext = seeded_ext = 0
+    if user_ext.is_dir() and _product_commit(user_server) == commit:
+        for ext in sorted(user_ext.iterdir()):
+            if (
+                ext.is_dir()
+                and not ext.name.startswith(".")
+                and not (own / "extensions" / ext.name).exists()
+            ):
+                try:
+                    got = _publish(
+                        own / "extensions" / ext.name,
+                        sealed(lambda tmp, e=ext: link_tree(e, tmp)),
+                    )
+                except CacheIntegrityError:
+                    continue  # not this user's to publish; theirs to keep
+                published_ext += got is not None
+
+    changed = False
+    trust = 0 if entry is shared else euid
+    if not user_server.exists():
+        got = _publish(user_server, lambda tmp: seed_tree(entry / "server", tmp, trust, uid, gid))
+        if got:
+            linked, copied = linked + got[0], copied + got[1]
+            changed = True
+    cached_ext = own / "extensions"
+    if cached_ext.is_dir():
+        ensure_dir(user_ext, 0o775, uid, gid)
+        for ext in sorted(cached_ext.iterdir()):
+            if ext.name.startswith(".") or (user_ext / ext.name).exists():
+                continue
+            got = _publish(
+                user_ext / ext.name, lambda tmp, e=ext: seed_tree(e, tmp, euid, uid, gid)
+            )
+            if got:
+                linked, copied = linked + got[0], copied + got[1]
+                seeded_ext += 1
+                changed = True
+    return {
+        "changed": changed,
+        "detail": "%s %s: %d linked, %d copied; extensions %d seeded, %d published"
+        % (source, commit[:12], linked, copied, seeded_ext, published_ext),
+    }
+
+
+# ---- lazy bash helpers -------------------------------------------------------
+# Every VS Code terminal sources rediacc-env.sh. It used to `source` the whole
+# bashrc-rediacc library, so each helper added to bashFunctions.ts parsed on
+# every terminal start whether or not it was ever called.
+#
+# Now rediacc-env.sh is a SNAPSHOT: the env exports, one-line autoload stubs,
+# and the library's top-level code (prompt setup, `export -f`). Each function
+# body lives in its own file and is sourced on the first call to its stub:
+#
+#   <setup_dir>/bashrc-rediacc.d/<library hash>/<name>.sh
+#   enter_container() { . '<that dir>/enter_container.sh' && enter_container "$@"; }
+#
+# The directory is keyed by the library's hash and published by rename, so a
+# terminal opened before an upgrade keeps loading the bodies its stubs name;
+# the previous generation is kept for exactly that reason, older ones pruned.
+#
+# Only column-0 `name() {` ... `}` blocks are lifted out -- the layout every
+# function in bashFunctions.ts uses. Anything else, including a function
+# defined inside an `if`, stays in the snapshot and runs eagerly as before.
+# bashrc-rediacc itself is still written whole, for anyone sourcing it by hand.
+
+_FUNC_START = re.compile(r"^([A-Za-z_][A-Za-z0-9_-]*)\(\) \{$")
+_HELPER_GENERATIONS = 2
+
+
+def split_functions(library):
+    """(top-level code, {name: definition}) for a bash function library."""
+    lines = library.splitlines()
+    eager, functions = [], {}
+    i = 0
+    while i < len(lines):
+        match = _FUNC_START.match(lines[i])
+        try:
+            end = lines.index("}", i + 1) if match else -1
+        except ValueError:
+            end = -1
+        if end == -1:
+            eager.append(lines[i])
+            i += 1
+            continue
+        functions[match.group(1)] = "\n".join(lines[i : end + 1]) + "\n"
+        i = end + 1
+    return "\n".join(eager), functions
+
+
+_EXPORT_F = re.compile(r"^export -f ([A-Za-z_][A-Za-z0-9_-]*) 2>/dev/null \|\| true$")
+
 
+def lazy_library(library, helper_dir):
+    """The library as autoload stubs naming bodies under `helper_dir`, plus its top-level code.
 
-def main():
-    uid, gid = get_uid_gid(UNIVERSAL_USER)
+    Comment lines are dropped and the per-function `export -f` lines folded
+    into one, so the snapshot's size tracks the number of helpers by one short
+    line each rather than by their bodies.
+    """
+    eager, functions = split_functions(library)
+    stubs = [
+        '%s() { . %s && %s "$@"; }' % (name, shlex.quote(str(helper_dir / (name + ".sh"))), name)
+        for name in functions
+    ]
+    code, exported = [], []
+    for line in eager.splitlines():
+        match = _EXPORT_F.match(line)
+        if match and match.group(1) in functions:
+            exported.append(match.group(1))
+        elif line.strip() and not line.startswith("#"):
+            code.append(line)
+    if exported:
+        stubs.append("export -f %s 2>/dev/null || true" % " ".join(exported))
+    return "\n".join([*stubs, *code])
+
+
+def write_helpers(setup_dir, library, uid=None, gid=None):
+    """Publish one file per function under a hash-keyed dir. Returns (dir, changed, count)."""
+    _, functions = split_functions(library)
+    root = setup_dir / "bashrc-rediacc.d"
+    generation = root / hashlib.sha256(library.encode()).hexdigest()[:16]
+    ensure_dir(root, 0o755, uid, gid)
+    if generation.is_dir():
+        return generation, False, len(functions)
+
+    def build(tmp):
+        tmp.mkdir(mode=0o755)
+        for name, body in functions.items():
+            write_file_atomic(tmp / (name + ".sh"), body, 0o644, uid, gid)
+        if uid is not None and gid is not None:
+            safe_chown(tmp, uid, gid)
+
+    _publish(generation, build)
+    older = sorted(
+        (
+            d
+            for d in root.iterdir()
+            if d.is_dir() and d != generation and not d.name.startswith(".")
+        ),
+        key=lambda d: d.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in older[_HELPER_GENERATIONS - 1 :]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return generation, True, len(functions)
+
+
+def env_snapshot(env_block, library, helper_dir):
+    """rediacc-env.sh content: exports, stubs and top-level code, keyed by their hash."""
+    key = hashlib.sha256(("%s\0%s" % (env_block, library)).encode()).hexdigest()[:16]
+    return (
+        "# rediacc env snapshot %s -- generated by rdc vscode connect; do not edit\n"
+        "%s\nexport REDIACC_ENV_SNAPSHOT=%s\n\n%s\n"
+        % (key, env_block, key, lazy_library(library, helper_dir))
+    )
+
+
+def run_setup(config):
+    """Apply one setup `config` (the JSON bootstrap.ts sends) and return its report."""
+    global REPORT  # noqa: PLW0603 -- one report per run; safe_chown feeds it
+    REPORT = SetupReport()
+    with REPORT.step("user-lookup"):
+        uid, gid = get_uid_gid(config["universalUser"])
 
     # Setup directory: ~/.vscode-server or {server_install_path}/.vscode-server
-    if SERVER_INSTALL_PATH:
-        setup_dir = pathlib.Path(SERVER_INSTALL_PATH) / ".vscode-server"
+    if config["serverInstallPath"]:
+        setup_dir = pathlib.Path(config["serverInstallPath"]) / ".vscode-server"
     else:
         setup_dir = pathlib.Path.home() / ".vscode-server"
 
     # Create directory structure
-    ensure_dir(setup_dir, 0o775, uid, gid)
+    with REPORT.step("mkdir:.vscode-server"):
+        ensure_dir(setup_dir, 0o775, uid, gid)
 
     # Write bash helper functions alongside env file (shared content with rdc term)
     bash_funcs_file = setup_dir / "bashrc-rediacc"
-    write_file_atomic(bash_funcs_file, BASH_FUNCTIONS + "\n", 0o644, uid, gid)
+    with REPORT.step("write:bashrc-rediacc") as st:
+        st["changed"] = write_file_atomic(
+            bash_funcs_file, config["bashFunctions"] + "\n", 0o644, uid, gid
+        )
 
-    # Write environment file (includes sourcing bash functions)
-    env_content = (
-        ENV_BLOCK
-        + f'\n\n# Source bash helper functions\nsource "{bash_funcs_file}" 2>/dev/null || true\n'
-    )
+    # One file per helper, loaded on first call (see "lazy bash helpers")
+    with REPORT.step("write:bashrc-rediacc.d") as st:
+        helper_dir, st["changed"], count = write_helpers(
+            setup_dir, config["bashFunctions"], uid, gid
+        )
+        st["detail"] = "%d helpers in %s" % (count, helper_dir.name)
+
+    # Write environment file: env exports plus helper stubs, no library parse
+    env_content = env_snapshot(config["envBlock"], config["bashFunctions"], helper_dir)
     env_file = setup_dir / "rediacc-env.sh"
-    write_file_atomic(env_file, env_content, 0o644, uid, gid)
+    with REPORT.step("write:rediacc-env.sh") as st:
+        st["changed"] = write_file_atomic(env_file, env_content, 0o644, uid, gid)
 
     # Write server-env-setup file (sourced by VS Code)
     setup_file = setup_dir / "server-env-setup"
     setup_content = f'source "{env_file}"'
-    update_managed_content(setup_file, setup_content, 0o644, uid, gid)
+    with REPORT.step("write:server-env-setup") as st:
+        st["changed"] = update_managed_content(
+            setup_file, setup_content, (config["markerStart"], config["markerEnd"]), 0o644, uid, gid
+        )
 
     # Write terminal init script (sourced via --rcfile so PS1 isn't overridden)
     # --rcfile replaces ~/.bashrc, so we source it explicitly after our env setup
     terminal_init = setup_dir / "terminal-init.sh"
     init_content = f'source /etc/bash.bashrc 2>/dev/null\nsource "{env_file}" 2>/dev/null\nsource ~/.bashrc 2>/dev/null\n'
-    write_file_atomic(terminal_init, init_content, 0o644, uid, gid)
+    with REPORT.step("write:terminal-init.sh") as st:
+        st["changed"] = write_file_atomic(terminal_init, init_content, 0o644, uid, gid)
 
     # Write Machine settings to force /bin/bash with our init as default shell
     # --rcfile replaces the default ~/.bashrc sourcing, so we source /etc/bash.bashrc
     # ourselves followed by rediacc-env.sh (which includes PS1 and helper functions)
     data_dir = setup_dir / "data"
     machine_dir = data_dir / "Machine"
-    ensure_dir(data_dir, 0o775, uid, gid)
-    ensure_dir(machine_dir, 0o775, uid, gid)
+    with REPORT.step("mkdir:data/Machine"):
+        ensure_dir(data_dir, 0o775, uid, gid)
+        ensure_dir(machine_dir, 0o775, uid, gid)
 
     settings_file = machine_dir / "settings.json"
-    machine_settings = {}
-    if settings_file.exists():
-        # OSError: unreadable. ValueError: not JSON (UnicodeDecodeError is a
-        # subclass). Either way the file is replaced; anything else is a defect
-        # here and must not be swallowed.
-        with contextlib.suppress(OSError, ValueError):
-            machine_settings = json.loads(settings_file.read_text())
-    machine_settings["terminal.integrated.defaultProfile.linux"] = "bash"
-    machine_settings["terminal.integrated.profiles.linux"] = {
-        "bash": {"path": "/bin/bash", "args": ["--rcfile", str(terminal_init)]}
+    with REPORT.step("merge:settings.json") as st:
+        st["changed"], backup = merge_settings(
+            settings_file,
+            {
+                "terminal.integrated.defaultProfile.linux": "bash",
+                "terminal.integrated.profiles.linux": {
+                    "bash": {"path": "/bin/bash", "args": ["--rcfile", str(terminal_init)]}
+                },
+            },
+            0o644,
+            uid,
+            gid,
+        )
+        if backup is not None:
+            st["backup"] = str(backup)
+
+    # Optional: {"root": <dir>, "commit": <40-hex>, "quality": "stable"|"insider"}.
+    # Absent means no cache; see seed_server_cache().
+    if config.get("serverCache"):
+        with REPORT.step("seed:server-cache") as st:
+            st.update(seed_server_cache(setup_dir, config["serverCache"], uid, gid))
+
+    return REPORT.as_dict(env_file)
+
+
+# ---- resident agent -----------------------------------------------------------
+# A cold connect pays interpreter startup, the `json`/`tarfile` imports, a `pwd`
+# lookup and, on the user-switch path, a `sudo -u` launch -- before the first
+# file is even stat'ed. On a no-op reconnect that overhead IS the setup time.
+#
+# So the same program can stay resident, one per user, behind a unix socket:
+#
+#   ~/.cache/rediacc/vscode-setup.sock      systemd user socket unit (%h/...),
+#                                           or bound by a detached agent
+#   ~/.local/share/rediacc/vscode-setup-agent.py   this file, as installed
+#
+# PROTOCOL. One connection, one exchange, one line each way:
+#
+#   -> {"v": 1, "sha": "<sha256 of this file>", "config": {...}}
+#   <- {"ok":true,"report":{...}}  |  {"ok":false,"error":"...","stale":true?}
+#
+# The CLI's remote command pipes the request through `socat` (or `nc -U`), so a
+# warm connect starts no interpreter at all. Anything but `{"ok":true` -- no
+# socket, no client tool, a stale agent, an error -- falls through to the cold
+# `python3 -c` run in the SAME remote command, which then reinstalls the agent.
+#
+# `sha` is what keeps an upgraded CLI from being served by an old agent: the
+# agent hashes its own file at startup, answers a mismatch with `stale` and
+# exits, and the cold run that follows writes the new file in its place.
+#
+# The agent serves one request at a time. Two setups for the same user touch
+# the same files; serialising them is the correct behaviour, not a limit.
+#
+# TRUST. The agent runs outside any repo sandbox (systemd starts it, or a
+# shared-server connect detaches it), while a per-repo session runs as the SAME
+# universal user inside Landlock -- and Landlock does not stop a connect() to a
+# pathname socket. The `sha` proves nothing (it hashes a public script), so a
+# request is only served when all of these hold:
+#
+#   - the peer (SO_PEERCRED) is this agent's uid and has not set no_new_privs,
+#     which every Landlock-sandboxed process must have set to restrict itself.
+#     A host whose whole SSH session runs with no_new_privs just takes the cold
+#     path every time: slower, never wrong;
+#   - serverInstallPath and serverCache.root, resolved, are in the allowlist
+#     at AGENT_ALLOW. Only a cold run that the CLI marks `--allow-agent` (a
+#     shared-server connect, never a repo one) adds to it, and the sandbox's
+#     home is an overlay, so a repo session cannot write the real one.
+#
+# The CLI never sends a per-repo connect to the agent in the first place; the
+# checks above are what keep that true when something else connects.
+
+AGENT_PROTOCOL = 1
+AGENT_SOCKET = ".cache/rediacc/vscode-setup.sock"
+AGENT_SCRIPT = ".local/share/rediacc/vscode-setup-agent.py"
+AGENT_ALLOW = ".local/share/rediacc/vscode-setup-agent.allow.json"
+AGENT_UNIT = "rediacc-vscode-setup"
+# An idle agent exits. Under systemd the socket stays and the next connect
+# starts it again; a detached agent is reinstalled by the next cold run.
+AGENT_IDLE_SECONDS = 1800
+_MAX_REQUEST = 4 << 20
+
+
+def _home():
+    # $HOME, as the client's shell sees it: bootstrap.ts switches users with
+    # `sudo -H`, and systemd sets it to the same passwd entry %h expands to.
+    return pathlib.Path.home()
+
+
+def _script_sha(path):
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+def _setup_root(config):
+    """The directory a config writes under, resolved: its install path or $HOME."""
+    return os.path.realpath(config.get("serverInstallPath") or str(_home()))
+
+
+def _cache_root(config):
+    cache = config.get("serverCache") or {}
+    return os.path.realpath(str(cache["root"])) if cache.get("root") else None
+
+
+def _read_allow(path):
+    try:
+        data = json.loads(pathlib.Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def allow_agent(config, path=None):
+    """Record `config`'s roots as ones the agent may serve. True when the list grew.
+
+    Called only by a cold run the CLI marked `--allow-agent`, i.e. one it did
+    not route through a repo sandbox.
+    """
+    path = pathlib.Path(path or _home() / AGENT_ALLOW)
+    allow = _read_allow(path)
+    grew = False
+    for field, root in (("setupRoots", _setup_root(config)), ("cacheRoots", _cache_root(config))):
+        roots = allow.setdefault(field, [])
+        if root is not None and root not in roots:
+            roots.append(root)
+            grew = True
+    if grew:
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        write_file_atomic(path, json.dumps(allow, indent=2, sort_keys=True) + "\n", 0o600)
+    return grew
+
+
+def _allow_refusal(config, path):
+    """None when the agent may apply `config`, else why not."""
+    allow = _read_allow(path)
+    if _setup_root(config) not in allow.get("setupRoots", ()):
+        return "install path %s was never registered by a cold run" % _setup_root(config)
+    cache = _cache_root(config)
+    if cache is not None and cache not in allow.get("cacheRoots", ()):
+        return "server cache %s was never registered by a cold run" % cache
+    return None
+
+
+_PEER_CRED = struct.Struct("3i")  # struct ucred: pid, uid, gid
+_NO_NEW_PRIVS = re.compile(r"^NoNewPrivs:\s*1\s*$", re.MULTILINE)
+
+
+def _peer_refusal(conn):
+    """None when the process on the other end of `conn` may use this agent."""
+    try:
+        pid, uid, _ = _PEER_CRED.unpack(
+            conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEER_CRED.size)
+        )
+        status = pathlib.Path("/proc/%d/status" % pid).read_text()
+    except (AttributeError, OSError, struct.error):
+        return "cannot identify the connecting process"
+    if uid != os.getuid():
+        return "peer uid %d is not this agent's user" % uid
+    if _NO_NEW_PRIVS.search(status):
+        return "peer runs with no_new_privs, as a sandboxed session does"
+    return None
+
+
+def _live(path):
+    """True when something is accepting connections on the socket at `path`."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def _listener(path):
+    """(socket, owned): systemd's fd 3 when socket-activated, else bound at `path`.
+
+    None when another agent already answers on `path`, so two cold connects
+    racing to install do not leave one agent orphaned behind an unlinked socket.
+    """
+    if os.environ.get("LISTEN_PID") == str(os.getpid()) and os.environ.get("LISTEN_FDS") == "1":
+        return socket.socket(fileno=3), False
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if _live(path):
+        return None, False
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old = os.umask(0o177)
+    try:
+        sock.bind(str(path))
+    finally:
+        os.umask(old)
+    sock.listen(8)
+    return sock, True
+
+
+def _read_line(conn):
+    buf = bytearray()
+    while b"\n" not in buf:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        buf += chunk
+        if len(buf) > _MAX_REQUEST:
+            raise ValueError("request exceeds %d bytes" % _MAX_REQUEST)
+    return bytes(buf).split(b"\n", 1)[0]
+
+
+def handle_request(line, sha, allow_path):
+    """One protocol exchange. Returns (response dict, keep serving)."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return {"ok": False, "error": "request is not JSON"}, True
+    if not isinstance(request, dict) or request.get("v") != AGENT_PROTOCOL:
+        return {"ok": False, "stale": True, "error": "protocol mismatch"}, False
+    if request.get("sha") != sha:
+        return {
+            "ok": False,
+            "stale": True,
+            "error": "agent is %s, client sent %s" % (sha[:12], str(request.get("sha"))[:12]),
+        }, False
+    if "config" not in request:
+        return {"ok": True}, True
+    try:
+        refusal = _allow_refusal(request["config"], allow_path)
+    except (AttributeError, KeyError, TypeError) as exc:
+        refusal = "malformed config: %s" % exc
+    if refusal:
+        return {"ok": False, "error": refusal}, True
+    try:
+        report = run_setup(request["config"])
+    except Exception as exc:  # noqa: BLE001 -- the client falls back to a cold run and shows this
+        return {"ok": False, "error": "%s: %s" % (type(exc).__name__, exc)}, True
+    report["via"] = "agent"
+    return {"ok": True, "report": report}, True
+
+
+def serve(socket_path, allow_path, idle=AGENT_IDLE_SECONDS):
+    """Answer setup requests on `socket_path` until idle for `idle` seconds or stale."""
+    sha = _script_sha(__file__)
+    sock, owned = _listener(socket_path)
+    if sock is None:
+        return
+    sock.settimeout(idle)
+    try:
+        while True:
+            try:
+                conn, _ = sock.accept()
+            # socket.timeout, not TimeoutError: they are one class only from
+            # Python 3.10, and remote hosts still run 3.8 and 3.9.
+            except socket.timeout:  # noqa: UP041 -- see above
+                return
+            keep = True
+            with conn:
+                conn.settimeout(30)
+                with contextlib.suppress(OSError, ValueError):
+                    refusal = _peer_refusal(conn)
+                    if refusal:
+                        response = {"ok": False, "error": refusal}
+                    else:
+                        response, keep = handle_request(_read_line(conn), sha, allow_path)
+                    conn.sendall(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+            if not keep:
+                return
+    finally:
+        sock.close()
+        if owned:
+            with contextlib.suppress(FileNotFoundError):
+                pathlib.Path(socket_path).unlink()
+
+
+def _systemd_quote(arg):
+    """One ExecStart word per systemd.syntax(7): double-quoted, with `\\` and `"`
+    escaped, and `%` / `$` doubled so neither is expanded as a specifier or
+    variable. A home or interpreter path with a space stays one argument."""
+    escaped = arg.replace("\\", "\\\\").replace('"', '\\"')
+    return '"%s"' % escaped.replace("%", "%%").replace("$", "$$")
+
+
+def install_agent():
+    """Register THIS file as the user's agent. Returns a status dict; never raises.
+
+    Prefers a systemd user socket unit, which costs nothing until a connect.
+    A user with no systemd manager (no session and no `loginctl enable-linger`
+    -- common for a service account reached through `sudo -u`) gets a detached
+    agent instead, which exits when idle and is restarted by the next cold run.
+    """
+    home = _home()
+    script = pathlib.Path(__file__).resolve()
+    sock = home / AGENT_SOCKET
+    unit_dir = home / ".config" / "systemd" / "user"
+    units = {
+        AGENT_UNIT + ".socket": (
+            "[Unit]\nDescription=rediacc VS Code setup agent socket\n\n"
+            "[Socket]\nListenStream=%%h/%s\nSocketMode=0600\nDirectoryMode=0700\n\n"
+            "[Install]\nWantedBy=sockets.target\n" % AGENT_SOCKET
+        ),
+        AGENT_UNIT + ".service": (
+            "[Unit]\nDescription=rediacc VS Code setup agent\n\n"
+            "[Service]\nExecStart=%s %s --agent\n"
+            % (_systemd_quote(sys.executable), _systemd_quote(str(script)))
+        ),
     }
-    write_file_atomic(settings_file, json.dumps(machine_settings, indent=2) + "\n", 0o644, uid, gid)
+    env = dict(os.environ)
+    env.setdefault("XDG_RUNTIME_DIR", "/run/user/%d" % os.getuid())
+    try:
+        unit_dir.mkdir(parents=True, exist_ok=True)
+        changed = [write_file_atomic(unit_dir / name, text) for name, text in units.items()]
+        systemctl = ["systemctl", "--user", "--quiet"]
+        if any(changed):
+            subprocess.run([*systemctl, "daemon-reload"], env=env, check=True, timeout=10)
+        subprocess.run(
+            [*systemctl, "enable", "--now", AGENT_UNIT + ".socket"],
+            env=env,
+            check=True,
+            timeout=10,
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.SubprocessError):
+        pass
+    else:
+        return {"agent": "systemd", "socket": str(sock)}
+    try:
+        subprocess.Popen(
+            [sys.executable, str(script), "--agent"],
+            cwd=home,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as exc:
+        return {"agent": "unavailable", "error": exc.strerror}
+    return {"agent": "detached", "socket": str(sock)}
+
+
+def _request(path, payload):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(str(path))
+        conn.sendall(json.dumps(payload).encode() + b"\n")
+        return json.loads(_read_line(conn))
+
+
+def bench(rounds):
+    """Cold `python3 -c` vs warm agent latency for one no-op setup, on this host.
+
+    Both sides run the identical config against a throwaway install path that
+    the first round has already populated, so what differs is exactly what a
+    reconnect pays: process start and imports versus one socket round trip.
+    Also times the socat hop the CLI really uses, when socat is installed.
+    """
+    source = pathlib.Path(__file__).read_text()
+    sha = _script_sha(__file__)
+    with tempfile.TemporaryDirectory(prefix="vscode-setup-bench-") as tmp:
+        config = {
+            "envBlock": "export REDIACC_MACHINE=bench",
+            "bashFunctions": "status() { :; }",
+            "universalUser": pwd.getpwuid(os.getuid()).pw_name,
+            "serverInstallPath": tmp,
+            "markerStart": "# --- START ---",
+            "markerEnd": "# --- END ---",
+        }
+        config_json = json.dumps(config)
+        request = json.dumps({"v": AGENT_PROTOCOL, "sha": sha, "config": config}) + "\n"
+        sock = pathlib.Path(tmp) / "agent.sock"
+
+        def timed(fn):
+            samples = []
+            for _ in range(rounds):
+                t0 = time.perf_counter()
+                fn()
+                samples.append(_ms(time.perf_counter() - t0))
+            return {
+                "median": round(statistics.median(samples), 3),
+                "min": min(samples),
+                "max": max(samples),
+            }
+
+        result = {"rounds": rounds}
+        cold = [sys.executable, "-c", source, config_json]
+        subprocess.run(cold, check=True, capture_output=True)
+        result["coldExecMs"] = timed(lambda: subprocess.run(cold, check=True, capture_output=True))
 
-    print(f"Environment setup complete: {env_file}")
+        # The agent reads its allowlist from $HOME; a scratch one keeps the
+        # bench from registering a temp dir in the real list.
+        allow_agent(config, pathlib.Path(tmp) / AGENT_ALLOW)
+        agent = subprocess.Popen(
+            [sys.executable, __file__, "--agent", "--socket", str(sock)],
+            stdin=subprocess.DEVNULL,
+            env={**os.environ, "HOME": tmp},
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while not _live(sock):
+                if time.monotonic() > deadline:
+                    raise RuntimeError("agent did not come up on %s" % sock)
+                time.sleep(0.01)
+            result["agentMs"] = timed(lambda: _request(sock, json.loads(request)))
+            if shutil.which("socat"):
+                socat = ["socat", "-t30", "-", "UNIX-CONNECT:%s" % sock]
+                result["agentViaSocatMs"] = timed(
+                    lambda: subprocess.run(
+                        socat, input=request.encode(), check=True, stdout=subprocess.DEVNULL
+                    )
+                )
+        finally:
+            agent.terminate()
+            agent.wait()
+    result["speedup"] = round(result["coldExecMs"]["median"] / result["agentMs"]["median"], 1)
+    return result
+
+
+def bench_shell(rounds, sizes=(8, 64, 512)):
+    """Shell startup with the whole library sourced vs the lazy snapshot, per library size.
+
+    The library is synthetic -- `sizes` functions shaped like bashFunctions.ts
+    entries -- so the curve can be read off directly: eager grows with every
+    helper added, lazy should stay near the bare `bash -c :` baseline.
+    """
+    body = (
+        '  local target="${1:-}"\n'
+        '  if [ -z "$target" ]; then\n    echo "Usage: %s <name>"\n    return 1\n  fi\n'
+        '  docker inspect --format "{{.State.Status}}" "$target"\n'
+    )
+
+    def median_ms(argv):
+        samples = []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            subprocess.run(argv, check=True)
+            samples.append(time.perf_counter() - t0)
+        return _ms(statistics.median(samples))
+
+    result = {"rounds": rounds, "baselineMs": median_ms(["bash", "--norc", "-c", ":"])}
+    with tempfile.TemporaryDirectory(prefix="vscode-shell-bench-") as tmp:
+        for size in sizes:
+            names = ["helper_%03d" % n for n in range(size)]
+            library = "".join(
+                "# %s\n%s() {\n%s}\nexport -f %s 2>/dev/null || true\n\n"
+                % (name, name, body % name, name)
+                for name in names
+            )
+            root = pathlib.Path(tmp) / str(size)
+            root.mkdir()
+            helper_dir, _, _ = write_helpers(root, library)
+            eager = root / "eager.sh"
+            eager.write_text(library)
+            lazy = root / "lazy.sh"
+            lazy.write_text(env_snapshot("", library, helper_dir))
+            result[str(size)] = {
+                "eagerMs": median_ms(["bash", "--norc", "-c", '. "$1"', "bench", str(eager)]),
+                "lazyMs": median_ms(["bash", "--norc", "-c", '. "$1"', "bench", str(lazy)]),
+                "firstCallMs": median_ms(
+                    [
+                        "bash",
+                        "--norc",
+                        "-c",
+                        # Called, not `type`d: only a call makes the stub source the
+                        # real body. Called bare, the helper prints its usage and
+                        # returns 1, so that status is not the benchmark's failure.
+                        '. "$1"; %s >/dev/null || :' % names[0],
+                        "x",
+                        str(lazy),
+                    ]
+                ),
+            }
+    return result
+
+
+def main(argv=None):
+    """`<config-json>` runs once (the cold path); the flags below need a file on disk.
+
+    <config-json> --allow-agent   also let the agent serve this config's roots
+    --agent [--socket PATH]   serve requests until idle (see "resident agent")
+    --install-agent           register this file as the user's agent
+    --bench [ROUNDS]          print cold-exec vs warm-agent latency as JSON
+    --bench-shell [ROUNDS]    print eager vs lazy helper shell-startup time as JSON
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    mode = argv[0] if argv else ""
+    if mode == "--agent":
+        sock = argv[2] if argv[1:2] == ["--socket"] else _home() / AGENT_SOCKET
+        serve(sock, _home() / AGENT_ALLOW)
+    elif mode == "--install-agent":
+        print(json.dumps(install_agent()))
+    elif mode == "--bench":
+        print(json.dumps(bench(int(argv[1]) if len(argv) > 1 else 20), indent=2))
+    elif mode == "--bench-shell":
+        print(json.dumps(bench_shell(int(argv[1]) if len(argv) > 1 else 20), indent=2))
+    else:
+        config = json.loads(mode)
+        report = run_setup(config)
+        if argv[1:2] == ["--allow-agent"]:
+            allow_agent(config)
+        report["via"] = "exec"
+        print(json.dumps(report))
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@
 export interface VSCodeInfo {
   path: string;
   version?: string;
+  /** Build commit from `--version`; names the matching remote server build */
+  commit?: string;
   isInsiders: boolean;
   /** Whether this VS Code installation is inside WSL */
   isWSL?: boolean;
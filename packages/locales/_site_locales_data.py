@@ -0,0 +1,36 @@
+# GENERATED by `python3 packages/locales/site_locales.py --freeze` from
+# site-locales.json. Do not edit; CI runs `--check`. site_locales.py trusts this file
+# only while SOURCE still equals the JSON's bytes.
+FORMAT = 3
+SOURCE = b'{\n  "siteLocales": ["en", "de", "es", "fr", "ja", "ar", "ru", "tr", "zh", "et", "ko", "pt", "it"],\n  "defaultLocale": "en",\n  "localeAttributes": {\n    "en": { "direction": "ltr", "script": "Latn", "fallback": null },\n    "de": { "direction": "ltr", "script": "Latn", "fallback": "en" },\n    "es": { "direction": "ltr", "script": "Latn", "fallback": "en" },\n    "fr": { "direction": "ltr", "script": "Latn", "fallback": "en" },\n    "ja": { "direction": "ltr", "script": "Jpan", "fallback": "en" },\n    "ar": { "direction": "rtl", "script": "Arab", "fallback": "en" },\n    "ru": { "direction": "ltr", "script": "Cyrl", "fallback": "en" },\n    "tr": { "direction": "ltr", "script": "Latn", "fallback": "en" },\n    "zh": { "direction": "ltr", "script": "Hans", "fallback": "en" },\n    "et": { "direction": "ltr", "script": "Latn", "fallback": "en" },\n    "ko": { "direction": "ltr", "script": "Kore", "fallback": "en" },\n    "pt": { "direction": "ltr", "script": "Latn", "fallback": "en" },\n    "it": { "direction": "ltr", "script": "Latn", "fallback": "en" }\n  }\n}\n'
+SITE_LOCALES = (
+    "en",
+    "de",
+    "es",
+    "fr",
+    "ja",
+    "ar",
+    "ru",
+    "tr",
+    "zh",
+    "et",
+    "ko",
+    "pt",
+    "it",
+)
+DEFAULT_LOCALE = "en"
+LOCALE_ATTRIBUTES = {
+    "en": ("ltr", "Latn", None),
+    "de": ("ltr", "Latn", "en"),
+    "es": ("ltr", "Latn", "en"),
+    "fr": ("ltr", "Latn", "en"),
+    "ja": ("ltr", "Jpan", "en"),
+    "ar": ("rtl", "Arab", "en"),
+    "ru": ("ltr", "Cyrl", "en"),
+    "tr": ("ltr", "Latn", "en"),
+    "zh": ("ltr", "Hans", "en"),
+    "et": ("ltr", "Latn", "en"),
+    "ko": ("ltr", "Kore", "en"),
+    "pt": ("ltr", "Latn", "en"),
+    "it": ("ltr", "Latn", "en"),
+}
@@ -0,0 +1,425 @@
+"""Run one job per site locale across a process pool, longest first.
+
+Companion to `site_locales.py`, for the pipelines that consume `NON_ENGLISH_LOCALES`. Each of
+them looped over the 12 target locales serially, or hand-rolled its own fan-out with its own
+idea of what a failure in one locale means for the other eleven. This is that loop, once:
+
+    from site_locales import NON_ENGLISH_LOCALES, subset
+    from locale_scheduler import run_per_locale
+
+    report = run_per_locale(render_locale, NON_ENGLISH_LOCALES, max_workers=4)
+    report.raise_if_failed()
+
+`fn(locale)` runs in a worker process, so it must be picklable: a module-level function,
+or a `functools.partial` of one. With `max_workers=1` it runs inline in this process, which
+is what you want under a debugger.
+
+## What it guarantees
+
+  - **Every locale is a site locale.** The list goes through `subset()`, so a typo, a region
+    tag or a duplicate fails BEFORE any work starts. Narrowing is expressed the usual way -
+    pass `subset("reason", [...])` - and is respected exactly; nothing is added back.
+  - **A failure is contained and reported, never swallowed.** One locale raising does not
+    cancel the others, and the report lists it with its traceback. Callers choose between
+    `raise_if_failed()` and inspecting `failed`; there is no mode that drops it.
+  - **Results come back in the order given**, not completion order, so output that is
+    written per locale stays deterministic.
+
+## Ordering by historical cost
+
+With fewer workers than locales, the order jobs START in decides the wall time: the slowest
+locale started last is the whole tail. Jobs are submitted most expensive first (the
+longest-processing-time rule), using `costs` - seconds per locale from earlier runs, which
+`load_costs()` / `save_costs()` keep in a small JSON file. A locale with no history is
+assumed expensive and goes first: guessing cheap is the mistake that creates the tail.
+
+Run the self-test, which uses synthetic sleep/raise workloads, with:
+
+    python3 packages/locales/locale_scheduler.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from site_locales import NON_ENGLISH_LOCALES, subset
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+    from concurrent.futures import Future
+
+__all__ = [
+    "LocaleResult",
+    "LocaleRunReport",
+    "load_costs",
+    "run_per_locale",
+    "save_costs",
+]
+
+#: Weight of the newest run in the stored per-locale cost: recent enough to follow a
+#: pipeline that got slower, smooth enough that one noisy run does not reorder everything.
+COST_SMOOTHING = 0.5
+
+
+class LocaleResult:
+    """The outcome of one locale's job. `value` on success; `error`/`trace` on failure."""
+
+    __slots__ = ("error", "locale", "seconds", "trace", "value")
+
+    def __init__(
+        self,
+        locale: str,
+        *,
+        seconds: float,
+        value: object = None,
+        error: str | None = None,
+        trace: str | None = None,
+    ) -> None:
+        self.locale = locale
+        self.seconds = seconds
+        self.value = value
+        self.error = error
+        self.trace = trace
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        state = "ok" if self.ok else f"error={self.error!r}"
+        return f"LocaleResult({self.locale!r}, {self.seconds:.3f}s, {state})"
+
+
+class LocaleRunReport:
+    """Per-locale results in the caller's order, plus how the run was scheduled."""
+
+    def __init__(
+        self,
+        results: list[LocaleResult],
+        *,
+        order: tuple[str, ...],
+        workers: int,
+        seconds: float,
+    ) -> None:
+        self.results = results
+        #: The order jobs were SUBMITTED in, most expensive first.
+        self.order = order
+        self.workers = workers
+        #: Wall time of the whole run, as opposed to each result's own `seconds`.
+        self.seconds = seconds
+
+    @property
+    def failed(self) -> list[LocaleResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def values(self) -> dict[str, object]:
+        """locale -> return value, for the locales that succeeded."""
+        return {r.locale: r.value for r in self.results if r.ok}
+
+    def costs(self) -> dict[str, float]:
+        """locale -> seconds, for every locale that ran (a failure's time is still a cost)."""
+        return {r.locale: r.seconds for r in self.results}
+
+    def raise_if_failed(self) -> None:
+        failed = self.failed
+        if failed:
+            detail = "\n".join(f"  {r.locale}: {r.error}" for r in failed)
+            raise RuntimeError(
+                f"{len(failed)} of {len(self.results)} locale job(s) failed:\n{detail}"
+            )
+
+
+def _timed_call(fn: Callable[[str], object], locale: str) -> LocaleResult:
+    """Run `fn(locale)` and time it, in the worker. An exception becomes a failed result.
+
+    Caught HERE rather than from the future so the traceback is the worker's own and the
+    time is the job's, not the job's plus however long it sat in the queue.
+    """
+    t0 = time.perf_counter()
+    try:
+        value = fn(locale)
+    except Exception as exc:  # noqa: BLE001 -- contained and reported, see module doc
+        return _failure(locale, exc, time.perf_counter() - t0)
+    return LocaleResult(locale, seconds=time.perf_counter() - t0, value=value)
+
+
+def _failure(locale: str, exc: BaseException, seconds: float) -> LocaleResult:
+    return LocaleResult(
+        locale,
+        seconds=seconds,
+        error=f"{type(exc).__name__}: {exc}",
+        trace="".join(traceback.format_exception(exc)),
+    )
+
+
+def _schedule(locales: tuple[str, ...], costs: Mapping[str, float]) -> tuple[str, ...]:
+    """Most expensive first; unknown cost counts as the most expensive. Stable for ties."""
+    known = [costs[c] for c in locales if c in costs]
+    unknown_cost = max(known, default=0.0) + 1.0
+    return tuple(sorted(locales, key=lambda c: -costs.get(c, unknown_cost)))
+
+
+def run_per_locale(
+    fn: Callable[[str], object],
+    locales: Iterable[str] = NON_ENGLISH_LOCALES,
+    *,
+    max_workers: int | None = None,
+    costs: Mapping[str, float] | None = None,
+    name: str = "run_per_locale",
+) -> LocaleRunReport:
+    """Run `fn(locale)` once per locale, in parallel, and report every outcome.
+
+    `max_workers` caps the pool (default: one per locale, at most the CPU count). `costs`
+    orders submission; see "Ordering by historical cost". `name` labels the locale list in
+    the error if it is not a valid subset.
+    """
+    wanted = subset(name, list(locales))
+    order = _schedule(wanted, costs or {})
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(wanted) or 1))
+    by_locale: dict[str, LocaleResult] = {}
+    t0 = time.perf_counter()
+
+    if workers == 1:
+        for locale in order:
+            by_locale[locale] = _timed_call(fn, locale)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Submitted in cost order; the pool starts them in that order as workers free up.
+            pending = {pool.submit(_timed_call, fn, locale): locale for locale in order}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken: list[tuple[str, BrokenProcessPool]] = []
+                for future in done:
+                    locale = pending.pop(future)
+                    try:
+                        by_locale[locale] = future.result()
+                    except BrokenProcessPool as exc:
+                        broken.append((locale, exc))
+                    except Exception as exc:  # noqa: BLE001 -- contained and reported
+                        # Raised by the pool, not by `fn`: the job or its return value did
+                        # not pickle. It is this locale's failure and no one else's.
+                        by_locale[locale] = _failure(locale, exc, time.perf_counter() - t0)
+                if broken:
+                    # A worker died (OOM kill, segfault). Only after every finished job in
+                    # this round is harvested: a sibling that returned in the same round
+                    # keeps its real result. Whatever is still unfinished is lost with the
+                    # pool, and each is reported rather than left out.
+                    exc = broken[0][1]
+                    for future, locale in pending.items():
+                        if future.done() and not future.cancelled() and not future.exception():
+                            by_locale[locale] = future.result()
+                        else:
+                            broken.append((locale, exc))
+                    for locale, lost in broken:
+                        by_locale[locale] = _failure(locale, lost, time.perf_counter() - t0)
+                    pending.clear()
+
+    return LocaleRunReport(
+        [by_locale[c] for c in wanted],
+        order=order,
+        workers=workers,
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def load_costs(path: str | Path) -> dict[str, float]:
+    """Per-locale seconds from a cost file; empty when there is none yet."""
+    try:
+        with Path(path).open(encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return {}
+    return {str(k): float(v) for k, v in data.items()}
+
+
+def save_costs(path: str | Path, report: LocaleRunReport) -> dict[str, float]:
+    """Fold `report`'s timings into the cost file at `path` and return the new costs.
+
+    Smoothed (see COST_SMOOTHING) and merged, so a narrowed run updates only the locales it
+    ran. Written by rename, so concurrent pipelines never read half a file.
+    """
+    path = Path(path)
+    costs = load_costs(path)
+    for locale, seconds in report.costs().items():
+        old = costs.get(locale)
+        costs[locale] = seconds if old is None else old + COST_SMOOTHING * (seconds - old)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_text(json.dumps(costs, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return costs
+
+
+# ---- self-test workloads (module level: workers must be able to unpickle them) -------------
+
+
+def _sleep_job(locale: str) -> str:
+    time.sleep(0.2)
+    return locale.upper()
+
+
+def _fail_on_et(locale: str) -> str:
+    if locale == "et":
+        raise ValueError("no aligner for et")
+    return locale
+
+
+def _crash_on_de(locale: str) -> str:
+    if locale == "de":
+        os._exit(1)
+    time.sleep(0.05)
+    return locale
+
+
+def _crash_after_fr(folder: str, locale: str) -> str:
+    """fr returns; de dies once fr's result has had time to reach the parent."""
+    if locale == "de":
+        deadline = time.monotonic() + 30.0
+        while not Path(folder, "fr").exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.3)
+        os._exit(1)
+    Path(folder, locale).touch()
+    return locale.upper()
+
+
+def _rendezvous_job(folder: str, want: int, locale: str) -> bool:
+    """Check in, then wait for `want` jobs to have checked in: only concurrent jobs can."""
+    Path(folder, locale).touch()
+    deadline = time.monotonic() + 30.0
+    while time.monotonic() < deadline:
+        if len(os.listdir(folder)) >= want:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _unpicklable_result(locale: str) -> object:
+    return lambda: locale
+
+
+def _selftest() -> int:
+    import functools  # noqa: PLC0415
+    import tempfile  # noqa: PLC0415
+
+    fails = 0
+
+    def chk(label: str, cond: bool) -> None:
+        nonlocal fails
+        print(f"  {'PASS' if cond else 'FAIL'}  {label}")
+        if not cond:
+            fails += 1
+
+    four = subset("selftest", ["de", "fr", "ja", "ko"])
+    report = run_per_locale(_sleep_job, four, max_workers=4)
+    chk("every locale ran and succeeded", not report.failed and len(report.results) == 4)
+    chk("results come back in the caller's order", [r.locale for r in report.results] == [*four])
+    chk("values are each job's return", report.values == {c: c.upper() for c in four})
+    chk(
+        "per-locale timing covers the job's own work", all(r.seconds >= 0.2 for r in report.results)
+    )
+    # Overlap is proven by the jobs meeting, not by a wall-clock bound a loaded runner breaks:
+    # each job waits until all four have checked in, which no serial schedule can satisfy.
+    with tempfile.TemporaryDirectory() as tmp:
+        met = run_per_locale(functools.partial(_rendezvous_job, tmp, 4), four, max_workers=4)
+    chk("four workers overlap four jobs", met.values == dict.fromkeys(four, True))
+
+    capped = run_per_locale(_sleep_job, four, max_workers=2)
+    chk("the worker cap is honoured", capped.workers == 2)
+    chk("two workers take about two rounds (control)", capped.seconds >= 0.4)
+
+    costs = {"de": 1.0, "fr": 9.0, "ja": 5.0}
+    ordered = run_per_locale(_sleep_job, four, max_workers=1, costs=costs)
+    chk("no history goes first, then most expensive", ordered.order == ("ko", "fr", "ja", "de"))
+    chk(
+        "inline mode still reports in the caller's order",
+        [r.locale for r in ordered.results] == [*four],
+    )
+
+    mixed = run_per_locale(_fail_on_et, subset("selftest", ["de", "et", "fr"]), max_workers=3)
+    chk("a failing locale is reported", [r.locale for r in mixed.failed] == ["et"])
+    chk("the failure carries its message", "no aligner" in (mixed.failed[0].error or ""))
+    chk("the failure carries a traceback", "_fail_on_et" in (mixed.failed[0].trace or ""))
+    chk("the other locales still succeed (control)", mixed.values == {"de": "de", "fr": "fr"})
+    try:
+        mixed.raise_if_failed()
+        chk("raise_if_failed raises", False)
+    except RuntimeError as exc:
+        chk("raise_if_failed raises", "et:" in str(exc))
+
+    crashed = run_per_locale(_crash_on_de, subset("selftest", ["de", "fr"]), max_workers=2)
+    chk(
+        "a dead worker is a reported failure, not a hang",
+        "de" in {r.locale for r in crashed.failed},
+    )
+    chk("no locale goes missing from a broken pool", len(crashed.results) == 2)
+
+    # One wait() round holding both a finished job and the crash, with the crash harvested
+    # first: the finished sibling must keep its real result, not be written off with the pool.
+    def crash_first(fs: Iterable[Future[object]], return_when: str) -> tuple[list, set]:
+        del return_when  # every round waits for all: the crash and its sibling, together
+        done, not_done = _wait(fs, return_when=ALL_COMPLETED)
+        return sorted(done, key=lambda f: f.exception() is None), not_done
+
+    global wait  # noqa: PLW0603 -- the selftest swaps the round for a deterministic one
+    _wait, wait = wait, crash_first
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            same_round = run_per_locale(
+                functools.partial(_crash_after_fr, tmp),
+                subset("selftest", ["de", "fr"]),
+                max_workers=2,
+            )
+    finally:
+        wait = _wait
+    chk(
+        "a job finished in the crash's round keeps its result",
+        same_round.values == {"fr": "FR"} and [r.locale for r in same_round.failed] == ["de"],
+    )
+
+    pair = subset("selftest", ["de", "fr"])
+    unsent = run_per_locale(lambda locale: locale, pair, max_workers=2)
+    chk("a job that does not pickle is a reported failure", len(unsent.failed) == 2)
+    unreturned = run_per_locale(_unpicklable_result, pair, max_workers=2)
+    chk(
+        "a return value that does not pickle is a reported failure",
+        [r.locale for r in unreturned.failed] == ["de", "fr"],
+    )
+
+    try:
+        run_per_locale(_sleep_job, ["de", "pt-BR"], name="narrowed")
+        chk("a non-site code fails before any work", False)
+    except ValueError as exc:
+        chk("a non-site code fails before any work", "'narrowed'" in str(exc))
+    try:
+        run_per_locale(_sleep_job, ["de", "de"])
+        chk("a duplicate code fails before any work", False)
+    except ValueError:
+        chk("a duplicate code fails before any work", True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "costs.json"
+        chk("a missing cost file is empty history", load_costs(path) == {})
+        save_costs(path, ordered)
+        first = load_costs(path)
+        chk("costs are recorded per locale", set(first) == set(four))
+        save_costs(path, run_per_locale(_sleep_job, subset("selftest", ["de"]), max_workers=1))
+        second = load_costs(path)
+        chk("a narrowed run leaves other locales' costs alone", second["fr"] == first["fr"])
+
+    if fails:
+        print(f"\n{fails} self-test failure(s)")
+        return 1
+    print("\nlocale_scheduler self-test passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_selftest())
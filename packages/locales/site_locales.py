@@ -27,21 +27,41 @@ Known category B, deliberately NOT importing from here - do not "fix" these:
   - `video_pipeline/tts_bridge.py::ASR_CAPTION_LANGS`
   - `tutorial_tts/cli.py::AUDIO_LANGUAGES` - borderline, but its `et` entry is justified by
     MEASUREMENT (samples transcribed back at 0.94/0.86/0.75 despite `et` being absent from
-    the model's declared list), not by site membership. Use `assert_covered_by_site()` on it
-    if you want a guard; do not derive it.
+    the model's declared list), not by site membership. Register it (below) if you want a
+    guard; do not derive it.
 
-## Why this module's selftest is NOT in `npm run ci`
+## Capability registry (category B, registered, never derived)
 
-Every consumer lives under `private/`, which is gitignored, so CI never checks those trees out
-and there is nothing here for CI to protect. Adding `python3 packages/locales/site_locales.py`
-to the npm chain would make it the only `python3` in it, on a runner whose workflow sets up no
-Python — a new dependency for zero coverage. Run it locally instead:
+A category B list is registered once per process under a short name, next to where it is
+defined:
 
-    python3 packages/locales/site_locales.py
+    ASR_CAPTION_LANGS = register_capability("asr-captions", [...], source=__name__)
+
+Registration runs `assert_covered_by_site()` ONCE and memoizes it: registering the same name
+with the same codes again (a second import path, a reload) is a dict probe, while the same
+name with DIFFERENT codes raises, because two definitions of one capability is the drift this
+module exists to catch. `capable(locale, capability)` is then a probe into a precomputed
+locale x capability matrix; an unregistered capability or a non-site locale raises rather
+than answering False. To plan batch jobs, dump the matrix after importing the defining
+modules:
+
+    python3 packages/locales/site_locales.py --capabilities private/tutorial_tts/engine_qwen.py
+
+## What CI checks here, and what it does not
+
+CI runs `python3 packages/locales/site_locales.py --check` (`npm run
+check:ci-site-locales-frozen`, a gate in `npm run ci` and a step in ci-quality.yml's
+quality-content job). It exits 1 when the committed `_site_locales_data.py` is missing or no
+longer embeds the bytes of `site-locales.json`, so the frozen copy cannot drift. Separately,
+`scripts/check-locale-sources.ts` fails if `site-locales.json` drifts from `index.js`, in
+membership or in order: the failure that would make the Python pipelines and the site ship
+different locale sets.
+
+What CI still does NOT run is this module's selftest, nor any of its consumers. Every consumer
+lives under `private/`, which is gitignored, so CI never checks those trees out. Run the
+selftest locally:
 
-What CI *does* enforce is the part that matters to it: `scripts/check-locale-sources.ts` fails
-if `site-locales.json` drifts from `index.js`, in membership or in order. That is the failure
-that would make the Python pipelines and the site ship different locale sets.
+    python3 packages/locales/site_locales.py
 
 ## Usage
 
@@ -58,31 +78,95 @@ to depend on. Bootstrap by walking up for the marker file:
 
 Walking up for the *marker* rather than for a directory named `console` is deliberate: this
 repo uses git worktrees, so the checkout is often not named `console`.
+
+## Lookups and attributes
+
+Every membership test goes through `SITE_LOCALE_SET` and every position through
+`LOCALE_INDEX`, both built once at import; `filter_site_locales()` is the bulk form for
+per-segment data. `LOCALE_ATTRIBUTES` holds what the JSON's `localeAttributes` declares per
+locale -- text direction, ISO 15924 script, declared fallback -- and import fails unless it
+covers the site set exactly and every fallback chain ends at the default. Those are facts
+about the LANGUAGE as the site renders it (category A), not about any model.
+
+## Declared fallback, resolved in bulk
+
+Nothing here falls back silently. A pipeline that WANTS a fallback for missing keys passes
+the chain explicitly -- usually `fallback_chain(code)`, the one `localeAttributes` declares --
+to `resolve_fallbacks()`, which answers a whole batch of keys against `KeyBitmaps`, one int
+bitmap per locale over a shared key order, built once per corpus. Each chain step is a few
+big-int ANDs, not a dict probe per key, and the result names every key that fell back and to
+which locale, plus every key nothing in the chain has. All 13 locales x 20k keys resolve in a
+few milliseconds (`--bench-fallback`).
+
+## Frozen data for short-lived workers
+
+The TTS and video pipelines fork hundreds of workers, and each one used to import `json`,
+read and validate the JSON again. A build step writes the validated result as a constant
+module, `_site_locales_data.py`, beside this file:
+
+    python3 packages/locales/site_locales.py --freeze     # after any JSON change
+    python3 packages/locales/site_locales.py --check      # exit 1 if missing or stale
+    python3 packages/locales/site_locales.py --bench-import
+
+It is committed, so a fresh checkout has it, and CI runs `--check` so it cannot drift from
+the JSON unnoticed. It embeds the JSON's exact bytes, and at import it is trusted only while
+they equal the file on disk -- one read of about 1 KB and a bytes compare, with no `json`,
+no `hashlib` and no mtime, so the generated text is the same on every machine. It is
+loaded by path from beside this file, never by name through `sys.path`. A stale or missing
+frozen module is therefore SLOWER, never wrong.
 """
 
 from __future__ import annotations
 
-import json
+import os
+import sys
 from pathlib import Path
+from types import MappingProxyType, ModuleType
+
+# `typing` costs a worker several milliseconds at import; this module needs it for nothing
+# but annotations, which `from __future__ import annotations` never evaluates.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
 
 __all__ = [
     "DEFAULT_LOCALE",
+    "LOCALE_ATTRIBUTES",
+    "LOCALE_INDEX",
     "NON_ENGLISH_LOCALES",
     "SITE_LOCALES",
+    "SITE_LOCALE_SET",
+    "CapabilityRegistry",
+    "FallbackResolution",
+    "KeyBitmaps",
+    "LocaleAttributes",
     "assert_covered_by_site",
     "assert_site_locale",
+    "capability_matrix",
+    "capable",
+    "fallback_chain",
+    "filter_site_locales",
     "is_site_locale",
+    "register_capability",
+    "resolve_fallbacks",
     "subset",
 ]
 
-_JSON_PATH = Path(__file__).resolve().parent / "site-locales.json"
+_HERE = Path(__file__).resolve().parent
+_JSON_PATH = _HERE / "site-locales.json"
+_FROZEN_NAME = "_site_locales_data"
+_FROZEN_PATH = _HERE / f"{_FROZEN_NAME}.py"
 
 
-def _load() -> tuple[tuple[str, ...], str]:
-    with _JSON_PATH.open(encoding="utf-8") as fh:
-        data = json.load(fh)
-    locales = tuple(data["siteLocales"])
-    default = data["defaultLocale"]
+#: Bumped whenever `_frozen_source()` changes shape; an older frozen module is then stale.
+_FROZEN_FORMAT = 3
+
+_DIRECTIONS = frozenset({"ltr", "rtl"})
+
+
+def _validate(
+    locales: tuple[str, ...], default: str, attributes: dict[str, tuple[str, str, str | None]]
+) -> None:
     # Fail at import, not at first use: a malformed source of truth should stop the process
     # while the stack trace still says which file is wrong.
     if not locales:
@@ -91,19 +175,173 @@ def _load() -> tuple[tuple[str, ...], str]:
         raise ValueError(f"{_JSON_PATH}: siteLocales contains duplicates: {locales}")
     if default not in locales:
         raise ValueError(f"{_JSON_PATH}: defaultLocale {default!r} is not in siteLocales")
-    return locales, default
+    # localeAttributes is keyed by EXACTLY the site set: a missing entry would make the
+    # registry quietly incomplete, an extra one is a typo or a locale removed in one place.
+    if set(attributes) != set(locales):
+        missing = sorted(set(locales) - set(attributes))
+        extra = sorted(set(attributes) - set(locales))
+        raise ValueError(
+            f"{_JSON_PATH}: localeAttributes must cover siteLocales exactly "
+            f"(missing: {missing}, not site locales: {extra})"
+        )
+    for code, (direction, script, fallback) in attributes.items():
+        if direction not in _DIRECTIONS:
+            raise ValueError(f"{_JSON_PATH}: {code}.direction {direction!r} is not ltr/rtl")
+        if not (len(script) == 4 and script.isalpha() and script.istitle()):
+            raise ValueError(f"{_JSON_PATH}: {code}.script {script!r} is not an ISO 15924 code")
+        if (fallback is None) != (code == default):
+            raise ValueError(
+                f"{_JSON_PATH}: {code}.fallback is {fallback!r}; the default locale and only "
+                f"the default has none"
+            )
+        if fallback is not None and fallback not in attributes:
+            raise ValueError(f"{_JSON_PATH}: {code}.fallback {fallback!r} is not a site locale")
+    # Every chain must reach the default: a cycle would make a fallback walk loop forever.
+    for code in locales:
+        seen = {code}
+        nxt = attributes[code][2]
+        while nxt is not None:
+            if nxt in seen:
+                raise ValueError(f"{_JSON_PATH}: fallback cycle through {code!r}")
+            seen.add(nxt)
+            nxt = attributes[nxt][2]
+
+
+def _load_json() -> tuple[tuple[str, ...], str, dict[str, tuple[str, str, str | None]]]:
+    import json  # noqa: PLC0415 -- deferred: the frozen fast path never imports json
+
+    with _JSON_PATH.open(encoding="utf-8") as fh:
+        data = json.load(fh)
+    locales = tuple(data["siteLocales"])
+    default = data["defaultLocale"]
+    # (direction, script, fallback) per code: the tuple form is what the frozen module stores.
+    attributes = {
+        code: (entry["direction"], entry["script"], entry["fallback"])
+        for code, entry in data.get("localeAttributes", {}).items()
+    }
+    _validate(locales, default, attributes)
+    return locales, default, attributes
+
+
+def _frozen_if_current():
+    """The frozen data module when it still describes the JSON on disk, else None."""
+    # Loaded by path, never by name through sys.path: imported as part of a package, or with
+    # another checkout earlier on the path, a bare `import _site_locales_data` finds the
+    # wrong file or none. importlib.machinery is a thin re-export of the loader the
+    # interpreter already has in memory; importlib.util would cost more than the JSON.
+    from importlib.machinery import SourceFileLoader  # noqa: PLC0415
+
+    frozen = ModuleType(_FROZEN_NAME)
+    frozen.__file__ = str(_FROZEN_PATH)
+    try:
+        SourceFileLoader(_FROZEN_NAME, str(_FROZEN_PATH)).exec_module(frozen)
+    except (OSError, SyntaxError):
+        return None
+    if getattr(frozen, "FORMAT", 1) != _FROZEN_FORMAT:
+        return None
+    # Bytes, not (size, mtime): a checkout rewrites every mtime, and the committed module
+    # has to stay current across them.
+    if _JSON_PATH.read_bytes() == frozen.SOURCE:
+        return frozen
+    return None
+
+
+def _load() -> tuple[tuple[str, ...], str, dict[str, tuple[str, str, str | None]]]:
+    frozen = _frozen_if_current()
+    if frozen is not None:
+        return frozen.SITE_LOCALES, frozen.DEFAULT_LOCALE, frozen.LOCALE_ATTRIBUTES
+    return _load_json()
+
+
+class LocaleAttributes:
+    """What the site declares about one locale, beside its membership. Immutable.
+
+    `fallback` is the locale whose content stands in when this one has none -- a DECLARED
+    chain for pipelines that want one, ending at the default locale. It never licenses a
+    silent fallback: see the category A/B note above.
+    """
+
+    __slots__ = ("code", "direction", "fallback", "script")
+
+    code: str
+    direction: str  # "ltr" | "rtl"
+    script: str  # ISO 15924, e.g. "Latn", "Arab", "Hans"
+    fallback: str | None
+
+    def __init__(self, code: str, direction: str, script: str, fallback: str | None) -> None:
+        for name, value in (
+            ("code", code),
+            ("direction", direction),
+            ("script", script),
+            ("fallback", fallback),
+        ):
+            object.__setattr__(self, name, value)
 
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"LocaleAttributes is immutable; cannot set {name!r}")
 
-SITE_LOCALES, DEFAULT_LOCALE = _load()
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LocaleAttributes):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"LocaleAttributes(code={self.code!r}, direction={self.direction!r}, "
+            f"script={self.script!r}, fallback={self.fallback!r})"
+        )
+
+    def _key(self) -> tuple[str, str, str, str | None]:
+        return (self.code, self.direction, self.script, self.fallback)
+
+    @property
+    def is_rtl(self) -> bool:
+        return self.direction == "rtl"
+
+
+SITE_LOCALES, DEFAULT_LOCALE, _raw_attributes = _load()
 
 #: Every site locale except the default. This is the set most pipelines want, because English
 #: is the source they translate FROM.
 NON_ENGLISH_LOCALES: tuple[str, ...] = tuple(c for c in SITE_LOCALES if c != DEFAULT_LOCALE)
 
+# Built once here so that every test below is a hash lookup, not a scan of SITE_LOCALES:
+# pipelines call them per subtitle segment and per translation unit.
+
+#: SITE_LOCALES as a set, for membership.
+SITE_LOCALE_SET: frozenset[str] = frozenset(SITE_LOCALES)
+
+#: code -> position in SITE_LOCALES. Read-only; the order is the JSON's.
+LOCALE_INDEX: MappingProxyType[str, int] = MappingProxyType(
+    {code: i for i, code in enumerate(SITE_LOCALES)}
+)
+
+#: code -> LocaleAttributes, in SITE_LOCALES order. Read-only.
+LOCALE_ATTRIBUTES: MappingProxyType[str, LocaleAttributes] = MappingProxyType(
+    {code: LocaleAttributes(code, *_raw_attributes[code]) for code in SITE_LOCALES}
+)
+del _raw_attributes
+
 
 def is_site_locale(code: str) -> bool:
     """Non-raising membership test, for validating untrusted input."""
-    return code in SITE_LOCALES
+    try:
+        return code in SITE_LOCALE_SET
+    except TypeError:  # unhashable untrusted input is simply not a locale
+        return False
+
+
+def filter_site_locales(codes: Iterable[str]) -> list[str]:
+    """The members of `codes` that are site locales, in input order, duplicates kept.
+
+    The bulk form of `is_site_locale` for per-segment data: the loop runs in C via
+    `filter`, so it costs one hash probe per item and no Python frame. Items must be
+    hashable (strings); this is for trusted bulk data, not raw user input.
+    """
+    return list(filter(SITE_LOCALE_SET.__contains__, codes))
 
 
 def assert_site_locale(code: str, *, where: str = "") -> str:
@@ -112,7 +350,7 @@ def assert_site_locale(code: str, *, where: str = "") -> str:
     Use this at a boundary where a bad code would otherwise cause a SILENT fallback to
     English rather than a visible failure.
     """
-    if code not in SITE_LOCALES:
+    if not is_site_locale(code):
         ctx = f" in {where}" if where else ""
         raise ValueError(
             f"{code!r} is not a site locale{ctx}. Known: {', '.join(SITE_LOCALES)}. "
@@ -131,10 +369,12 @@ def subset(name: str, codes: list[str] | tuple[str, ...]) -> tuple[str, ...]:
     to live.
     """
     out: list[str] = []
+    seen: set[str] = set()
     for code in codes:
         assert_site_locale(code, where=f"subset({name!r})")
-        if code in out:
+        if code in seen:
             raise ValueError(f"subset({name!r}): duplicate code {code!r}")
+        seen.add(code)
         out.append(code)
     return tuple(out)
 
@@ -146,7 +386,7 @@ def assert_covered_by_site(name: str, codes: object) -> None:
     are per-locale but whose values are independent data. It catches a typo'd key while
     leaving the membership decision where it belongs.
     """
-    unknown = sorted(c for c in codes if c not in SITE_LOCALES)  # type: ignore[union-attr]
+    unknown = sorted(c for c in codes if c not in SITE_LOCALE_SET)  # type: ignore[union-attr]
     if unknown:
         raise ValueError(
             f"{name} contains code(s) that are not site locales: {', '.join(unknown)}. "
@@ -154,6 +394,327 @@ def assert_covered_by_site(name: str, codes: object) -> None:
         )
 
 
+class CapabilityRegistry:
+    """Named category B locale lists, each validated against the site set once.
+
+    The module-level `register_capability()` / `capable()` / `capability_matrix()` use one
+    shared instance; build a separate one only to keep a test out of it.
+    """
+
+    __slots__ = ("_codes", "_rows", "_sources")
+
+    def __init__(self) -> None:
+        self._codes: dict[str, frozenset[str]] = {}
+        self._sources: dict[str, str] = {}
+        #: locale -> capabilities it has; rebuilt on registration, read on every query.
+        self._rows: dict[str, frozenset[str]] = dict.fromkeys(SITE_LOCALES, frozenset())
+
+    def register(self, name: str, codes: Iterable[str], *, source: str = "") -> frozenset[str]:
+        """Validate and record `codes` as capability `name`; returns them as a frozenset.
+
+        Idempotent for identical codes, so every importer may call it at import time.
+        """
+        frozen = frozenset(codes)
+        known = self._codes.get(name)
+        if known is not None:
+            if known != frozen:
+                raise ValueError(
+                    f"capability {name!r} registered twice with different codes: "
+                    f"{self._sources[name] or '?'} has {sorted(known)}, "
+                    f"{source or '?'} has {sorted(frozen)}"
+                )
+            return known
+        assert_covered_by_site(f"capability {name!r}" + (f" ({source})" if source else ""), frozen)
+        self._codes[name] = frozen
+        self._sources[name] = source
+        self._rows = {
+            code: frozenset(cap for cap, members in self._codes.items() if code in members)
+            for code in SITE_LOCALES
+        }
+        return frozen
+
+    def capable(self, locale: str, capability: str) -> bool:
+        try:
+            row = self._rows[locale]
+        except (KeyError, TypeError):
+            assert_site_locale(locale, where=f"capable(..., {capability!r})")
+            raise
+        if capability in row:
+            return True
+        if capability not in self._codes:
+            raise KeyError(
+                f"capability {capability!r} is not registered; "
+                f"known: {', '.join(self._codes) or 'none'}"
+            )
+        return False
+
+    def names(self) -> tuple[str, ...]:
+        """Registered capabilities, in registration order."""
+        return tuple(self._codes)
+
+    def source(self, name: str) -> str:
+        return self._sources[name]
+
+    def matrix(self) -> dict[str, dict[str, bool]]:
+        """locale -> {capability: bool}, locales in SITE_LOCALES order."""
+        return {
+            code: {cap: cap in self._rows[code] for cap in self._codes} for code in SITE_LOCALES
+        }
+
+
+_REGISTRY = CapabilityRegistry()
+register_capability = _REGISTRY.register
+capable = _REGISTRY.capable
+capability_matrix = _REGISTRY.matrix
+
+
+def fallback_chain(code: str) -> tuple[str, ...]:
+    """The chain `localeAttributes` declares after `code`, ending at the default locale.
+
+    Empty for the default itself. Pass it to `resolve_fallbacks()` explicitly; nothing in
+    this module applies it on its own.
+    """
+    out: list[str] = []
+    nxt = LOCALE_ATTRIBUTES[assert_site_locale(code, where="fallback_chain")].fallback
+    while nxt is not None:
+        out.append(nxt)
+        nxt = LOCALE_ATTRIBUTES[nxt].fallback
+    return tuple(out)
+
+
+class KeyBitmaps:
+    """Which keys each locale has: one int bitmap per locale over a shared, sorted key order.
+
+    Build it once per corpus from `{locale: keys that locale has}`; locales left out have NO
+    bitmap (not an empty one), so resolving through them fails instead of reading as
+    "translated nothing".
+    """
+
+    __slots__ = ("bitmaps", "index", "keys")
+
+    def __init__(self, presence: Mapping[str, Iterable[str]]) -> None:
+        assert_covered_by_site("KeyBitmaps", presence)
+        lists = {code: list(keys) for code, keys in presence.items()}
+        self.keys: tuple[str, ...] = tuple(sorted(set().union(*lists.values())))
+        self.index: dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self.bitmaps: dict[str, int] = {
+            code: self.mask(lists[code]) for code in SITE_LOCALES if code in lists
+        }
+
+    def mask(self, keys: Iterable[str]) -> int:
+        """The bitmap of `keys`, which must all be known (KeyError otherwise)."""
+        # One ASCII digit per key, then a single base-2 parse: linear, and the per-key work
+        # is a dict probe and a byte store rather than big-int arithmetic.
+        digits = bytearray(b"0") * len(self.keys)
+        for i in map(self.index.__getitem__, keys):
+            digits[i] = 49  # "1"
+        digits.reverse()
+        return int(digits, 2) if digits else 0
+
+    def keys_of(self, bits: int) -> list[str]:
+        """The keys set in `bits`, in key order."""
+        # Scanning the binary digits with str.find runs in C; popping bits one at a time
+        # would copy the whole big int per key.
+        digits = format(bits, "b")[::-1]
+        keys = self.keys
+        out: list[str] = []
+        i = digits.find("1")
+        while i != -1:
+            out.append(keys[i])
+            i = digits.find("1", i + 1)
+        return out
+
+
+class FallbackResolution:
+    """Where each requested key of one locale resolved. Nothing in it is silent.
+
+    `own` counts keys the locale itself has; `fallbacks` maps each chain locale that supplied
+    keys to those keys, in chain order; `missing` lists keys no locale in the chain has,
+    including keys the bitmaps have never seen.
+    """
+
+    __slots__ = ("chain", "fallbacks", "locale", "missing", "own")
+
+    def __init__(
+        self,
+        locale: str,
+        chain: tuple[str, ...],
+        own: int,
+        fallbacks: dict[str, list[str]],
+        missing: list[str],
+    ) -> None:
+        self.locale = locale
+        self.chain = chain
+        self.own = own
+        self.fallbacks = fallbacks
+        self.missing = missing
+
+    @property
+    def fell_back(self) -> list[str]:
+        return [key for keys in self.fallbacks.values() for key in keys]
+
+    def __repr__(self) -> str:
+        via = ", ".join(f"{len(keys)} from {code}" for code, keys in self.fallbacks.items())
+        return (
+            f"FallbackResolution({self.locale}: {self.own} own"
+            f"{', ' + via if via else ''}, {len(self.missing)} missing)"
+        )
+
+
+def resolve_fallbacks(
+    bitmaps: KeyBitmaps,
+    locale: str,
+    keys: Iterable[str] | None,
+    chain: Sequence[str],
+) -> FallbackResolution:
+    """Resolve `keys` (None: every known key) for `locale` through the DECLARED `chain`.
+
+    `chain` is required, even when it is `fallback_chain(locale)`: the caller states which
+    fallback it accepts. Every locale involved must be a site locale with a bitmap, and none
+    may repeat.
+    """
+    codes = subset("resolve_fallbacks", [locale, *chain])
+    for code in codes:
+        if code not in bitmaps.bitmaps:
+            raise ValueError(f"resolve_fallbacks: no key bitmap for {code!r}")
+    unknown: list[str] = []
+    if keys is None:
+        wanted = (1 << len(bitmaps.keys)) - 1
+    else:
+        index = bitmaps.index
+        known = []
+        for key in keys:
+            (known if key in index else unknown).append(key)
+        wanted = bitmaps.mask(known)
+
+    own_bits = wanted & bitmaps.bitmaps[locale]
+    remaining = wanted & ~own_bits
+    fallbacks: dict[str, list[str]] = {}
+    for code in codes[1:]:
+        if not remaining:
+            break
+        hit = remaining & bitmaps.bitmaps[code]
+        if hit:
+            fallbacks[code] = bitmaps.keys_of(hit)
+            remaining &= ~hit
+    return FallbackResolution(
+        locale,
+        codes[1:],
+        own_bits.bit_count(),
+        fallbacks,
+        bitmaps.keys_of(remaining) + unknown,
+    )
+
+
+def _frozen_source() -> str:
+    """The text of `_site_locales_data.py` for the JSON as it is now. Validates first.
+
+    Written already in `ruff format` style -- double quotes, one item per line behind a
+    trailing comma -- because the module is committed and the Python lint gate formats it.
+    """
+    import json  # noqa: PLC0415
+
+    def lit(value: str | None) -> str:
+        return "None" if value is None else json.dumps(value)
+
+    raw = _JSON_PATH.read_bytes()
+    locales, default, attributes = _load_json()
+    lines = [
+        "# GENERATED by `python3 packages/locales/site_locales.py --freeze` from",
+        "# site-locales.json. Do not edit; CI runs `--check`. site_locales.py trusts this file",
+        "# only while SOURCE still equals the JSON's bytes.",
+        f"FORMAT = {_FROZEN_FORMAT}",
+        f"SOURCE = {raw!r}",
+        "SITE_LOCALES = (",
+        *(f"    {lit(code)}," for code in locales),
+        ")",
+        f"DEFAULT_LOCALE = {lit(default)}",
+        "LOCALE_ATTRIBUTES = {",
+        *(
+            f"    {lit(code)}: ({', '.join(map(lit, attrs))}),"
+            for code, attrs in attributes.items()
+        ),
+        "}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def freeze() -> Path:
+    """Write `_site_locales_data.py` atomically; concurrent importers see old or new, whole."""
+    tmp = _FROZEN_PATH.with_name(f".{_FROZEN_PATH.name}.{os.getpid()}")
+    tmp.write_text(_frozen_source(), encoding="utf-8")
+    os.replace(tmp, _FROZEN_PATH)
+    # A rewrite within the same second at the same size would pass the .pyc's mtime+size
+    # check and keep serving the OLD bytecode.
+    for pyc in (_HERE / "__pycache__").glob(f"{_FROZEN_NAME}.*.pyc"):
+        pyc.unlink(missing_ok=True)
+    return _FROZEN_PATH
+
+
+def frozen_status() -> str:
+    """ "current", "missing" or "stale" -- by content: current means exactly what --freeze
+    would write now, so a hand edit or an older FORMAT is stale too."""
+    if not _FROZEN_PATH.exists():
+        return "missing"
+    current = _FROZEN_PATH.read_text(encoding="utf-8") == _frozen_source()
+    return "current" if current else "stale"
+
+
+def _bench_import(rounds: int) -> dict[str, object]:
+    """Per-process import cost of this module, JSON path vs frozen path.
+
+    Each side is a scratch copy of this file and the JSON, one of them frozen, imported by a
+    fresh interpreter `rounds` times. `-X importtime` isolates the module's own cumulative
+    import time from interpreter startup, which dominates the wall clock and is identical
+    for both.
+    """
+    # Deferred, like every import below `_load`: a worker importing this module pays for none
+    # of the tooling.
+    import shutil  # noqa: PLC0415
+    import statistics  # noqa: PLC0415
+    import subprocess  # noqa: PLC0415
+    import tempfile  # noqa: PLC0415
+    import time  # noqa: PLC0415
+
+    def measure(directory: str) -> dict[str, float]:
+        # pathlib first, as the bootstrap in "Usage" does: it is the consumer's import, not ours.
+        code = f"import pathlib, sys; sys.path.insert(0, {directory!r}); import site_locales"
+        argv = [sys.executable, "-S", "-X", "importtime", "-c", code]
+        # Workers run from a warm .pyc cache; without one this measures the compiler.
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+        run = {"capture_output": True, "env": env, "cwd": directory}
+        subprocess.run(argv, check=True, **run)
+        import_us, wall_ms = [], []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            done = subprocess.run(argv, check=True, text=True, **run)
+            wall_ms.append((time.perf_counter() - t0) * 1000)
+            for line in done.stderr.splitlines():
+                fields = [f.strip() for f in line.split("|")]
+                if len(fields) == 3 and fields[2] == "site_locales":
+                    import_us.append(int(fields[1]))
+        return {
+            "importUs": statistics.median(import_us),
+            "wallMs": round(statistics.median(wall_ms), 3),
+        }
+
+    result: dict[str, object] = {"rounds": rounds}
+    with tempfile.TemporaryDirectory(prefix="site-locales-bench-") as tmp:
+        for label in ("json", "frozen"):
+            directory = Path(tmp) / label
+            directory.mkdir()
+            shutil.copy2(__file__, directory / "site_locales.py")
+            shutil.copy2(_JSON_PATH, directory / "site-locales.json")
+            if label == "frozen":
+                subprocess.run(
+                    [sys.executable, str(directory / "site_locales.py"), "--freeze"],
+                    check=True,
+                    capture_output=True,
+                )
+            result[label] = measure(str(directory))
+    return result
+
+
 def _selftest() -> int:
     fails = 0
 
@@ -210,6 +771,140 @@ def _selftest() -> int:
     except ValueError as exc:
         chk("assert_covered_by_site catches a typo'd key", "jp" in str(exc))
 
+    # The O(1) structures must agree with the tuple they were built from.
+    chk("SITE_LOCALE_SET matches SITE_LOCALES", set(SITE_LOCALES) == SITE_LOCALE_SET)
+    chk(
+        "LOCALE_INDEX is each code's position",
+        all(SITE_LOCALES[i] == c for c, i in LOCALE_INDEX.items()),
+    )
+    chk(
+        "filter_site_locales keeps members in order, duplicates kept",
+        filter_site_locales(["de", "pt-BR", "en", "de", "jp"]) == ["de", "en", "de"],
+    )
+    chk("is_site_locale rejects unhashable input (control)", not is_site_locale(["en"]))  # type: ignore[arg-type]
+    chk("every site locale has attributes", list(LOCALE_ATTRIBUTES) == list(SITE_LOCALES))
+    chk("arabic is declared rtl", LOCALE_ATTRIBUTES["ar"].is_rtl)
+    chk("english is not rtl (control)", not LOCALE_ATTRIBUTES["en"].is_rtl)
+    chk("only the default has no fallback", LOCALE_ATTRIBUTES[DEFAULT_LOCALE].fallback is None)
+    try:
+        LOCALE_ATTRIBUTES["de"].script = "Cyrl"  # type: ignore[misc]
+        chk("LocaleAttributes is immutable", False)
+    except AttributeError:
+        chk("LocaleAttributes is immutable", True)
+    bad_attrs = dict.fromkeys(SITE_LOCALES, ("ltr", "Latn", DEFAULT_LOCALE))
+    bad_attrs[DEFAULT_LOCALE] = ("ltr", "Latn", None)
+    bad_attrs["de"] = ("ltr", "Latn", "fr")
+    bad_attrs["fr"] = ("ltr", "Latn", "de")
+    try:
+        _validate(SITE_LOCALES, DEFAULT_LOCALE, bad_attrs)
+        chk("a fallback cycle is rejected", False)
+    except ValueError as exc:
+        chk("a fallback cycle is rejected", "cycle" in str(exc))
+    try:
+        _validate(SITE_LOCALES, DEFAULT_LOCALE, {c: bad_attrs[c] for c in SITE_LOCALES[:-1]})
+        chk("attributes missing a site locale are rejected", False)
+    except ValueError as exc:
+        chk("attributes missing a site locale are rejected", SITE_LOCALES[-1] in str(exc))
+
+    # Capability registry: a fresh instance, so nothing leaks into the shared one.
+    reg = CapabilityRegistry()
+    tts = ["de", "en", "fr", "ja"]
+    chk("registration returns the codes", reg.register("tts", tts, source="a.py") == set(tts))
+    chk("re-registering identical codes is a no-op", reg.register("tts", reversed(tts)) == set(tts))
+    try:
+        reg.register("tts", ["de"], source="b.py")
+        chk("re-registering different codes is rejected", False)
+    except ValueError as exc:
+        chk("re-registering different codes is rejected", "a.py" in str(exc))
+    try:
+        reg.register("asr", ["de", "pt-BR"])
+        chk("a capability with a non-site code is rejected", False)
+    except ValueError:
+        chk("a capability with a non-site code is rejected", "asr" not in reg.names())
+    reg.register("asr", ["de", "en"])
+    chk("capable: registered member", reg.capable("ja", "tts"))
+    chk("capable: registered non-member (control)", not reg.capable("et", "tts"))
+    try:
+        reg.capable("de", "nope")
+        chk("an unregistered capability raises", False)
+    except KeyError:
+        chk("an unregistered capability raises", True)
+    try:
+        reg.capable("pt-BR", "tts")
+        chk("a non-site locale raises", False)
+    except ValueError:
+        chk("a non-site locale raises", True)
+    grid = reg.matrix()
+    chk("matrix rows follow SITE_LOCALES", tuple(grid) == SITE_LOCALES)
+    chk("matrix columns follow registration", list(grid["de"]) == ["tts", "asr"])
+    chk("matrix agrees with capable()", grid["fr"] == {"tts": True, "asr": False})
+
+    # Fallback resolution: explicit chain, and every key that did not come from the locale
+    # itself is named.
+    chk("the default has an empty declared chain", fallback_chain(DEFAULT_LOCALE) == ())
+    chk("a declared chain ends at the default", fallback_chain("de")[-1:] == (DEFAULT_LOCALE,))
+    bm = KeyBitmaps(
+        {
+            DEFAULT_LOCALE: ["a", "b", "c", "d"],
+            "fr": ["a", "b", "c"],
+            "de": ["a"],
+            "et": [],
+        }
+    )
+    chk("bitmaps cover the key union", bm.keys == ("a", "b", "c", "d"))
+    chk("keys_of inverts mask", bm.keys_of(bm.mask(["d", "b"])) == ["b", "d"])
+    res = resolve_fallbacks(bm, "de", ["a", "b", "c", "d", "zz"], ["fr", DEFAULT_LOCALE])
+    chk("own keys are counted, not listed", res.own == 1)
+    chk(
+        "each fallback is attributed to the locale that supplied it",
+        res.fallbacks == {"fr": ["b", "c"], DEFAULT_LOCALE: ["d"]},
+    )
+    chk("a key unknown everywhere is missing", res.missing == ["zz"])
+    chk("fell_back lists chain keys in order", res.fell_back == ["b", "c", "d"])
+    bare = resolve_fallbacks(bm, "de", None, [])
+    chk("an empty chain falls back to nothing (control)", bare.missing == ["b", "c", "d"])
+    chk(
+        "an empty locale resolves wholly via its chain",
+        resolve_fallbacks(bm, "et", None, [DEFAULT_LOCALE]).own == 0,
+    )
+    for label, call in (
+        (
+            "a chain through a locale without a bitmap fails",
+            lambda: resolve_fallbacks(bm, "de", None, ["ja"]),
+        ),
+        (
+            "a chain that repeats the locale fails",
+            lambda: resolve_fallbacks(bm, "de", None, ["de"]),
+        ),
+        (
+            "a chain with a non-site code fails",
+            lambda: resolve_fallbacks(bm, "de", None, ["pt-BR"]),
+        ),
+        ("bitmaps for a non-site code fail", lambda: KeyBitmaps({"pt-BR": ["a"]})),
+    ):
+        try:
+            call()
+            chk(label, False)
+        except ValueError:
+            chk(label, True)
+
+    # The frozen module must say exactly what the JSON says, or workers and this process would
+    # disagree about the site set depending on whether a build step ran.
+    frozen: dict[str, object] = {}
+    exec(_frozen_source(), frozen)  # noqa: S102 -- our own generated constants
+    chk("frozen data round-trips the JSON's locales", frozen["SITE_LOCALES"] == SITE_LOCALES)
+    chk("frozen data round-trips the default", frozen["DEFAULT_LOCALE"] == DEFAULT_LOCALE)
+    chk(
+        "frozen data round-trips the attributes",
+        {c: LocaleAttributes(c, *a) for c, a in frozen["LOCALE_ATTRIBUTES"].items()}  # type: ignore[union-attr]
+        == dict(LOCALE_ATTRIBUTES),
+    )
+    chk("frozen data embeds the JSON's bytes", frozen["SOURCE"] == _JSON_PATH.read_bytes())
+    chk(
+        "a current frozen module is found by path, not sys.path",
+        frozen_status() != "current" or _frozen_if_current() is not None,
+    )
+
     if fails:
         print(f"\n{fails} self-test failure(s)")
         return 1
@@ -217,5 +912,157 @@ def _selftest() -> int:
     return 0
 
 
+def _bench_lookup(items: int) -> dict[str, object]:
+    """ns per item for the per-segment operations, before (tuple scans) and after (hashes).
+
+    The stream mixes members and non-members the way pipeline input does: mostly real
+    codes, some region-tagged or typo'd ones that must be rejected.
+    """
+    import time  # noqa: PLC0415
+
+    pool = [*SITE_LOCALES, "pt-BR", "jp", "xx"]
+    stream = [pool[(i * 7) % len(pool)] for i in range(items)]
+
+    def per_item(fn) -> float:
+        t0 = time.perf_counter()
+        fn()
+        return round((time.perf_counter() - t0) * 1e9 / items, 1)
+
+    return {
+        "items": items,
+        "memberNs": {
+            "tupleScan": per_item(lambda: [c in SITE_LOCALES for c in stream]),
+            "frozenset": per_item(lambda: [c in SITE_LOCALE_SET for c in stream]),
+        },
+        "filterNs": {
+            "perItemCall": per_item(lambda: [c for c in stream if is_site_locale(c)]),
+            "filter_site_locales": per_item(lambda: filter_site_locales(stream)),
+        },
+        "indexNs": {
+            "tupleIndex": per_item(
+                lambda: [SITE_LOCALES.index(c) for c in stream if c in SITE_LOCALE_SET]
+            ),
+            "LOCALE_INDEX": per_item(
+                lambda: [LOCALE_INDEX[c] for c in stream if c in SITE_LOCALE_SET]
+            ),
+        },
+    }
+
+
+def _bench_fallback(keys: int) -> dict[str, object]:
+    """Build bitmaps for every site locale over `keys` synthetic keys, then resolve all of
+    them through their declared chains, against the per-key dict loop it replaces."""
+    import random  # noqa: PLC0415
+    import time  # noqa: PLC0415
+
+    rng = random.Random(0)  # noqa: S311 -- a reproducible corpus, not a secret
+    universe = [f"section{i // 50}.key{i}" for i in range(keys)]
+    presence = {
+        code: universe if code == DEFAULT_LOCALE else [k for k in universe if rng.random() < 0.97]
+        for code in SITE_LOCALES
+    }
+
+    t0 = time.perf_counter()
+    bm = KeyBitmaps(presence)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    results = {
+        code: resolve_fallbacks(bm, code, None, fallback_chain(code)) for code in SITE_LOCALES
+    }
+    resolve_ms = (time.perf_counter() - t0) * 1000
+
+    sets = {code: set(ks) for code, ks in presence.items()}
+    t0 = time.perf_counter()
+    for code in SITE_LOCALES:
+        chain = (code, *fallback_chain(code))
+        for key in universe:
+            for candidate in chain:
+                if key in sets[candidate]:
+                    break
+    loop_ms = (time.perf_counter() - t0) * 1000
+
+    return {
+        "locales": len(SITE_LOCALES),
+        "keys": keys,
+        "fellBack": sum(len(r.fell_back) for r in results.values()),
+        "buildMs": round(build_ms, 1),
+        "resolveAllMs": round(resolve_ms, 2),
+        "perKeyLoopMs": round(loop_ms, 2),
+    }
+
+
+def _dump_capabilities(files: list[str], *, as_json: bool) -> int:
+    import importlib.util  # noqa: PLC0415
+
+    # Run as a script, this module is `__main__`; the files below `import site_locales` and
+    # would register into a second copy of it. Query that copy.
+    registry = __import__("site_locales")._REGISTRY
+    for file in files:
+        spec = importlib.util.spec_from_file_location(Path(file).stem, file)
+        if spec is None or spec.loader is None:
+            raise SystemExit(f"--capabilities: cannot import {file}")
+        spec.loader.exec_module(importlib.util.module_from_spec(spec))
+    names = registry.names()
+    if not names:
+        print("no capabilities registered", file=sys.stderr)
+        return 1
+    grid = registry.matrix()
+    if as_json:
+        import json  # noqa: PLC0415
+
+        sources = {name: registry.source(name) for name in names}
+        print(json.dumps({"capabilities": sources, "matrix": grid}, indent=2))
+        return 0
+    width = max(len(code) for code in SITE_LOCALES)
+    print(" " * width, *names)
+    for code, row in grid.items():
+        cells = ("x".center(len(name)) if row[name] else ".".center(len(name)) for name in names)
+        print(code.ljust(width), *cells)
+    return 0
+
+
+def _main(argv: list[str]) -> int:
+    import argparse  # noqa: PLC0415
+
+    ap = argparse.ArgumentParser(description="Self-test, freeze or benchmark site_locales.")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--freeze", action="store_true", help="write _site_locales_data.py")
+    mode.add_argument(
+        "--check", action="store_true", help="exit 1 unless the frozen data is current"
+    )
+    mode.add_argument("--bench-import", type=int, nargs="?", const=30, metavar="ROUNDS")
+    mode.add_argument("--bench-lookup", type=int, nargs="?", const=1_000_000, metavar="ITEMS")
+    mode.add_argument("--bench-fallback", type=int, nargs="?", const=20_000, metavar="KEYS")
+    mode.add_argument(
+        "--capabilities",
+        nargs="*",
+        metavar="MODULE.py",
+        help="import these files (they register capabilities) and print the matrix",
+    )
+    ap.add_argument("--json", action="store_true", help="with --capabilities: print JSON")
+    args = ap.parse_args(argv)
+    if args.capabilities is not None:
+        return _dump_capabilities(args.capabilities, as_json=args.json)
+    if args.freeze:
+        print(f"wrote {freeze()}")
+        return 0
+    if args.check:
+        status = frozen_status()
+        print(f"{_FROZEN_PATH.name}: {status}")
+        return 0 if status == "current" else 1
+    if args.bench_import or args.bench_lookup or args.bench_fallback:
+        import json  # noqa: PLC0415
+
+        if args.bench_import:
+            print(json.dumps(_bench_import(args.bench_import), indent=2))
+        elif args.bench_lookup:
+            print(json.dumps(_bench_lookup(args.bench_lookup), indent=2))
+        else:
+            print(json.dumps(_bench_fallback(args.bench_fallback), indent=2))
+        return 0
+    return _selftest()
+
+
 if __name__ == "__main__":
-    raise SystemExit(_selftest())
+    raise SystemExit(_main(sys.argv[1:]))
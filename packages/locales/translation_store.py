@@ -0,0 +1,565 @@
+"""Compiled, memory-mapped translation store: `(locale, key)` lookups without parsing JSON.
+
+`packages/www/src/i18n/translations/*.json` is 13 files of roughly 650 KB each, and every
+Python consumer used to `json.load` the ones it needed into nested dicts - per process, so a
+pool of `locale_scheduler` workers held a private copy each. `compile` flattens them once into
+a single binary file; readers `mmap` it, so the pages are shared by every process that opens
+the same file and nothing is parsed up front.
+
+    python3 packages/locales/translation_store.py compile \\
+        --dir packages/www/src/i18n/translations --out .ci/cache/www-translations.store
+    python3 packages/locales/translation_store.py get .ci/cache/www-translations.store de nav.home
+
+    with TranslationStore(".ci/cache/www-translations.store") as store:
+        store.get("de", "nav.home")          # -> str, or None if `de` has no such key
+
+## Format (version 2, native byte order, all offsets from the start of the file)
+
+    header   magic "RDTS", version, byte order, counts (slots included), section offsets,
+             sha256 of the sources
+    locales  NUL-joined locale codes, in `SITE_LOCALES` order
+    keys     u32 offsets[nkeys + 1] + UTF-8 blob; the union of every locale's dotted keys,
+             sorted by UTF-8 bytes
+    slots    u32 key id per slot, a power of two >= 2 * nkeys, linear probing from
+             `zlib.crc32(key) & mask`; a lookup hashes and compares in the mapped file,
+             usually on the first probe, with no index built at open
+    strings  u32 offsets[nstrings + 1] + UTF-8 blob; every distinct value, stored once
+             (brand names, code samples and untranslated strings repeat across locales)
+    table    u32 string id per (locale, key), row-major by locale; MISSING when the locale
+             has no such key
+
+Keys are flattened like `scripts/utils/crc32.ts`: dotted paths, array items as `.0`, `.1`,
+string leaves only. The header keeps a sha256 over the source files; `--check` (and
+`TranslationStore.is_current`) compares it, so a stale store is detectable rather than
+silently served.
+
+Run the self-test with:
+
+    python3 packages/locales/translation_store.py --selftest
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from site_locales import SITE_LOCALES, subset
+from translation_planner import iter_leaves
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import Self
+
+__all__ = [
+    "MISSING",
+    "TranslationStore",
+    "compile_store",
+    "source_digest",
+]
+
+MAGIC = b"RDTS"
+FORMAT_VERSION = 2
+MISSING = 0xFFFFFFFF
+# magic, version, byte order (0 little / 1 big), nlocales, nkeys, nslots, nstrings,
+# then the offsets of: locales, key offsets, key blob, slots, string offsets, string blob,
+# table, then the sha256 of the sources. nslots is recorded, never inferred from the gap
+# to the next section: that gap includes alignment padding, which would read as key id 0.
+_HEADER = struct.Struct("=4sIIIIII7Q32s")
+# At most half the slots are filled, so a probe for a missing key meets MISSING quickly.
+# The reader holds a store to the same bound: a fuller table is not one this module wrote.
+_SLOTS_PER_KEY = 2
+_ORDER = 0 if sys.byteorder == "little" else 1
+
+
+def _source_paths(directory: Path, locales: Iterable[str]) -> list[Path]:
+    return [directory / f"{locale}.json" for locale in locales]
+
+
+def source_digest(directory: str | Path, locales: Iterable[str] = SITE_LOCALES) -> bytes:
+    """sha256 over the locale files, in order; what a store records as its provenance."""
+    digest = hashlib.sha256()
+    for path in _source_paths(Path(directory), locales):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+
+def _pack_strings(items: list[bytes]) -> tuple[array, bytes]:
+    offsets = array("I", [0])
+    total = 0
+    for item in items:
+        total += len(item)
+        offsets.append(total)
+    return offsets, b"".join(items)
+
+
+def _slots(encoded: list[bytes]) -> array:
+    size = 1
+    while size < _SLOTS_PER_KEY * len(encoded):
+        size *= 2
+    slots = array("I", [MISSING]) * size
+    mask = size - 1
+    for kid, key in enumerate(encoded):
+        slot = zlib.crc32(key) & mask
+        while slots[slot] != MISSING:
+            slot = (slot + 1) & mask
+        slots[slot] = kid
+    return slots
+
+
+def compile_store(
+    directory: str | Path, out: str | Path, locales: Iterable[str] = SITE_LOCALES
+) -> dict[str, int]:
+    """Compile `<directory>/<locale>.json` for `locales` into `out`. Returns size counters.
+
+    Every locale file must exist: a missing one would read back as "every key MISSING", which
+    is indistinguishable from a locale that was never translated.
+    """
+    directory = Path(directory)
+    codes = subset("compile_store", list(locales))
+    flat: list[dict[str, str]] = []
+    for path in _source_paths(directory, codes):
+        with path.open(encoding="utf-8") as fh:
+            flat.append(dict(iter_leaves(json.load(fh))))
+
+    keys = sorted({key for table in flat for key in table}, key=lambda k: k.encode("utf-8"))
+    string_ids: dict[str, int] = {}
+    table = array("I")
+    for values in flat:
+        for key in keys:
+            value = values.get(key)
+            if value is None:
+                table.append(MISSING)
+            else:
+                table.append(string_ids.setdefault(value, len(string_ids)))
+
+    names = "\0".join(codes).encode()
+    encoded = [key.encode("utf-8") for key in keys]
+    key_offsets, key_blob = _pack_strings(encoded)
+    slots = _slots(encoded)
+    str_offsets, str_blob = _pack_strings([value.encode("utf-8") for value in string_ids])
+
+    sections: list[bytes] = [
+        names,
+        key_offsets.tobytes(),
+        key_blob,
+        slots.tobytes(),
+        str_offsets.tobytes(),
+        str_blob,
+        table.tobytes(),
+    ]
+    starts: list[int] = []
+    body = bytearray()
+    for section in sections:
+        # 8-byte alignment keeps every u32 array aligned for `memoryview.cast`.
+        body.extend(b"\0" * (-(len(body) + _HEADER.size) % 8))
+        starts.append(_HEADER.size + len(body))
+        body.extend(section)
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        _ORDER,
+        len(codes),
+        len(keys),
+        len(slots),
+        len(string_ids),
+        *starts,
+        source_digest(directory, codes),
+    )
+
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}")
+    with tmp.open("wb") as fh:
+        fh.write(header)
+        fh.write(body)
+    # Rename, never rewrite in place: readers that still map the old inode keep valid pages.
+    os.replace(tmp, out)
+    return {
+        "locales": len(codes),
+        "keys": len(keys),
+        "strings": len(string_ids),
+        "cells": len(table),
+        "bytes": len(header) + len(body),
+    }
+
+
+class TranslationStore:
+    """Read-only view of a compiled store. Cheap to open; share one per process."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        try:
+            self._open()
+        except BaseException:
+            # Whatever failed, the views taken so far pin the mapping; never leak it.
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        path = self.path
+        view = memoryview(self._map)
+        self._views.append(view)
+        try:
+            fields = _HEADER.unpack_from(view)
+        except struct.error as exc:
+            raise ValueError(f"{path}: truncated translation store") from exc
+        magic, version, order, nlocales, nkeys, nslots, nstrings, *starts, digest = fields
+        if magic != MAGIC or version != FORMAT_VERSION or order != _ORDER:
+            raise ValueError(
+                f"{path}: not a version-{FORMAT_VERSION} {sys.byteorder}-endian translation"
+                " store; recompile it"
+            )
+        if nslots < 1 or nslots & (nslots - 1) or nslots < _SLOTS_PER_KEY * nkeys:
+            raise ValueError(
+                f"{path}: slot count {nslots} is not a power of two >= {_SLOTS_PER_KEY * nkeys}"
+            )
+        names, key_offs, key_blob, slots, str_offs, str_blob, table = starts
+        self.source_sha256 = digest
+        self.locales: tuple[str, ...] = tuple(
+            view[names:key_offs].tobytes().rstrip(b"\0").decode().split("\0")
+        )
+        if len(self.locales) != nlocales:
+            raise ValueError(f"{path}: locale table does not match its header")
+        self._row = {locale: i * nkeys for i, locale in enumerate(self.locales)}
+        self._nkeys = nkeys
+        self._key_offsets = self._u32(view, key_offs, nkeys + 1)
+        self._key_blob = self._slice(view, key_blob, self._key_offsets[nkeys])
+        self._slots = self._u32(view, slots, nslots)
+        self._mask = nslots - 1
+        self._str_offsets = self._u32(view, str_offs, nstrings + 1)
+        self._str_blob = self._slice(view, str_blob, self._str_offsets[nstrings])
+        self._table = self._u32(view, table, nlocales * nkeys)
+
+    def _u32(self, view: memoryview, start: int, count: int) -> memoryview:
+        cast = self._slice(view, start, 4 * count).cast("I")
+        self._views.append(cast)
+        return cast
+
+    def _slice(self, view: memoryview, start: int, length: int) -> memoryview:
+        if start + length > len(view):
+            raise ValueError(f"{self.path}: truncated translation store")
+        part = view[start : start + length]
+        self._views.append(part)
+        return part
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Exported memoryviews pin the mapping; release them before unmapping.
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._nkeys
+
+    def key_id(self, key: str) -> int | None:
+        """Column of `key` in the table, or None. One hash plus (usually) one compare."""
+        needle = key.encode("utf-8")
+        slots, offsets, blob, mask = self._slots, self._key_offsets, self._key_blob, self._mask
+        slot = zlib.crc32(needle) & mask
+        # Bounded, and every id checked: a corrupt slot array must raise, not spin forever
+        # on a table with no MISSING left or index past the key offsets.
+        for _ in range(mask + 1):
+            kid = slots[slot]
+            if kid == MISSING:
+                return None
+            if kid >= self._nkeys:
+                raise ValueError(f"{self.path}: corrupt slot {slot} (key id {kid})")
+            if blob[offsets[kid] : offsets[kid + 1]] == needle:
+                return kid
+            slot = (slot + 1) & mask
+        raise ValueError(f"{self.path}: corrupt slot table (no free slot)")
+
+    def keys(self) -> Iterator[str]:
+        """Every key, sorted by UTF-8 bytes."""
+        offsets, blob = self._key_offsets, self._key_blob
+        for i in range(self._nkeys):
+            yield str(blob[offsets[i] : offsets[i + 1]], "utf-8")
+
+    def _string(self, sid: int) -> str:
+        return str(self._str_blob[self._str_offsets[sid] : self._str_offsets[sid + 1]], "utf-8")
+
+    def get(self, locale: str, key: str) -> str | None:
+        """The `locale` value of `key`; None when that locale lacks it. Unknown locale -> KeyError."""
+        row = self._row[locale]
+        i = self.key_id(key)
+        if i is None:
+            return None
+        sid = self._table[row + i]
+        return None if sid == MISSING else self._string(sid)
+
+    def get_many(self, locale: str, keys: Iterable[str]) -> dict[str, str | None]:
+        """`get` for a batch of keys in one locale."""
+        row = self._row[locale]
+        out: dict[str, str | None] = {}
+        for key in keys:
+            i = self.key_id(key)
+            sid = MISSING if i is None else self._table[row + i]
+            out[key] = None if sid == MISSING else self._string(sid)
+        return out
+
+    def is_current(self, directory: str | Path) -> bool:
+        """True when the store was compiled from the locale files now in `directory`."""
+        try:
+            return source_digest(directory, self.locales) == self.source_sha256
+        except FileNotFoundError:
+            return False
+
+
+def _bench(directory: Path, rounds: int) -> dict[str, object]:
+    """json.load of every locale vs opening a compiled store, then `rounds` random lookups."""
+    import random  # noqa: PLC0415
+    import tempfile  # noqa: PLC0415
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = Path(tmp) / "bench.store"
+        t0 = time.perf_counter()
+        counts = compile_store(directory, store_path)
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        parsed = {}
+        for locale in SITE_LOCALES:
+            with (directory / f"{locale}.json").open(encoding="utf-8") as fh:
+                parsed[locale] = json.load(fh)
+        json_load_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        store = TranslationStore(store_path)
+        open_ms = (time.perf_counter() - t0) * 1000
+
+        rng = random.Random(0)  # noqa: S311 -- a reproducible sample, not a secret
+        all_keys = list(store.keys())
+        sample = [(rng.choice(SITE_LOCALES), rng.choice(all_keys)) for _ in range(rounds)]
+
+        def walk(tree: object, key: str) -> object:
+            for part in key.split("."):
+                tree = tree[int(part)] if isinstance(tree, list) else tree.get(part)  # type: ignore[union-attr]
+                if tree is None:
+                    return None
+            return tree
+
+        t0 = time.perf_counter()
+        for locale, key in sample:
+            walk(parsed[locale], key)
+        dict_us = (time.perf_counter() - t0) / rounds * 1e6
+        t0 = time.perf_counter()
+        for locale, key in sample:
+            store.get(locale, key)
+        store_us = (time.perf_counter() - t0) / rounds * 1e6
+        mismatched = sum(
+            1 for locale, key in sample if walk(parsed[locale], key) != store.get(locale, key)
+        )
+        store.close()
+
+    return {
+        **counts,
+        "compileMs": round(compile_ms, 1),
+        "jsonLoadAllMs": round(json_load_ms, 1),
+        "storeOpenMs": round(open_ms, 3),
+        "lookups": rounds,
+        "dictLookupUs": round(dict_us, 2),
+        "storeLookupUs": round(store_us, 2),
+        "mismatches": mismatched,
+    }
+
+
+def _selftest() -> int:
+    import tempfile  # noqa: PLC0415
+
+    fails = 0
+
+    def chk(label: str, cond: bool) -> None:
+        nonlocal fails
+        print(f"  {'PASS' if cond else 'FAIL'}  {label}")
+        if not cond:
+            fails += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        src.mkdir()
+        for locale in SITE_LOCALES:
+            doc = {"brand": "Rediacc", "nav": {"home": f"home-{locale}"}, "list": ["a", locale]}
+            if locale == "de":
+                doc["nav"]["extra"] = "nur de"  # type: ignore[index]
+            if locale == "ja":
+                doc["nav"]["home"] = "ホーム"  # type: ignore[index]
+            if locale == "ko":
+                del doc["brand"]
+            (src / f"{locale}.json").write_text(json.dumps(doc, ensure_ascii=False))
+        out = Path(tmp) / "out" / "t.store"
+        counts = compile_store(src, out)
+        chk("compile reports the key union", counts["keys"] == 5)
+        chk("identical values are stored once", counts["strings"] < counts["cells"])
+
+        with TranslationStore(out) as store:
+            chk("locales are in SITE_LOCALES order", store.locales == SITE_LOCALES)
+            chk("a plain lookup", store.get("fr", "nav.home") == "home-fr")
+            chk("non-ASCII round-trips", store.get("ja", "nav.home") == "ホーム")
+            chk("array items are dotted", store.get("tr", "list.1") == "tr")
+            chk("a key only one locale has", store.get("de", "nav.extra") == "nur de")
+            chk("...is MISSING elsewhere (control)", store.get("fr", "nav.extra") is None)
+            chk("a key a locale dropped is None", store.get("ko", "brand") is None)
+            chk("an unknown key is None", store.get("en", "nope") is None)
+            chk("keys are sorted and complete", list(store.keys()) == sorted(store.keys()))
+            chk(
+                "get_many matches get",
+                store.get_many("de", ["brand", "nav.extra", "nope"])
+                == {"brand": "Rediacc", "nav.extra": "nur de", "nope": None},
+            )
+            try:
+                store.get("pt-BR", "brand")
+                chk("an unknown locale is a KeyError", False)
+            except KeyError:
+                chk("an unknown locale is a KeyError", True)
+            chk("a fresh store is current", store.is_current(src))
+            (src / "de.json").write_text('{"brand": "Rediacc"}')
+            chk("an edited source makes it stale", not store.is_current(src))
+
+        # A corrupt slot table is refused at open or raises at lookup: it never hangs the
+        # probe and never surfaces as an IndexError.
+        compile_store(src, out)
+        good = out.read_bytes()
+        fields = _HEADER.unpack_from(good)
+        nkeys, nslots, slots_at = fields[4], fields[5], fields[10]
+        corrupt = Path(tmp) / "corrupt.store"
+        fuller = bytearray(good)
+        struct.pack_into("=I", fuller, struct.calcsize("=4sIIII"), nslots // 2)
+        corrupt.write_bytes(fuller)
+        try:
+            TranslationStore(corrupt).close()
+            chk("a table fuller than the builder writes is refused", False)
+        except ValueError:
+            chk("a table fuller than the builder writes is refused", True)
+        for label, kid in (("a full table", 0), ("an out-of-range key id", nkeys)):
+            slots = bytes(array("I", [kid]) * nslots)
+            corrupt.write_bytes(good[:slots_at] + slots + good[slots_at + len(slots) :])
+            with TranslationStore(corrupt) as store:
+                try:
+                    store.get("de", "nope")
+                    chk(f"{label} raises on a lookup", False)
+                except ValueError:
+                    chk(f"{label} raises on a lookup", True)
+        with TranslationStore(out) as store:
+            chk("the uncorrupted store still answers (control)", store.get("fr", "brand"))
+
+        (src / "it.json").unlink()
+        try:
+            compile_store(src, out)
+            chk("a missing locale file fails the compile", False)
+        except FileNotFoundError:
+            chk("a missing locale file fails the compile", True)
+
+        empty = Path(tmp) / "empty"
+        empty.mkdir()
+        for locale in SITE_LOCALES:
+            (empty / f"{locale}.json").write_text("{}")
+        compile_store(empty, out)
+        with TranslationStore(out) as store:
+            chk("an empty store has no keys", len(store) == 0 and not list(store.keys()))
+            chk("a lookup in an empty store is None", store.get("de", "x") is None)
+
+        whole = out.read_bytes()
+        out.write_bytes(whole[: len(whole) - 4])
+        try:
+            TranslationStore(out)
+            chk("a store cut short of its table is refused", False)
+        except ValueError:
+            chk("a store cut short of its table is refused", True)
+
+        bad = Path(tmp) / "bad.store"
+        bad.write_bytes(b"JUNK" + bytes(_HEADER.size))
+        try:
+            TranslationStore(bad)
+            chk("a foreign file is refused", False)
+        except ValueError:
+            chk("a foreign file is refused", True)
+        bad.write_bytes(MAGIC)
+        try:
+            TranslationStore(bad)
+            chk("a truncated file is refused", False)
+        except ValueError:
+            chk("a truncated file is refused", True)
+
+    www = Path(__file__).resolve().parents[1] / "www" / "src" / "i18n" / "translations"
+    if all((www / f"{locale}.json").exists() for locale in SITE_LOCALES):
+        result = _bench(www, 20_000)
+        chk(
+            f"www store agrees with json.load on {result['lookups']} lookups",
+            not result["mismatches"],
+        )
+
+    if fails:
+        print(f"\n{fails} self-test failure(s)")
+        return 1
+    print("\ntranslation_store self-test passed")
+    return 0
+
+
+def _main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Compile, query or benchmark a translation store.")
+    ap.add_argument("--selftest", action="store_true", help="run the self-test and exit")
+    sub = ap.add_subparsers(dest="command")
+    comp = sub.add_parser("compile", help="compile <dir>/<locale>.json into a store")
+    comp.add_argument("--dir", required=True, type=Path)
+    comp.add_argument("--out", required=True, type=Path)
+    comp.add_argument("--check", action="store_true", help="exit 1 unless --out is current")
+    get = sub.add_parser("get", help="print one value")
+    get.add_argument("store", type=Path)
+    get.add_argument("locale")
+    get.add_argument("key")
+    bench = sub.add_parser("bench", help="compare against json.load")
+    bench.add_argument("--dir", required=True, type=Path)
+    bench.add_argument("--rounds", type=int, default=100_000)
+    args = ap.parse_args(argv)
+
+    if args.selftest:
+        return _selftest()
+    if args.command == "compile":
+        if args.check:
+            try:
+                with TranslationStore(args.out) as store:
+                    current = store.is_current(args.dir)
+            except (FileNotFoundError, ValueError):
+                current = False
+            print(f"{args.out}: {'current' if current else 'stale'}")
+            return 0 if current else 1
+        print(json.dumps(compile_store(args.dir, args.out)))
+        return 0
+    if args.command == "get":
+        with TranslationStore(args.store) as store:
+            value = store.get(args.locale, args.key)
+        if value is None:
+            print(f"{args.locale}: no value for {args.key!r}", file=sys.stderr)
+            return 1
+        print(value)
+        return 0
+    if args.command == "bench":
+        print(json.dumps(_bench(args.dir, args.rounds), indent=2))
+        return 0
+    ap.error("a command (compile, get, bench) or --selftest is required")
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main(sys.argv[1:]))
@@ -12411,6 +12411,17 @@ export const CLI_CONTRACT: CliContract = {
           "descriptionKey": "options.skipEnvSetup",
           "label": "Skip remote environment setup"
         },
+        {
+          "flags": "--timing",
+          "long": "timing",
+          "valueTaking": false,
+          "variadic": false,
+          "mandatory": false,
+          "defaultValue": null,
+          "tier": "advanced",
+          "descriptionKey": "options.vscodeTiming",
+          "label": "Print a per-step timing report of the remote environment setup"
+        },
         {
           "flags": "--insiders",
           "long": "insiders",
@@ -132,6 +132,7 @@ export const GATES: readonly GateSpec[] = [
   { id: 'check:ci-timeout-headroom', run: 'npm run check:ci-timeout-headroom', gate: true, leaves: ['.ci/scripts/quality/check_job_timeout_headroom.py'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-static', step: "CI job timeout headroom" } },
   { id: 'check:ci-no-inline-python', run: 'npm run check:ci-no-inline-python', gate: true, leaves: ['.ci/scripts/quality/check_inline_python.py'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-static', step: "No inline Python in JS/TS" } },
   { id: 'check:ci-i18n-value-types', run: 'npm run check:ci-i18n-value-types', gate: true, leaves: ['.ci/scripts/quality/check_i18n_value_types.py'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-content', step: "i18n value types match English" } },
+  { id: 'check:ci-site-locales-frozen', run: 'npm run check:ci-site-locales-frozen', gate: true, leaves: ['packages/locales/site_locales.py'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-content', step: "Frozen site locale data matches site-locales.json" } },
   { id: 'check:ci-lint-rule-liveness', run: 'npm run check:ci-lint-rule-liveness', gate: true, leaves: ['.ci/scripts/quality/check_lint_rule_liveness.py'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-content', step: "Enabled lint rules can actually fire" } },
   { id: 'check:ci-lint-scope-coverage', run: 'npm run check:ci-lint-scope-coverage', gate: true, leaves: ['.ci/scripts/quality/check_lint_scope_coverage.py'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-code', step: "Every source file reaches a linter" } },
   { id: 'check:ci-shell-commands', run: 'npm run check:ci-shell-commands', gate: true, leaves: ['.ci/scripts/security/check-commands.sh'], ci: { kind: 'step', workflow: '.github/workflows/ci-quality.yml', job: 'quality-static', step: "Shell commands exist on the runner image" } },